@@ -0,0 +1,83 @@
+"""
+Compare le prétraitement historique (plusieurs temporaires, float64) au noyau affine fusionné
+de DataPreprocessor, séquentiel et parallèle : temps d'exécution et pic mémoire (tracemalloc).
+
+Usage :
+    python benchmarks/bench_data_preprocessor.py --rows 1000000 --cols 64
+
+Exemple de sortie (--rows 500000 --cols 32, 1 cœur) ; les temps dépendent de la machine,
+les pics mémoire non :
+    case                    time (s)  peak (MiB)  peak / input
+    legacy float64             0.241       366.3          3.00
+    fused float64              0.100       122.1          1.00
+    legacy float32             0.118       183.1          3.00
+    fused float32              0.070        61.1          1.00
+    fused float32 out=         0.067        16.1          0.26
+    parallel float32 out=      0.067        16.1          0.26
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from diamajax_utils.data_preprocessor import DataPreprocessor
+
+
+def legacy_preprocess(data: np.ndarray) -> np.ndarray:
+    # Implémentation d'origine : standardisation puis normalisation, min/max recalculés deux fois.
+    data = (data - np.mean(data, axis=0)) / np.std(data, axis=0)
+    return (data - np.min(data, axis=0)) / (np.max(data, axis=0) - np.min(data, axis=0))
+
+
+def measure(func, data: np.ndarray, repeat: int):
+    """
+    Mesure le meilleur temps et le pic mémoire alloué par `func(data)`.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cols", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Threads for the parallel case (-1: all cores).")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    data32 = rng.standard_normal((args.rows, args.cols), dtype=np.float32)
+    data64 = data32.astype(np.float64)
+    dp = DataPreprocessor()
+    parallel = DataPreprocessor(n_jobs=args.n_jobs)
+    scratch = np.empty_like(data32)
+
+    cases = [
+        ("legacy float64", legacy_preprocess, data64),
+        ("fused float64", dp.preprocess, data64),
+        ("legacy float32", legacy_preprocess, data32),
+        ("fused float32", dp.preprocess, data32),
+        ("fused float32 out=", lambda d: dp.preprocess(d, out=scratch), data32),
+        ("parallel float32 out=", lambda d: parallel.preprocess(d, out=scratch), data32),
+    ]
+    input_mb = data32.nbytes / 2**20
+    print(f"rows={args.rows} cols={args.cols} (float32 input: {input_mb:.1f} MiB)")
+    print(f"{'case':<22}{'time (s)':>10}{'peak (MiB)':>12}{'peak / input':>14}")
+    for name, func, data in cases:
+        elapsed, peak = measure(func, data, args.repeat)
+        peak_mb = peak / 2**20
+        print(f"{name:<22}{elapsed:>10.3f}{peak_mb:>12.1f}{peak / data.nbytes:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Banc d'essai reproductible des chemins critiques de diamajax_utils : inférence ONNX (modèles générés
+localement), prétraitement, réduction de dimensions et clustering, rendu des tableaux de bord.
+
+Chaque cas mesure le débit, les percentiles de latence et le pic d'allocation du cas (tracemalloc).
+Le pic de mémoire résidente (getrusage) est celui du processus depuis son démarrage : il ne
+décroît jamais et inclut les cas précédents, il n'est donc pas attribuable au cas courant.
+Les résultats sont enregistrés en JSON et peuvent servir de référence pour détecter les régressions ;
+benchmarks/baseline.json est la référence versionnée (exécution complète, voir son champ
+"environment"), utilisée par `compare` quand un seul fichier est donné.
+
+Usage :
+    python benchmarks/run_benchmarks.py run --output baseline.json
+    python benchmarks/run_benchmarks.py run --suite onnx,preprocess --quick --output current.json
+    python benchmarks/run_benchmarks.py compare baseline.json current.json --threshold 0.10
+    python benchmarks/run_benchmarks.py compare current.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple
+
+import numpy as np
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+class Case(NamedTuple):
+    name: str
+    func: Callable[[], Any]
+    # Unités traitées par appel (lignes, points, tableaux de bord) pour le débit.
+    units: int
+    repeat: int
+
+
+def make_mlp_model(path: str, in_features: int = 256, hidden: int = 512, out_features: int = 64, seed: int = 0):
+    """
+    Écrit un perceptron à deux couches (MatMul, Add, Relu) avec un axe de batch dynamique.
+    """
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    rng = np.random.default_rng(seed)
+    initializers = [
+        numpy_helper.from_array(rng.standard_normal((in_features, hidden), dtype=np.float32), "w1"),
+        numpy_helper.from_array(rng.standard_normal(hidden, dtype=np.float32), "b1"),
+        numpy_helper.from_array(rng.standard_normal((hidden, out_features), dtype=np.float32), "w2"),
+        numpy_helper.from_array(rng.standard_normal(out_features, dtype=np.float32), "b2"),
+    ]
+    graph = helper.make_graph(
+        [
+            helper.make_node("MatMul", ["input", "w1"], ["h1"]),
+            helper.make_node("Add", ["h1", "b1"], ["h2"]),
+            helper.make_node("Relu", ["h2"], ["h3"]),
+            helper.make_node("MatMul", ["h3", "w2"], ["h4"]),
+            helper.make_node("Add", ["h4", "b2"], ["output"]),
+        ],
+        "mlp",
+        [helper.make_tensor_value_info("input", TensorProto.FLOAT, ["batch", in_features])],
+        [helper.make_tensor_value_info("output", TensorProto.FLOAT, ["batch", out_features])],
+        initializers,
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, path)
+
+
+def onnx_cases(workdir: str, quick: bool) -> List[Case]:
+    from diamajax_utils.onnx_wrapper import ONNXModelWrapper
+
+    path = os.path.join(workdir, "mlp.onnx")
+    make_mlp_model(path)
+    model = ONNXModelWrapper(path, device_preference="cpu")
+    model.warmup()
+    rng = np.random.default_rng(0)
+    cases = []
+    for batch_size in (1, 8, 64) if quick else (1, 8, 64, 256):
+        inputs = {"input": rng.standard_normal((batch_size, 256), dtype=np.float32)}
+        repeat = 50 if quick else 200
+        cases.append(Case(f"onnx.predict[batch={batch_size}]", lambda inputs=inputs: model.predict(inputs), batch_size, repeat))
+        cases.append(
+            Case(f"onnx.predict_bound[batch={batch_size}]", lambda inputs=inputs: model.predict_bound(inputs), batch_size, repeat)
+        )
+    return cases
+
+
+def preprocess_cases(workdir: str, quick: bool) -> List[Case]:
+    from diamajax_utils.data_preprocessor import DataPreprocessor
+
+    rng = np.random.default_rng(0)
+    preprocessor = DataPreprocessor()
+    cases = []
+    for rows in (10_000, 100_000) if quick else (10_000, 100_000, 1_000_000):
+        for dtype in (np.float32, np.float64):
+            data = rng.standard_normal((rows, 64)).astype(dtype)
+            repeat = 3 if rows >= 1_000_000 else 10
+            name = f"preprocess[rows={rows},dtype={np.dtype(dtype).name}]"
+            cases.append(Case(name, lambda data=data: preprocessor.preprocess(data), rows, repeat))
+    return cases
+
+
+def make_blobs(n_points: int, n_features: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-10, 10, size=(5, n_features))
+    labels = rng.integers(0, len(centers), size=n_points)
+    return (centers[labels] + rng.standard_normal((n_points, n_features))).astype(np.float32)
+
+
+def clustering_cases(workdir: str, quick: bool) -> List[Case]:
+    from diamajax_utils.clustering_service import ClusteringService
+
+    service = ClusteringService()
+    # Compilation numba de UMAP hors mesure.
+    service.reduce_dimensions(make_blobs(300, 32))
+    cases = []
+    for n_points in (1000,) if quick else (1000, 5000):
+        embeddings = make_blobs(n_points, 32)
+        cases.append(
+            Case(f"clustering.reduce_dimensions[n={n_points}]", lambda e=embeddings: service.reduce_dimensions(e), n_points, 1)
+        )
+    methods = {
+        "kmeans": {"n_clusters": 5},
+        "minibatch_kmeans": {"n_clusters": 5},
+        "dbscan": {"eps": 0.5, "min_samples": 10},
+        "hdbscan": {"min_cluster_size": 50},
+    }
+    for n_points in (5000,) if quick else (10_000, 50_000):
+        reduced = make_blobs(n_points, 2)
+        for method, params in methods.items():
+            name = f"clustering.apply_clustering[method={method},n={n_points}]"
+            cases.append(
+                Case(name, lambda r=reduced, m=method, p=params: service.apply_clustering(r, m, **p), n_points, 3)
+            )
+    return cases
+
+
+def dashboard_cases(workdir: str, quick: bool) -> List[Case]:
+    from diamajax_utils.dashboard_generator import DashboardGenerator
+
+    generator = DashboardGenerator(output_dir=os.path.join(workdir, "dashboards"))
+    data = {f"Module{i}": {f"feature{j}": j * i for j in range(20)} for i in range(4)}
+    n_batch = 20 if quick else 100
+    batch = {f"tenant{i}": {"Usage": {"a": i, "b": 2 * i}} for i in range(n_batch)}
+    return [
+        Case("dashboard.create[inline]", lambda: generator.create_dashboard(data, "inline.html"), 1, 5),
+        Case(
+            "dashboard.create[directory]",
+            lambda: generator.create_dashboard(data, "shared.html", include_plotlyjs="directory"),
+            1,
+            10,
+        ),
+        Case(f"dashboard.generate_batch[n={n_batch}]", lambda: generator.generate_batch(batch, force=True), n_batch, 3),
+    ]
+
+
+SUITES: Dict[str, Callable[[str, bool], List[Case]]] = {
+    "onnx": onnx_cases,
+    "preprocess": preprocess_cases,
+    "clustering": clustering_cases,
+    "dashboard": dashboard_cases,
+}
+
+
+def process_peak_rss_mb() -> float:
+    # Pic du processus entier depuis son démarrage (monotone), pas celui du cas mesuré.
+    # ru_maxrss est en Kio sous Linux, en octets sous macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def measure(case: Case) -> Dict[str, float]:
+    """
+    Exécute un cas (un appel de chauffe puis `repeat` appels mesurés) et résume ses mesures.
+    """
+    case.func()
+    latencies = np.empty(case.repeat)
+    for i in range(case.repeat):
+        start = time.perf_counter()
+        case.func()
+        latencies[i] = time.perf_counter() - start
+
+    tracemalloc.start()
+    case.func()
+    _, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    median = float(np.median(latencies))
+    return {
+        "repeat": case.repeat,
+        "units": case.units,
+        "throughput_per_s": case.units / median if median > 0 else float("inf"),
+        "latency_p50_ms": median * 1000,
+        "latency_p95_ms": float(np.percentile(latencies, 95)) * 1000,
+        "latency_p99_ms": float(np.percentile(latencies, 99)) * 1000,
+        "peak_alloc_mb": peak_alloc / 2**20,
+        "process_peak_rss_mb": process_peak_rss_mb(),
+    }
+
+
+def environment() -> Dict[str, Any]:
+    import onnxruntime
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "onnxruntime": onnxruntime.__version__,
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    suites = args.suite.split(",") if args.suite else list(SUITES)
+    unknown = [suite for suite in suites if suite not in SUITES]
+    if unknown:
+        raise SystemExit(f"Unknown suites: {unknown}. Expected some of {list(SUITES)}")
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'case':<58}{'p50 (ms)':>10}{'p99 (ms)':>10}{'units/s':>14}{'alloc (MiB)':>13}{'proc peak RSS (MiB)':>21}")
+    with tempfile.TemporaryDirectory(prefix="diamajax-bench-") as workdir:
+        for suite in suites:
+            for case in SUITES[suite](workdir, args.quick):
+                result = results[case.name] = measure(case)
+                print(
+                    f"{case.name:<58}{result['latency_p50_ms']:>10.3f}{result['latency_p99_ms']:>10.3f}"
+                    f"{result['throughput_per_s']:>14.1f}{result['peak_alloc_mb']:>13.1f}{result['process_peak_rss_mb']:>21.1f}"
+                )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({"environment": environment(), "results": results}, output_file, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+def compare(args: argparse.Namespace) -> int:
+    """
+    Compare la latence médiane de chaque cas commun ; code de sortie 1 si un cas régresse
+    au-delà du seuil relatif. Avec un seul fichier, la référence est benchmarks/baseline.json.
+    """
+    if len(args.files) > 2:
+        raise SystemExit("compare expects [BASELINE] CURRENT.")
+    baseline_path, current_path = args.files if len(args.files) == 2 else (DEFAULT_BASELINE, args.files[0])
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline_data = json.load(baseline_file)
+    with open(current_path, encoding="utf-8") as current_file:
+        current_data = json.load(current_file)
+    baseline, current = baseline_data["results"], current_data["results"]
+    for key in ("platform", "cpu_count", "onnxruntime"):
+        before, after = baseline_data["environment"].get(key), current_data["environment"].get(key)
+        if before != after:
+            print(f"Warning: {key} differs from the baseline ({before} vs {after}); latencies may not be comparable.")
+
+    regressions = []
+    print(f"{'case':<58}{'baseline (ms)':>15}{'current (ms)':>14}{'change':>9}")
+    for name in sorted(set(baseline) & set(current)):
+        before, after = baseline[name]["latency_p50_ms"], current[name]["latency_p50_ms"]
+        change = after / before - 1 if before > 0 else 0.0
+        flag = ""
+        if change > args.threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<58}{before:>15.3f}{after:>14.3f}{change:>+9.1%}{flag}")
+    for name in sorted(set(baseline) ^ set(current)):
+        print(f"{name:<58} only in {'baseline' if name in baseline else 'current'}")
+
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}.")
+        return 1
+    print("No regression.")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument("--suite", help=f"Comma-separated suites among {', '.join(SUITES)} (default: all).")
+    run_parser.add_argument("--quick", action="store_true", help="Smaller sizes and fewer repeats.")
+    run_parser.add_argument("--output", help="Write results as JSON (e.g. a baseline).")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two result files.")
+    compare_parser.add_argument(
+        "files", nargs="+", metavar="FILE", help="[BASELINE] CURRENT (default baseline: benchmarks/baseline.json)."
+    )
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative slowdown of p50.")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,46 @@
+"""
+Utilitaires Diamajax : inférence ONNX, prétraitement, clustering et tableaux de bord.
 
+Les classes publiques sont importées à la demande (PEP 562) : `import diamajax_utils` ne charge
+ni onnxruntime ni les bibliothèques de clustering et de visualisation.
+"""
+import importlib
+from typing import Any, List
+
+__version__ = "0.1.0"
+
+_LAZY_EXPORTS = {
+    "ONNXModelWrapper": "onnx_wrapper",
+    "AsyncONNXModelWrapper": "async_onnx_wrapper",
+    "BatchingInferenceServer": "batching_server",
+    "InferenceCache": "inference_cache",
+    "ModelRegistry": "model_registry",
+    "EmbeddingStore": "embedding_store",
+    "ModelOptimizer": "model_optimizer",
+    "SessionTuner": "session_tuner",
+    "StreamingPipeline": "streaming_pipeline",
+    "DataPreprocessor": "data_preprocessor",
+    "ClusteringService": "clustering_service",
+    "ClusteringSweep": "clustering_sweep",
+    "OnlineClusteringService": "online_clustering",
+    "DashboardGenerator": "dashboard_generator",
+    "ImageRenderer": "image_renderer",
+    "LiveDashboard": "live_dashboard",
+    "Metrics": "instrumentation",
+    "get_metrics": "instrumentation",
+    "configure_metrics": "instrumentation",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_LAZY_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
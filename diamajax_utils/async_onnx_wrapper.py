@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .onnx_wrapper import ONNXModelWrapper
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncONNXModelWrapper:
+    """
+    API asyncio pour ONNXModelWrapper : l'inférence est déportée dans un exécuteur borné
+    afin de ne jamais bloquer la boucle d'événements.
+    """
+
+    def __init__(
+        self,
+        model: ONNXModelWrapper,
+        max_workers: Optional[int] = None,
+        max_in_flight: int = 64,
+        max_pending: Optional[int] = None,
+    ):
+        """
+        Initialise le wrapper asynchrone.
+
+        Args:
+            model (ONNXModelWrapper): Modèle ONNX synchrone à encapsuler.
+            max_workers (Optional[int]): Threads de l'exécuteur (par défaut, la taille du pool de sessions du modèle).
+            max_in_flight (int): Nombre maximal d'inférences simultanées ; au-delà, les appelants attendent.
+            max_pending (Optional[int]): Nombre maximal d'appelants en attente ; au-delà, les requêtes sont rejetées.
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be >= 1.")
+        if max_pending is not None and max_pending < 0:
+            raise ValueError("max_pending must be >= 0.")
+
+        self.model = model
+        self.max_in_flight = max_in_flight
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or model.pool_size, thread_name_prefix="diamajax-async-onnx"
+        )
+        # Créé à la première utilisation pour être lié à la boucle courante.
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._pending = 0
+        logger.info(f"AsyncONNXModelWrapper initialized (max_in_flight={max_in_flight}, max_pending={max_pending}).")
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Nombre d'inférences en cours d'exécution.
+        """
+        return self._in_flight
+
+    @property
+    def pending(self) -> int:
+        """
+        Nombre d'appelants en attente d'un créneau d'exécution.
+        """
+        return self._pending
+
+    async def apredict(self, input_data: Dict[str, Any], timeout: Optional[float] = None) -> List[Any]:
+        """
+        Effectue une prédiction sans bloquer la boucle d'événements.
+
+        Args:
+            input_data (Dict[str, Any]): Données d'entrée au modèle.
+            timeout (Optional[float]): Délai maximal (secondes), attente de créneau comprise.
+
+        Returns:
+            List[Any]: Résultats de la prédiction.
+
+        Raises:
+            ValueError: Si les données d'entrée sont invalides.
+            RuntimeError: Si la file d'attente est pleine (`max_pending` atteint).
+            asyncio.TimeoutError: Si le délai est dépassé.
+        """
+        if not self.model.validate_input(input_data):
+            raise ValueError("Invalid input data provided.")
+        return await asyncio.wait_for(self._submit(input_data), timeout)
+
+    async def apredict_many(self, inputs: List[Dict[str, Any]], timeout: Optional[float] = None) -> List[List[Any]]:
+        """
+        Effectue plusieurs prédictions concurrentes.
+
+        Args:
+            inputs (List[Dict[str, Any]]): Entrées à prédire.
+            timeout (Optional[float]): Délai maximal appliqué à chaque prédiction.
+
+        Returns:
+            List[List[Any]]: Résultats dans l'ordre des entrées.
+        """
+        return list(await asyncio.gather(*(self.apredict(input_data, timeout) for input_data in inputs)))
+
+    async def aclose(self):
+        """
+        Arrête l'exécuteur après la fin des inférences en cours.
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown, True)
+
+    async def __aenter__(self) -> "AsyncONNXModelWrapper":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _submit(self, input_data: Dict[str, Any]) -> List[Any]:
+        """
+        Attend un créneau puis exécute l'inférence dans l'exécuteur.
+
+        Args:
+            input_data (Dict[str, Any]): Données d'entrée validées.
+
+        Returns:
+            List[Any]: Résultats de la prédiction.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        semaphore = self._semaphore
+
+        if self.max_pending is not None and semaphore.locked() and self._pending >= self.max_pending:
+            raise RuntimeError(f"Too many pending inference requests (max_pending={self.max_pending}).")
+
+        self._pending += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._pending -= 1
+
+        try:
+            future = self._executor.submit(self.model._run, input_data)
+        except BaseException:
+            semaphore.release()
+            raise
+        self._in_flight += 1
+
+        def _release(_):
+            # Le créneau n'est rendu qu'à la fin réelle du calcul, même en cas d'annulation.
+            loop.call_soon_threadsafe(self._release_slot, semaphore)
+
+        future.add_done_callback(_release)
+        try:
+            return await asyncio.wrap_future(future)
+        except Exception as e:
+            logger.error(f"Error during async inference: {e}")
+            return []
+
+    def _release_slot(self, semaphore: asyncio.Semaphore):
+        self._in_flight -= 1
+        semaphore.release()
@@ -0,0 +1,314 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .onnx_wrapper import ONNXModelWrapper
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingRequest:
+    """
+    Requête en attente dans la file du serveur de micro-batching.
+    """
+
+    __slots__ = ("inputs", "rows", "signature", "future", "enqueued_at")
+
+    def __init__(self, inputs: Dict[str, np.ndarray], rows: int, signature: Tuple, future: Future):
+        self.inputs = inputs
+        self.rows = rows
+        self.signature = signature
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class BatchingInferenceServer:
+    """
+    Front-end de micro-batching dynamique autour d'un ONNXModelWrapper.
+
+    Les requêtes concurrentes sont regroupées le long de l'axe batch (jusqu'à
+    `max_batch_size` lignes ou `max_wait_ms` millisecondes), exécutées en un seul
+    `session.run`, puis les sorties sont redistribuées au futur de chaque appelant.
+    """
+
+    def __init__(
+        self,
+        model: ONNXModelWrapper,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        latency_window: int = 10000,
+    ):
+        """
+        Initialise le serveur de micro-batching.
+
+        Args:
+            model (ONNXModelWrapper): Modèle ONNX dont l'axe 0 des entrées et sorties est l'axe batch.
+            max_batch_size (int): Nombre maximal de lignes par batch.
+            max_wait_ms (float): Attente maximale (ms) avant d'exécuter un batch incomplet.
+            latency_window (int): Nombre de latences conservées pour les percentiles.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1.")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be >= 0.")
+
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: "queue.Queue[_PendingRequest]" = queue.Queue()
+        self._carry: Optional[_PendingRequest] = None
+        self._stop_event = threading.Event()
+        # Rend atomiques le test d'arrêt et la mise en file de `submit` face à `stop`.
+        self._submit_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_window)
+        self._started_at: Optional[float] = None
+        self._requests = 0
+        self._rows = 0
+        self._batches = 0
+        self._errors = 0
+        logger.info(
+            f"BatchingInferenceServer initialized (max_batch_size={max_batch_size}, max_wait_ms={max_wait_ms})."
+        )
+
+    def start(self) -> "BatchingInferenceServer":
+        """
+        Démarre le thread de traitement des batchs.
+
+        Returns:
+            BatchingInferenceServer: L'instance courante.
+        """
+        if self._worker is not None and self._worker.is_alive():
+            if self._stop_event.is_set():
+                raise RuntimeError("BatchingInferenceServer is still stopping; call stop() to wait for it.")
+            return self
+        self._stop_event.clear()
+        self._started_at = time.perf_counter()
+        self._worker = threading.Thread(target=self._serve, name="diamajax-batching", daemon=True)
+        self._worker.start()
+        logger.info("BatchingInferenceServer started.")
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Arrête le serveur après avoir traité les requêtes déjà en file ; les requêtes restantes
+        (thread arrêté avant de les atteindre) échouent avec RuntimeError.
+
+        Args:
+            timeout (Optional[float]): Délai maximal d'attente du thread (secondes). S'il expire, le
+                thread continue de vider la file ; rappeler `stop` pour attendre sa fin.
+        """
+        if self._worker is None:
+            return
+        with self._submit_lock:
+            self._stop_event.set()
+        self._worker.join(timeout)
+        if self._worker.is_alive():
+            # Le thread sert encore des requêtes : les faire échouer ici entrerait en concurrence avec lui.
+            logger.warning(f"BatchingInferenceServer worker still running after {timeout}s; pending requests are kept.")
+            return
+        self._worker = None
+        self._fail_pending(RuntimeError("BatchingInferenceServer stopped before processing the request."))
+        logger.info("BatchingInferenceServer stopped.")
+
+    def _fail_pending(self, error: Exception):
+        """
+        Fait échouer les requêtes encore en file.
+        """
+        leftovers = []
+        if self._carry is not None:
+            leftovers.append(self._carry)
+            self._carry = None
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request.future.set_running_or_notify_cancel():
+                leftovers.append(request)
+        for request in leftovers:
+            request.future.set_exception(error)
+        if leftovers:
+            logger.warning(f"Failed {len(leftovers)} pending requests on shutdown.")
+
+    def __enter__(self) -> "BatchingInferenceServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def submit(self, input_data: Dict[str, Any]) -> Future:
+        """
+        Place une requête dans la file de batching.
+
+        Args:
+            input_data (Dict[str, Any]): Entrées d'une requête (axe 0 = échantillons, en général 1).
+
+        Returns:
+            Future: Futur résolu avec la liste des sorties de cette requête.
+        """
+        if not self.model.validate_input(input_data):
+            raise ValueError("Invalid input data provided.")
+
+        inputs = {name: np.asarray(value) for name, value in input_data.items()}
+        rows = {value.shape[0] if value.ndim else 0 for value in inputs.values()}
+        if len(rows) != 1 or 0 in rows:
+            raise ValueError("All inputs must share a non-empty leading batch dimension.")
+
+        signature = tuple(
+            sorted((name, value.dtype.str, value.shape[1:]) for name, value in inputs.items())
+        )
+        future: Future = Future()
+        with self._submit_lock:
+            if self._worker is None or self._stop_event.is_set():
+                raise RuntimeError("BatchingInferenceServer is not running. Call start() first.")
+            self._queue.put(_PendingRequest(inputs, rows.pop(), signature, future))
+        return future
+
+    def predict(self, input_data: Dict[str, Any], timeout: Optional[float] = None) -> List[Any]:
+        """
+        Soumet une requête et attend son résultat.
+
+        Args:
+            input_data (Dict[str, Any]): Entrées d'une requête.
+            timeout (Optional[float]): Délai maximal d'attente (secondes).
+
+        Returns:
+            List[Any]: Sorties du modèle pour cette requête.
+        """
+        return self.submit(input_data).result(timeout)
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Retourne les compteurs de débit et de latence.
+
+        Returns:
+            Dict[str, float]: Requêtes, batchs, taille moyenne de batch, débit et percentiles de latence (ms).
+        """
+        with self._stats_lock:
+            latencies = np.array(self._latencies, dtype=np.float64)
+            elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+            stats = {
+                "requests": self._requests,
+                "rows": self._rows,
+                "batches": self._batches,
+                "errors": self._errors,
+                "avg_batch_size": self._rows / self._batches if self._batches else 0.0,
+                "throughput_rps": self._requests / elapsed if elapsed > 0 else 0.0,
+            }
+        for pct in (50, 95, 99):
+            stats[f"latency_p{pct}_ms"] = float(np.percentile(latencies, pct)) * 1000 if latencies.size else 0.0
+        return stats
+
+    def _serve(self):
+        """
+        Boucle du thread de traitement : collecte, exécute et redistribue les batchs.
+        """
+        while True:
+            batch = self._collect_batch()
+            if batch:
+                try:
+                    self._run_batch(batch)
+                except Exception as e:
+                    # Le thread doit survivre à un batch défaillant, sinon les requêtes suivantes restent en attente.
+                    logger.error(f"Unexpected error while dispatching a batch: {e}")
+                    for request in batch:
+                        if not request.future.done():
+                            request.future.set_exception(e)
+            elif self._stop_event.is_set() and self._queue.empty():
+                return
+
+    def _next_request(self, timeout: Optional[float]) -> Optional[_PendingRequest]:
+        if self._carry is not None:
+            request, self._carry = self._carry, None
+            return request
+        while True:
+            try:
+                if timeout is None:
+                    request = self._queue.get_nowait()
+                else:
+                    request = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            # Passe le futur à l'état RUNNING ; une requête annulée par l'appelant est ignorée.
+            if request.future.set_running_or_notify_cancel():
+                return request
+
+    def _collect_batch(self) -> List[_PendingRequest]:
+        """
+        Regroupe des requêtes compatibles jusqu'à la taille ou au délai maximal.
+
+        Returns:
+            List[_PendingRequest]: Requêtes du prochain batch (vide si aucune).
+        """
+        first = self._next_request(timeout=0.05)
+        if first is None:
+            return []
+
+        batch = [first]
+        rows = first.rows
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+        while rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            request = self._next_request(timeout=remaining if remaining > 0 else None)
+            if request is None:
+                break
+            if request.signature != first.signature or rows + request.rows > self.max_batch_size:
+                # Incompatible avec le batch courant : il ouvrira le suivant.
+                self._carry = request
+                break
+            batch.append(request)
+            rows += request.rows
+        return batch
+
+    def _run_batch(self, batch: List[_PendingRequest]):
+        """
+        Exécute un batch en un seul appel et redistribue les sorties.
+
+        Args:
+            batch (List[_PendingRequest]): Requêtes compatibles à exécuter ensemble.
+        """
+        try:
+            if len(batch) == 1:
+                merged = batch[0].inputs
+            else:
+                merged = {
+                    name: np.concatenate([request.inputs[name] for request in batch], axis=0)
+                    for name in batch[0].inputs
+                }
+            total_rows = sum(request.rows for request in batch)
+            outputs = self.model._run(merged)
+            for output in outputs:
+                if np.ndim(output) == 0 or np.shape(output)[0] != total_rows:
+                    raise ValueError(
+                        f"Output leading dimension {np.shape(output)[:1]} does not match batch size {total_rows}."
+                    )
+        except Exception as e:
+            logger.error(f"Error during batched inference: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            with self._stats_lock:
+                self._errors += len(batch)
+            return
+
+        offset = 0
+        now = time.perf_counter()
+        for request in batch:
+            end = offset + request.rows
+            request.future.set_result([output[offset:end] for output in outputs])
+            offset = end
+
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._rows += total_rows
+            self._latencies.extend(now - request.enqueued_at for request in batch)
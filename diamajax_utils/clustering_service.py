@@ -1,23 +1,52 @@
 import logging
-from typing import Any, Dict, List, Union
+import uuid
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Union
 
 import numpy as np
-from umap import UMAP
-from sklearn.cluster import KMeans, DBSCAN
-import hdbscan
 
-import matplotlib.pyplot as plt
-import plotly.express as px
+from .inference_cache import InferenceCache, hash_array, hash_file
+from .instrumentation import Metrics, get_metrics
+
+# umap, scikit-learn, hdbscan, matplotlib et plotly coûtent plusieurs secondes à l'import :
+# ils sont importés à la première utilisation pour que l'import du module reste léger.
+if TYPE_CHECKING:
+    from sklearn.cluster import MiniBatchKMeans
 
 logger = logging.getLogger(__name__)
 
 
+def validate_embeddings(embeddings: Any) -> np.ndarray:
+    """
+    Valide et convertit les embeddings en numpy array.
+
+    Args:
+        embeddings (Any): Données à valider.
+
+    Returns:
+        np.ndarray: Données validées et converties.
+    """
+    # Tableaux, memmaps et EmbeddingStore sont utilisés tels quels (vue, sans copie).
+    if isinstance(embeddings, list) or hasattr(embeddings, "__array__"):
+        embeddings = np.asarray(embeddings)
+    if not isinstance(embeddings, np.ndarray) or embeddings.ndim != 2 or embeddings.size == 0:
+        raise ValueError("Embeddings must be a non-empty 2D numpy array or a list of lists.")
+    return embeddings
+
+
 class ClusteringService:
     """
     Service avancé pour la réduction de dimensions et le clustering, avec des visualisations interactives.
     """
 
-    def __init__(self, n_neighbors: int = 15, min_dist: float = 0.1, n_components: int = 2, random_state: int = 42):
+    def __init__(
+        self,
+        n_neighbors: int = 15,
+        min_dist: float = 0.1,
+        n_components: int = 2,
+        random_state: int = 42,
+        cache: Optional[InferenceCache] = None,
+        metrics: Optional[Metrics] = None,
+    ):
         """
         Initialise le service avec des paramètres configurables pour UMAP.
 
@@ -26,8 +55,17 @@ class ClusteringService:
             min_dist (float): Distance minimale pour UMAP.
             n_components (int): Dimensions cibles pour UMAP (2D ou 3D).
             random_state (int): État aléatoire pour reproductibilité.
+            cache (Optional[InferenceCache]): Cache des projections de `transform`, indexé par contenu.
+            metrics (Optional[Metrics]): Registre des mesures (par défaut, le registre partagé de `get_metrics`).
         """
+        from umap import UMAP
+
         self.reducer = UMAP(n_neighbors=n_neighbors, min_dist=min_dist, n_components=n_components, random_state=random_state)
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else get_metrics()
+        self.is_fitted = False
+        # Renouvelé à chaque ajustement : les projections en cache d'un ancien réducteur sont ignorées.
+        self._reducer_id: Optional[str] = None
         logger.info(f"ClusteringService initialized with {n_components}D UMAP reducer.")
 
     def reduce_dimensions(self, embeddings: Union[List[List[float]], np.ndarray]) -> np.ndarray:
@@ -44,48 +82,295 @@ class ClusteringService:
 
         logger.info(f"Reducing dimensions to {self.reducer.n_components}D...")
         try:
-            reduced_embeddings = self.reducer.fit_transform(embeddings)
+            with self.metrics.timer("clustering.umap_fit"):
+                reduced_embeddings = self.reducer.fit_transform(embeddings)
+            self._mark_fitted()
             logger.info("Dimension reduction completed successfully.")
             return reduced_embeddings
         except Exception as e:
             logger.error(f"Error during dimension reduction: {e}")
             raise
 
+    def fit(self, embeddings: Union[List[List[float]], np.ndarray]) -> "ClusteringService":
+        """
+        Ajuste le réducteur UMAP (et son index de plus proches voisins) sans projeter les données.
+
+        Args:
+            embeddings (Union[List[List[float]], np.ndarray]): Données haute dimension de référence.
+
+        Returns:
+            ClusteringService: L'instance courante.
+        """
+        embeddings = self._validate_and_convert_embeddings(embeddings)
+
+        logger.info(f"Fitting {self.reducer.n_components}D UMAP reducer on {embeddings.shape[0]} embeddings...")
+        try:
+            with self.metrics.timer("clustering.umap_fit"):
+                self.reducer.fit(embeddings)
+            self._mark_fitted()
+            logger.info("UMAP reducer fitted successfully.")
+            return self
+        except Exception as e:
+            logger.error(f"Error during reducer fitting: {e}")
+            raise
+
+    def transform(self, embeddings: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+        """
+        Projette de nouvelles données avec le réducteur déjà ajusté, sans le réajuster.
+
+        Args:
+            embeddings (Union[List[List[float]], np.ndarray]): Nouvelles données haute dimension.
+
+        Returns:
+            np.ndarray: Données réduites.
+        """
+        if not self.is_fitted:
+            raise ValueError("UMAP reducer is not fitted. Call fit, reduce_dimensions or load first.")
+        embeddings = self._validate_and_convert_embeddings(embeddings)
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = f"umap-{self._reducer_id}-{hash_array(embeddings)}"
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.metrics.increment("clustering.cache_hits")
+                return cached[0]
+
+        try:
+            with self.metrics.timer("clustering.umap_transform"):
+                reduced_embeddings = self.reducer.transform(embeddings)
+            if cache_key is not None:
+                self.cache.put(cache_key, [reduced_embeddings])
+            return reduced_embeddings
+        except Exception as e:
+            logger.error(f"Error during dimension reduction transform: {e}")
+            raise
+
+    def save(self, path: str):
+        """
+        Enregistre le réducteur ajusté (avec son index de voisins) sur disque.
+
+        Args:
+            path (str): Chemin du fichier (format joblib).
+        """
+        if not self.is_fitted:
+            raise ValueError("UMAP reducer is not fitted. Call fit or reduce_dimensions first.")
+        import joblib
+
+        joblib.dump(self.reducer, path)
+        logger.info(f"UMAP reducer saved to {path}.")
+
+    @classmethod
+    def load(
+        cls, path: str, cache: Optional[InferenceCache] = None, metrics: Optional[Metrics] = None
+    ) -> "ClusteringService":
+        """
+        Recrée un service à partir d'un réducteur enregistré par `save`, prêt pour `transform`.
+
+        Args:
+            path (str): Chemin du fichier enregistré.
+            cache (Optional[InferenceCache]): Cache des projections de `transform`.
+            metrics (Optional[Metrics]): Registre des mesures.
+
+        Returns:
+            ClusteringService: Service avec réducteur ajusté.
+        """
+        import joblib
+
+        reducer = joblib.load(path)
+        service = cls(
+            n_neighbors=reducer.n_neighbors,
+            min_dist=reducer.min_dist,
+            n_components=reducer.n_components,
+            random_state=reducer.random_state,
+            cache=cache,
+            metrics=metrics,
+        )
+        service.reducer = reducer
+        # Identifiant stable entre redémarrages : le niveau disque du cache reste valable.
+        service._mark_fitted(hash_file(path))
+        logger.info(f"UMAP reducer loaded from {path}.")
+        return service
+
+    def _mark_fitted(self, reducer_id: Optional[str] = None):
+        self.is_fitted = True
+        self._reducer_id = reducer_id or uuid.uuid4().hex
+
     def apply_clustering(self, embeddings: np.ndarray, method: str = "kmeans", **kwargs) -> Dict[str, Any]:
         """
         Applique un clustering sur les données réduites.
 
+        Pour les grands volumes : 'minibatch_kmeans' traite les données par mini-batchs, et
+        `sample_size` fait ajuster DBSCAN/HDBSCAN sur un sous-échantillon puis affecte les autres
+        points (cœur le plus proche dans `eps` pour DBSCAN, prédiction approchée pour HDBSCAN).
+
         Args:
             embeddings (np.ndarray): Données réduites.
-            method (str): Méthode de clustering ('kmeans', 'dbscan', 'hdbscan').
-            **kwargs: Paramètres spécifiques à l'algorithme.
+            method (str): Méthode de clustering ('kmeans', 'minibatch_kmeans', 'dbscan', 'hdbscan').
+            **kwargs: Paramètres spécifiques à l'algorithme, plus `sample_size` (DBSCAN/HDBSCAN),
+                `n_jobs` (parallélisme des recherches de voisins) et `chunk_size` (affectation par blocs).
 
         Returns:
-            Dict[str, Any]: Résultats avec les labels et le modèle utilisé.
+            Dict[str, Any]: Résultats avec les labels et le modèle utilisé (et `sample_indices` si échantillonné).
         """
         logger.info(f"Applying clustering using method: {method}...")
         try:
+            import hdbscan
+            from sklearn.cluster import DBSCAN, KMeans, MiniBatchKMeans
+
+            n_jobs = kwargs.get("n_jobs", None)
+            sample_size = kwargs.get("sample_size", None)
             if method == "kmeans":
                 n_clusters = kwargs.get("n_clusters", 5)
                 cluster_model = KMeans(n_clusters=n_clusters, random_state=42)
+            elif method == "minibatch_kmeans":
+                n_clusters = kwargs.get("n_clusters", 5)
+                batch_size = kwargs.get("batch_size", 4096)
+                cluster_model = MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, random_state=42)
             elif method == "dbscan":
                 eps = kwargs.get("eps", 0.5)
                 min_samples = kwargs.get("min_samples", 5)
-                cluster_model = DBSCAN(eps=eps, min_samples=min_samples, metric="euclidean")
+                cluster_model = DBSCAN(eps=eps, min_samples=min_samples, metric="euclidean", n_jobs=n_jobs)
             elif method == "hdbscan":
                 min_cluster_size = kwargs.get("min_cluster_size", 5)
-                cluster_model = hdbscan.HDBSCAN(min_cluster_size=min_cluster_size)
+                cluster_model = hdbscan.HDBSCAN(
+                    min_cluster_size=min_cluster_size,
+                    min_samples=kwargs.get("min_samples"),
+                    core_dist_n_jobs=n_jobs or 4,
+                    prediction_data=sample_size is not None,
+                )
             else:
                 raise ValueError(f"Unsupported clustering method: {method}")
 
-            labels = cluster_model.fit_predict(embeddings)
-            logger.info(f"Clustering completed. Found {len(set(labels)) - (1 if -1 in labels else 0)} clusters.")
-            return {"labels": labels, "model": cluster_model}
+            result: Dict[str, Any] = {"model": cluster_model}
+            with self.metrics.timer("clustering.cluster"):
+                if sample_size is not None and method in ("dbscan", "hdbscan") and sample_size < len(embeddings):
+                    sample_indices = np.sort(
+                        np.random.RandomState(42).choice(len(embeddings), sample_size, replace=False)
+                    )
+                    sample_labels = cluster_model.fit_predict(embeddings[sample_indices])
+                    labels = self._assign_remaining(
+                        cluster_model, embeddings, sample_indices, sample_labels, n_jobs, kwargs.get("chunk_size", 100_000)
+                    )
+                    result["sample_indices"] = sample_indices
+                else:
+                    labels = cluster_model.fit_predict(embeddings)
+
+            result["labels"] = labels
+            n_found = np.unique(labels[labels >= 0]).size
+            logger.info(f"Clustering completed. Found {n_found} clusters.")
+            return result
         except Exception as e:
             logger.error(f"Error during clustering: {e}")
             raise
 
-    def visualize_clusters(self, embeddings: np.ndarray, labels: List[int], interactive: bool = True, save_path: str = None):
+    def sweep_clustering(
+        self,
+        embeddings: np.ndarray,
+        param_grid: Dict[str, Dict[str, List[Any]]],
+        rank_by: str = "silhouette",
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Compare plusieurs configurations de clustering en partageant les calculs de voisinage.
+
+        Args:
+            embeddings (np.ndarray): Données réduites.
+            param_grid (Dict[str, Dict[str, List[Any]]]): Valeurs à tester par méthode.
+            rank_by (str): Score de classement ('silhouette' ou 'dbcv').
+            **kwargs: Paramètres de ClusteringSweep (`n_jobs`, `score_sample_size`, `cache_dir`).
+
+        Returns:
+            List[Dict[str, Any]]: Tableau des configurations, de la meilleure à la moins bonne. Les
+                `params` de chaque ligne, y compris le `min_samples` fixé pour HDBSCAN, se passent
+                tels quels à `apply_clustering`.
+        """
+        from .clustering_sweep import ClusteringSweep
+
+        return ClusteringSweep(embeddings, **kwargs).run(param_grid, rank_by=rank_by)
+
+    def partial_fit_kmeans(
+        self, chunks: Iterable[np.ndarray], n_clusters: int = 5, batch_size: int = 4096
+    ) -> "MiniBatchKMeans":
+        """
+        Ajuste un MiniBatchKMeans bloc par bloc, sans charger tout le jeu en mémoire.
+
+        Args:
+            chunks (Iterable[np.ndarray]): Blocs de données réduites (au moins `n_clusters` lignes pour le premier).
+            n_clusters (int): Nombre de clusters.
+            batch_size (int): Taille des mini-batchs.
+
+        Returns:
+            MiniBatchKMeans: Modèle ajusté ; `predict` donne les labels de nouveaux blocs.
+        """
+        from sklearn.cluster import MiniBatchKMeans
+
+        cluster_model = MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, random_state=42)
+        n_rows = 0
+        for chunk in chunks:
+            cluster_model.partial_fit(np.asarray(chunk))
+            n_rows += len(chunk)
+        if n_rows == 0:
+            raise ValueError("No data provided to partial_fit_kmeans.")
+        logger.info(f"MiniBatchKMeans fitted incrementally on {n_rows} points.")
+        return cluster_model
+
+    def _assign_remaining(
+        self,
+        cluster_model: Any,
+        embeddings: np.ndarray,
+        sample_indices: np.ndarray,
+        sample_labels: np.ndarray,
+        n_jobs: Optional[int],
+        chunk_size: int,
+    ) -> np.ndarray:
+        """
+        Affecte les points hors échantillon au modèle ajusté sur l'échantillon, par blocs.
+
+        Returns:
+            np.ndarray: Labels de tous les points.
+        """
+        import hdbscan
+        from sklearn.cluster import DBSCAN
+        from sklearn.neighbors import NearestNeighbors
+
+        labels = np.full(len(embeddings), -1, dtype=np.int64)
+        labels[sample_indices] = sample_labels
+        remaining = np.ones(len(embeddings), dtype=bool)
+        remaining[sample_indices] = False
+        remaining_indices = np.flatnonzero(remaining)
+
+        if isinstance(cluster_model, DBSCAN):
+            core_indices = cluster_model.core_sample_indices_
+            if core_indices.size == 0:
+                return labels
+            core_points = embeddings[sample_indices[core_indices]]
+            core_labels = sample_labels[core_indices]
+            neighbors = NearestNeighbors(n_neighbors=1, n_jobs=n_jobs).fit(core_points)
+
+        for start in range(0, remaining_indices.size, chunk_size):
+            block = remaining_indices[start:start + chunk_size]
+            if isinstance(cluster_model, DBSCAN):
+                distances, nearest = neighbors.kneighbors(embeddings[block])
+                within = distances[:, 0] <= cluster_model.eps
+                labels[block[within]] = core_labels[nearest[within, 0]]
+            else:
+                labels[block], _ = hdbscan.approximate_predict(cluster_model, embeddings[block])
+        return labels
+
+    def visualize_clusters(
+        self,
+        embeddings: np.ndarray,
+        labels: List[int],
+        interactive: bool = True,
+        save_path: str = None,
+        headless: bool = False,
+        max_points: Optional[int] = 200_000,
+        mode: str = "scatter",
+        webgl_threshold: int = 5000,
+        density_bins: int = 200,
+        include_plotlyjs: Optional[Union[bool, str]] = None,
+    ):
         """
         Visualise les clusters en 2D avec des options interactives.
 
@@ -94,38 +379,91 @@ class ClusteringService:
             labels (List[int]): Labels des clusters.
             interactive (bool): Générer une visualisation interactive (Plotly) ou statique (Matplotlib).
             save_path (str): Chemin pour enregistrer la visualisation (facultatif).
+            headless (bool): Ne jamais afficher la figure (serveur, tâches batch) ; seul l'export a lieu.
+            max_points (Optional[int]): Nombre maximal de points tracés, sous-échantillonnés par cluster
+                (None pour tout tracer).
+            mode (str): 'scatter' (points) ou 'density' (histogramme 2D calculé côté serveur, taille fixe).
+            webgl_threshold (int): Au-delà de ce nombre de points, le nuage Plotly est rendu en WebGL.
+            density_bins (int): Nombre de cases par axe en mode 'density'.
+            include_plotlyjs (Optional[Union[bool, str]]): Inclusion de plotly.js dans le HTML ; par défaut
+                'directory' en mode headless (fichier plotly.min.js partagé à côté du HTML), sinon intégré.
+
+        Returns:
+            Any: Figure Plotly ou Matplotlib générée.
         """
         if embeddings.shape[1] != 2:
             raise ValueError("Embeddings must be 2D for visualization.")
+        if mode not in ("scatter", "density"):
+            raise ValueError(f"Unsupported visualization mode: {mode}")
+
+        labels = np.asarray(labels)
+        if mode == "scatter" and max_points is not None and len(embeddings) > max_points:
+            keep = self._stratified_sample_indices(labels, max_points)
+            logger.info(f"Downsampling visualization from {len(embeddings)} to {keep.size} points.")
+            embeddings, labels = embeddings[keep], labels[keep]
 
         logger.info("Generating cluster visualization...")
         try:
-            if interactive:
-                # Utilisation de Plotly pour une visualisation interactive
-                fig = px.scatter(
-                    x=embeddings[:, 0],
-                    y=embeddings[:, 1],
-                    color=labels,
-                    title="Interactive Cluster Visualization",
-                    labels={"x": "UMAP Dim 1", "y": "UMAP Dim 2", "color": "Cluster"},
-                )
-                if save_path:
-                    fig.write_html(save_path)
-                    logger.info(f"Interactive cluster visualization saved to {save_path}.")
-                fig.show()
-            else:
-                # Visualisation statique avec Matplotlib
-                plt.figure(figsize=(10, 8))
-                scatter = plt.scatter(embeddings[:, 0], embeddings[:, 1], c=labels, cmap="tab10", s=20)
-                plt.title("Static Cluster Visualization")
-                plt.xlabel("UMAP Dim 1")
-                plt.ylabel("UMAP Dim 2")
-                plt.colorbar(scatter, label="Cluster")
-                if save_path:
-                    plt.savefig(save_path)
-                    logger.info(f"Static cluster visualization saved to {save_path}.")
+            with self.metrics.timer("clustering.render"):
+                if interactive:
+                    # Utilisation de Plotly pour une visualisation interactive
+                    import plotly.express as px
+                    import plotly.graph_objects as go
+
+                    if mode == "density":
+                        counts, x_edges, y_edges = np.histogram2d(embeddings[:, 0], embeddings[:, 1], bins=density_bins)
+                        fig = go.Figure(
+                            go.Heatmap(
+                                z=counts.T,
+                                x=(x_edges[:-1] + x_edges[1:]) / 2,
+                                y=(y_edges[:-1] + y_edges[1:]) / 2,
+                                colorscale="Viridis",
+                                colorbar={"title": "Points"},
+                            )
+                        )
+                        fig.update_layout(
+                            title="Cluster Density", xaxis_title="UMAP Dim 1", yaxis_title="UMAP Dim 2"
+                        )
+                    else:
+                        fig = px.scatter(
+                            x=embeddings[:, 0],
+                            y=embeddings[:, 1],
+                            color=labels,
+                            title="Interactive Cluster Visualization",
+                            labels={"x": "UMAP Dim 1", "y": "UMAP Dim 2", "color": "Cluster"},
+                            render_mode="webgl" if len(embeddings) > webgl_threshold else "svg",
+                        )
+                    if save_path:
+                        if include_plotlyjs is None:
+                            include_plotlyjs = "directory" if headless else True
+                        fig.write_html(save_path, include_plotlyjs=include_plotlyjs)
+                        logger.info(f"Interactive cluster visualization saved to {save_path}.")
+                    if not headless:
+                        fig.show()
                 else:
-                    plt.show()
+                    # Visualisation statique avec Matplotlib
+                    import matplotlib.pyplot as plt
+
+                    fig = plt.figure(figsize=(10, 8))
+                    if mode == "density":
+                        mappable = plt.hexbin(
+                            embeddings[:, 0], embeddings[:, 1], gridsize=density_bins, mincnt=1, cmap="viridis"
+                        )
+                        plt.colorbar(mappable, label="Points")
+                    else:
+                        scatter = plt.scatter(embeddings[:, 0], embeddings[:, 1], c=labels, cmap="tab10", s=20)
+                        plt.colorbar(scatter, label="Cluster")
+                    plt.title("Static Cluster Visualization")
+                    plt.xlabel("UMAP Dim 1")
+                    plt.ylabel("UMAP Dim 2")
+                    if save_path:
+                        plt.savefig(save_path)
+                        logger.info(f"Static cluster visualization saved to {save_path}.")
+                    elif not headless:
+                        plt.show()
+                    if headless:
+                        plt.close(fig)
+            return fig
         except Exception as e:
             logger.error(f"Error during cluster visualization: {e}")
             raise
@@ -140,7 +478,8 @@ class ClusteringService:
             embeddings (Union[List[List[float]], np.ndarray]): Données haute dimension.
             method (str): Méthode de clustering ('kmeans', 'dbscan', 'hdbscan').
             interactive (bool): Générer une visualisation interactive ou statique.
-            **kwargs: Paramètres spécifiques au clustering.
+            **kwargs: Paramètres spécifiques au clustering, plus `save_path`, `headless`, `max_points`
+                et `visualization_mode` pour la visualisation.
 
         Returns:
             Dict[str, Any]: Résultats du clustering.
@@ -154,24 +493,39 @@ class ClusteringService:
                 labels=clustering_results["labels"],
                 interactive=interactive,
                 save_path=kwargs.get("save_path", None),
+                headless=kwargs.get("headless", False),
+                max_points=kwargs.get("max_points", 200_000),
+                mode=kwargs.get("visualization_mode", "scatter"),
             )
             return {"reduced_embeddings": reduced_embeddings, **clustering_results}
         except Exception as e:
             logger.error(f"Error in clustering pipeline: {e}")
             raise
 
-    def _validate_and_convert_embeddings(self, embeddings: Any) -> np.ndarray:
+    def _stratified_sample_indices(self, labels: np.ndarray, max_points: int) -> np.ndarray:
         """
-        Valide et convertit les embeddings en numpy array.
+        Sous-échantillonne les points proportionnellement à chaque cluster, en gardant au moins
+        un point par cluster pour que les petits groupes restent visibles.
 
         Args:
-            embeddings (Any): Données à valider.
+            labels (np.ndarray): Labels des clusters.
+            max_points (int): Nombre de points visé.
 
         Returns:
-            np.ndarray: Données validées et converties.
+            np.ndarray: Indices triés des points conservés.
+        """
+        rng = np.random.RandomState(42)
+        ratio = max_points / len(labels)
+        _, inverse, counts = np.unique(labels, return_inverse=True, return_counts=True)
+        order = np.argsort(inverse.ravel(), kind="stable")
+        kept = []
+        for members in np.split(order, np.cumsum(counts)[:-1]):
+            quota = min(members.size, max(1, int(round(members.size * ratio))))
+            kept.append(rng.choice(members, quota, replace=False))
+        return np.sort(np.concatenate(kept))
+
+    def _validate_and_convert_embeddings(self, embeddings: Any) -> np.ndarray:
+        """
+        Valide et convertit les embeddings en numpy array (voir `validate_embeddings`).
         """
-        if isinstance(embeddings, list):
-            embeddings = np.array(embeddings)
-        if not isinstance(embeddings, np.ndarray) or embeddings.ndim != 2 or embeddings.size == 0:
-            raise ValueError("Embeddings must be a non-empty 2D numpy array or a list of lists.")
-        return embeddings
+        return validate_embeddings(embeddings)
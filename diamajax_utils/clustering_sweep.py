@@ -0,0 +1,204 @@
+import itertools
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import hdbscan
+import numpy as np
+from hdbscan.validity import validity_index
+from joblib import Memory
+from sklearn.cluster import DBSCAN, KMeans
+from sklearn.metrics import silhouette_score
+from sklearn.neighbors import NearestNeighbors
+
+from .clustering_service import validate_embeddings
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_METHODS = ("kmeans", "dbscan", "hdbscan")
+
+# Données partagées par les processus du pool, initialisées une fois par processus.
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(embeddings: np.ndarray, radius_graph: Any, memory_dir: Optional[str], score_indices: np.ndarray):
+    _WORKER_STATE.update(
+        embeddings=embeddings, radius_graph=radius_graph, memory_dir=memory_dir, score_indices=score_indices
+    )
+
+
+def _evaluate_in_worker(config: Tuple[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return _evaluate(config, **_WORKER_STATE)
+
+
+def _evaluate(
+    config: Tuple[str, Dict[str, Any]],
+    embeddings: np.ndarray,
+    radius_graph: Any,
+    memory_dir: Optional[str],
+    score_indices: np.ndarray,
+) -> Dict[str, Any]:
+    """
+    Ajuste une configuration avec les précalculs partagés et la note sur le sous-échantillon commun.
+
+    Returns:
+        Dict[str, Any]: Ligne du tableau de résultats.
+    """
+    method, params = config
+    start = time.perf_counter()
+    if method == "kmeans":
+        labels = KMeans(n_clusters=params.get("n_clusters", 5), random_state=42).fit_predict(embeddings)
+    elif method == "dbscan":
+        # Le graphe de rayon maximal est filtré par DBSCAN selon son propre eps.
+        labels = DBSCAN(
+            eps=params.get("eps", 0.5), min_samples=params.get("min_samples", 5), metric="precomputed"
+        ).fit_predict(radius_graph)
+    else:
+        # L'arbre couvrant ne dépend que des données et de min_samples, fixé pour toute la grille
+        # (voir `_expand_grid`) : le cache joblib le réutilise quand seul min_cluster_size change.
+        labels = hdbscan.HDBSCAN(
+            min_cluster_size=params.get("min_cluster_size", 5),
+            min_samples=params.get("min_samples"),
+            memory=Memory(memory_dir, verbose=0),
+        ).fit_predict(embeddings)
+    fit_time = time.perf_counter() - start
+
+    clustered = labels >= 0
+    n_clusters = int(np.unique(labels[clustered]).size)
+    row = {
+        "method": method,
+        "params": params,
+        "n_clusters": n_clusters,
+        "noise_ratio": float(1.0 - clustered.mean()),
+        "silhouette": None,
+        "dbcv": None,
+        "fit_time_s": fit_time,
+    }
+
+    sample = embeddings[score_indices]
+    sample_labels = labels[score_indices]
+    kept = sample_labels >= 0
+    if np.unique(sample_labels[kept]).size >= 2:
+        row["silhouette"] = float(silhouette_score(sample[kept], sample_labels[kept]))
+        try:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                dbcv = float(validity_index(sample.astype(np.float64), sample_labels))
+            row["dbcv"] = dbcv if np.isfinite(dbcv) else None
+        except (ValueError, ZeroDivisionError) as e:
+            logger.debug(f"DBCV unavailable for {method} {params}: {e}")
+    return row
+
+
+class ClusteringSweep:
+    """
+    Balayage d'hyperparamètres de clustering : les structures de voisinage sont calculées une fois
+    et partagées entre configurations, exécutées en parallèle sur un pool de processus.
+    """
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        n_jobs: int = 1,
+        score_sample_size: int = 5000,
+        cache_dir: Optional[str] = None,
+        random_state: int = 42,
+    ):
+        """
+        Initialise le balayage.
+
+        Args:
+            embeddings (np.ndarray): Données réduites à clusteriser.
+            n_jobs (int): Processus utilisés pour évaluer les configurations (-1 pour tous les cœurs).
+            score_sample_size (int): Taille du sous-échantillon commun pour silhouette et DBCV.
+            cache_dir (Optional[str]): Répertoire du cache HDBSCAN, conservé entre balayages
+                (par défaut, un répertoire temporaire supprimé à la fin de chaque `run`).
+            random_state (int): État aléatoire du sous-échantillonnage.
+        """
+        embeddings = validate_embeddings(embeddings)
+        self.embeddings = embeddings
+        self.n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+        self.cache_dir = cache_dir
+        rng = np.random.RandomState(random_state)
+        size = min(score_sample_size, len(embeddings))
+        self.score_indices = np.sort(rng.choice(len(embeddings), size, replace=False))
+
+    def run(self, param_grid: Dict[str, Dict[str, Sequence[Any]]], rank_by: str = "silhouette") -> List[Dict[str, Any]]:
+        """
+        Évalue toutes les combinaisons de la grille et retourne un tableau classé.
+
+        Args:
+            param_grid (Dict[str, Dict[str, Sequence[Any]]]): Valeurs à tester par méthode, par exemple
+                {"dbscan": {"eps": [0.3, 0.5], "min_samples": [5, 10]}}. Pour HDBSCAN, `min_samples`
+                vaut par défaut le plus petit `min_cluster_size` de la grille (et non `min_cluster_size`
+                de chaque configuration), afin de partager l'arbre couvrant ; la valeur retenue figure
+                dans les `params` de chaque ligne.
+            rank_by (str): Colonne de classement ('silhouette' ou 'dbcv'), décroissante ; les
+                configurations non notées (moins de deux clusters) sont classées en dernier.
+
+        Returns:
+            List[Dict[str, Any]]: Une ligne par configuration (méthode, paramètres, nombre de clusters,
+                taux de bruit, scores et temps d'ajustement), de la meilleure à la moins bonne.
+        """
+        if rank_by not in ("silhouette", "dbcv"):
+            raise ValueError(f"Unsupported ranking metric: {rank_by}")
+        configs = self._expand_grid(param_grid)
+        radius_graph = self._radius_graph(configs)
+        logger.info(f"Running clustering sweep over {len(configs)} configurations with n_jobs={self.n_jobs}...")
+
+        cache_context = (
+            nullcontext(self.cache_dir) if self.cache_dir else tempfile.TemporaryDirectory(prefix="diamajax-sweep-")
+        )
+        with cache_context as memory_dir:
+            shared = (self.embeddings, radius_graph, memory_dir, self.score_indices)
+            if self.n_jobs > 1 and len(configs) > 1:
+                # "spawn" : un fork après le démarrage des pools de threads numba/TBB (UMAP) ou OpenMP
+                # bloque le processus parent à sa sortie.
+                with ProcessPoolExecutor(
+                    max_workers=min(self.n_jobs, len(configs)),
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=shared,
+                ) as executor:
+                    rows = list(executor.map(_evaluate_in_worker, configs))
+            else:
+                rows = [_evaluate(config, *shared) for config in configs]
+
+        rows.sort(key=lambda row: (row[rank_by] is None, -(row[rank_by] or 0.0)))
+        for rank, row in enumerate(rows, start=1):
+            row["rank"] = rank
+        logger.info("Clustering sweep completed.")
+        return rows
+
+    def _expand_grid(self, param_grid: Dict[str, Dict[str, Sequence[Any]]]) -> List[Tuple[str, Dict[str, Any]]]:
+        configs = []
+        for method, grid in param_grid.items():
+            if method not in SUPPORTED_METHODS:
+                raise ValueError(f"Unsupported clustering method: {method}")
+            grid = dict(grid)
+            if method == "hdbscan" and "min_samples" not in grid:
+                # Sans min_samples, HDBSCAN prend min_cluster_size : chaque valeur recalculerait l'arbre.
+                grid["min_samples"] = [min(grid.get("min_cluster_size", [5]))]
+            names = sorted(grid)
+            for values in itertools.product(*(grid[name] for name in names)):
+                configs.append((method, dict(zip(names, values))))
+        if not configs:
+            raise ValueError("param_grid must contain at least one configuration.")
+        return configs
+
+    def _radius_graph(self, configs: List[Tuple[str, Dict[str, Any]]]) -> Any:
+        """
+        Calcule une seule fois le graphe de voisinage au plus grand eps DBSCAN de la grille.
+        """
+        eps_values = [params.get("eps", 0.5) for method, params in configs if method == "dbscan"]
+        if not eps_values:
+            return None
+        start = time.perf_counter()
+        neighbors = NearestNeighbors(radius=max(eps_values), n_jobs=self.n_jobs).fit(self.embeddings)
+        graph = neighbors.radius_neighbors_graph(self.embeddings, mode="distance")
+        logger.info(f"Radius neighbors graph computed in {time.perf_counter() - start:.2f}s ({graph.nnz} edges).")
+        return graph
@@ -1,34 +1,137 @@
+import hashlib
+import json
+import multiprocessing
 import os
 import io
 import logging
-from typing import Dict
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Union
 
-from selenium import webdriver
-from PIL import Image
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+from .image_renderer import SUPPORTED_FORMATS, ImageRenderer
+from .instrumentation import Metrics, get_metrics
+from .live_dashboard import LiveDashboard
+
+# plotly est importé à la première génération, selenium et PIL seulement pour l'export en image.
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 logger = logging.getLogger(__name__)
 
+MANIFEST_FILE = "manifest.json"
+# Le nom du bundle porte la version de plotly : une mise à jour n'utilise jamais un bundle périmé.
+PLOTLYJS_FILE = "plotly-{version}.min.js"
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _render_dashboard(kind: str, data: Dict[str, Any], output_path: str, plotlyjs_file: str) -> str:
+    """
+    Construit et écrit un tableau de bord qui référence le bundle plotly.js partagé du répertoire.
+    """
+    fig = getattr(DashboardGenerator, f"build_{kind}_figure")(data)
+    # Écriture atomique : une interruption ne laisse pas de HTML tronqué derrière un hash à jour.
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    fig.write_html(tmp_path, include_plotlyjs=plotlyjs_file)
+    os.replace(tmp_path, output_path)
+    return output_path
+
 
 class DashboardGenerator:
     """
     Génère des tableaux de bord interactifs avec support pour l’exportation.
     """
 
-    def __init__(self, output_dir: str = "dashboards"):
+    def __init__(self, output_dir: str = "dashboards", metrics: Optional[Metrics] = None):
         """
         Initialise la classe DashboardGenerator.
 
         Args:
             output_dir (str): Répertoire pour sauvegarder les tableaux de bord.
+            metrics (Optional[Metrics]): Registre des mesures (par défaut, le registre partagé de `get_metrics`).
         """
         self.output_dir = output_dir
+        self.metrics = metrics if metrics is not None else get_metrics()
         os.makedirs(output_dir, exist_ok=True)
+        self._image_renderer: Optional[ImageRenderer] = None
         logger.info(f"DashboardGenerator initialized. Output directory: {output_dir}")
 
+    @staticmethod
+    def build_dashboard_figure(data: Dict[str, Dict[str, int]]) -> "go.Figure":
+        """
+        Construit la figure d'un tableau de bord : un histogramme par entrée de `data`.
+
+        Args:
+            data (Dict[str, Dict[str, int]]): Données pour générer les graphiques.
+
+        Returns:
+            go.Figure: Figure Plotly.
+        """
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
+        fig = make_subplots(
+            rows=1,
+            cols=len(data),
+            subplot_titles=[f"{key}" for key in data.keys()],
+        )
+
+        # Ajout des graphiques
+        col = 1
+        for title, values in data.items():
+            fig.add_trace(
+                go.Bar(x=list(values.keys()), y=list(values.values()), name=title),
+                row=1,
+                col=col,
+            )
+            col += 1
+
+        fig.update_layout(
+            title="Dashboard",
+            barmode="group",
+            template="plotly_dark",
+            height=600,
+            width=1200,
+        )
+        return fig
+
+    @staticmethod
+    def build_sentiment_figure(sentiment_data: Dict[str, int]) -> "go.Figure":
+        """
+        Construit la figure d'analyse des sentiments : répartition (camembert) et détail (barres).
+
+        Args:
+            sentiment_data (Dict[str, int]): Données d’analyse des sentiments.
+
+        Returns:
+            go.Figure: Figure Plotly.
+        """
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
+        fig = make_subplots(
+            rows=1,
+            cols=2,
+            subplot_titles=["Sentiment Distribution", "Sentiment Details"],
+            specs=[[{"type": "domain"}, {"type": "xy"}]],
+        )
+        fig.add_trace(
+            go.Pie(labels=list(sentiment_data.keys()), values=list(sentiment_data.values()), title="Sentiment Distribution"),
+            row=1,
+            col=1,
+        )
+        fig.add_trace(
+            go.Bar(x=list(sentiment_data.keys()), y=list(sentiment_data.values()), name="Details"),
+            row=1,
+            col=2,
+        )
+        return fig
+
     def create_dashboard(
-        self, data: Dict[str, Dict[str, int]], output_file: str = "dashboard.html"
+        self,
+        data: Dict[str, Dict[str, int]],
+        output_file: str = "dashboard.html",
+        include_plotlyjs: Union[bool, str] = True,
     ) -> str:
         """
         Crée un tableau de bord interactif basé sur les données fournies.
@@ -36,46 +139,27 @@ class DashboardGenerator:
         Args:
             data (Dict[str, Dict[str, int]]): Données pour générer les graphiques.
             output_file (str): Nom du fichier HTML exporté.
+            include_plotlyjs (Union[bool, str]): Inclusion de plotly.js (voir `Figure.write_html`) ;
+                "directory" référence un plotly.min.js partagé dans `output_dir`.
 
         Returns:
             str: Chemin vers le fichier généré.
         """
         try:
             logger.info("Creating dashboard...")
-            fig = make_subplots(
-                rows=1,
-                cols=len(data),
-                subplot_titles=[f"{key}" for key in data.keys()],
-            )
-
-            # Ajout des graphiques
-            col = 1
-            for title, values in data.items():
-                fig.add_trace(
-                    go.Bar(x=list(values.keys()), y=list(values.values()), name=title),
-                    row=1,
-                    col=col,
-                )
-                col += 1
-
-            fig.update_layout(
-                title="Dashboard",
-                barmode="group",
-                template="plotly_dark",
-                height=600,
-                width=1200,
-            )
+            with self.metrics.timer("dashboard.render"):
+                fig = self.build_dashboard_figure(data)
 
-            # Exporter le tableau de bord
-            output_path = os.path.join(self.output_dir, output_file)
-            fig.write_html(output_path)
+                # Exporter le tableau de bord
+                output_path = os.path.join(self.output_dir, output_file)
+                fig.write_html(output_path, include_plotlyjs=include_plotlyjs)
             logger.info(f"Dashboard exported to: {output_path}")
             return output_path
         except Exception as e:
             logger.error(f"Error creating dashboard: {e}")
             return ""
 
-    def add_pie_chart(self, fig: go.Figure, data: Dict[str, int], title: str, row: int, col: int):
+    def add_pie_chart(self, fig: "go.Figure", data: Dict[str, int], title: str, row: int, col: int):
         """
         Ajoute un graphique en camembert au tableau de bord.
 
@@ -87,6 +171,8 @@ class DashboardGenerator:
             col (int): Colonne cible.
         """
         try:
+            import plotly.graph_objects as go
+
             fig.add_trace(
                 go.Pie(labels=list(data.keys()), values=list(data.values()), title=title),
                 row=row,
@@ -97,7 +183,10 @@ class DashboardGenerator:
             logger.error(f"Error adding pie chart: {e}")
 
     def generate_sentiment_dashboard(
-        self, sentiment_data: Dict[str, int], output_file: str = "sentiment_dashboard.html"
+        self,
+        sentiment_data: Dict[str, int],
+        output_file: str = "sentiment_dashboard.html",
+        include_plotlyjs: Union[bool, str] = True,
     ) -> str:
         """
         Génère un tableau de bord pour l'analyse des sentiments.
@@ -105,39 +194,229 @@ class DashboardGenerator:
         Args:
             sentiment_data (Dict[str, int]): Données d’analyse des sentiments.
             output_file (str): Nom du fichier exporté.
+            include_plotlyjs (Union[bool, str]): Inclusion de plotly.js (voir `create_dashboard`).
 
         Returns:
             str: Chemin vers le fichier généré.
         """
         try:
             logger.info("Generating sentiment analysis dashboard...")
-            fig = make_subplots(
-                rows=1, cols=2, subplot_titles=["Sentiment Distribution", "Sentiment Details"]
-            )
-
-            # Ajouter un graphique en barre
-            self.add_pie_chart(fig, sentiment_data, "Sentiment Distribution", row=1, col=1)
-
-            # Ajouter un graphique détaillé
-            fig.add_trace(
-                go.Bar(x=list(sentiment_data.keys()), y=list(sentiment_data.values()), name="Details"),
-                row=1,
-                col=2,
-            )
+            with self.metrics.timer("dashboard.render"):
+                fig = self.build_sentiment_figure(sentiment_data)
 
-            # Exporter le tableau de bord
-            output_path = os.path.join(self.output_dir, output_file)
-            fig.write_html(output_path)
+                # Exporter le tableau de bord
+                output_path = os.path.join(self.output_dir, output_file)
+                fig.write_html(output_path, include_plotlyjs=include_plotlyjs)
             logger.info(f"Sentiment dashboard exported to: {output_path}")
             return output_path
         except Exception as e:
             logger.error(f"Error generating sentiment dashboard: {e}")
             return ""
 
+    def generate_batch(
+        self,
+        dashboards: Dict[str, Dict[str, Any]],
+        kind: str = "dashboard",
+        n_jobs: int = 1,
+        force: bool = False,
+    ) -> Dict[str, str]:
+        """
+        Génère de nombreux tableaux de bord en une passe, `{nom}.html` dans `output_dir` ; les
+        caractères du nom autres que lettres, chiffres, '.', '_' et '-' sont remplacés par '_'.
+
+        Les fichiers référencent un unique `plotly-{version}.min.js` écrit une fois dans `output_dir`. Un
+        manifeste (`manifest.json`) conserve le hash des données de chaque tableau de bord : ceux
+        dont les données n'ont pas changé depuis la dernière génération ne sont pas réécrits.
+
+        Args:
+            dashboards (Dict[str, Dict[str, Any]]): Données de chaque tableau de bord, par nom.
+            kind (str): Type de tableau de bord ('dashboard' ou 'sentiment').
+            n_jobs (int): Processus de rendu (-1 pour tous les cœurs).
+            force (bool): Régénérer même les tableaux de bord inchangés.
+
+        Returns:
+            Dict[str, str]: Chemin de chaque tableau de bord (chaîne vide en cas d'échec).
+        """
+        if kind not in ("dashboard", "sentiment"):
+            raise ValueError(f"Unsupported dashboard kind: {kind}")
+        import plotly
+
+        n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+        manifest = self._load_manifest()
+        paths: Dict[str, str] = {}
+        pending = []
+        output_files = self._output_files(dashboards, "html")
+        for name, data in dashboards.items():
+            output_file = output_files[name]
+            output_path = os.path.join(self.output_dir, output_file)
+            payload = json.dumps([kind, data, plotly.__version__], sort_keys=True, default=str)
+            digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+            if not force and manifest.get(output_file) == digest and os.path.exists(output_path):
+                paths[name] = output_path
+            else:
+                pending.append((name, output_file, output_path, digest))
+        logger.info(f"Rendering {len(pending)} of {len(dashboards)} dashboards ({len(dashboards) - len(pending)} unchanged).")
+        self.metrics.increment("dashboard.skipped", len(dashboards) - len(pending))
+        if not pending:
+            return paths
+
+        plotlyjs_file = self._write_plotlyjs_bundle(plotly.__version__)
+        start = time.perf_counter()
+        if n_jobs > 1 and len(pending) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(n_jobs, len(pending)), mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                futures = [
+                    (item, executor.submit(_render_dashboard, kind, dashboards[item[0]], item[2], plotlyjs_file)) for item in pending
+                ]
+                results = [(item, future.exception()) for item, future in futures]
+        else:
+            results = []
+            for item in pending:
+                try:
+                    _render_dashboard(kind, dashboards[item[0]], item[2], plotlyjs_file)
+                    results.append((item, None))
+                except Exception as e:
+                    results.append((item, e))
+        self.metrics.observe("dashboard.batch", time.perf_counter() - start)
+
+        for (name, output_file, output_path, digest), error in results:
+            if error is None:
+                paths[name] = output_path
+                manifest[output_file] = digest
+                self.metrics.increment("dashboard.rendered")
+            else:
+                # Absent du manifeste : il sera retenté à la prochaine génération.
+                logger.error(f"Error rendering dashboard {name}: {error}")
+                paths[name] = ""
+                manifest.pop(output_file, None)
+                self.metrics.increment("dashboard.errors")
+        self._save_manifest(manifest)
+        return paths
+
+    @classmethod
+    def _output_files(cls, names: Iterable[str], extension: str) -> Dict[str, str]:
+        """
+        Associe à chaque nom un fichier `{nom}.{extension}` sûr dans `output_dir`.
+
+        Args:
+            names (Iterable[str]): Noms des tableaux de bord ou des figures.
+            extension (str): Extension des fichiers.
+
+        Returns:
+            Dict[str, str]: Nom de fichier de chaque nom.
+        """
+        output_files: Dict[str, str] = {}
+        owners: Dict[str, str] = {}
+        for name in names:
+            output_file = f"{cls._safe_file_stem(name)}.{extension}"
+            if owners.setdefault(output_file, name) != name:
+                raise ValueError(f"Names {owners[output_file]!r} and {name!r} map to the same file {output_file}.")
+            output_files[name] = output_file
+        return output_files
+
+    @staticmethod
+    def _safe_file_stem(name: str) -> str:
+        # Le nom ne doit ni sortir de output_dir ni produire un fichier caché.
+        stem = _UNSAFE_FILENAME_CHARS.sub("_", str(name)).lstrip(".")
+        if not stem:
+            raise ValueError(f"Invalid dashboard name: {name!r}.")
+        return stem
+
+    def _write_plotlyjs_bundle(self, version: str) -> str:
+        """
+        Écrit le bundle plotly.js partagé par les tableaux de bord générés en lot, s'il est absent.
+
+        Args:
+            version (str): Version de plotly installée.
+
+        Returns:
+            str: Nom du fichier du bundle, relatif à `output_dir`.
+        """
+        bundle_file_name = PLOTLYJS_FILE.format(version=self._safe_file_stem(version))
+        bundle_path = os.path.join(self.output_dir, bundle_file_name)
+        if os.path.exists(bundle_path):
+            return bundle_file_name
+        from plotly.offline import get_plotlyjs
+
+        tmp_path = f"{bundle_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as bundle_file:
+            bundle_file.write(get_plotlyjs())
+        os.replace(tmp_path, bundle_path)
+        return bundle_file_name
+
+    def _load_manifest(self) -> Dict[str, str]:
+        manifest_path = os.path.join(self.output_dir, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path, encoding="utf-8") as manifest_file:
+                return json.load(manifest_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable dashboard manifest {manifest_path}: {e}")
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, str]):
+        manifest_path = os.path.join(self.output_dir, MANIFEST_FILE)
+        tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+
+    def create_live_dashboard(self, **kwargs) -> LiveDashboard:
+        """
+        Crée un tableau de bord en direct alimenté par des mises à jour incrémentales.
+
+        Args:
+            **kwargs: Paramètres de LiveDashboard (`host`, `port`, `history`, `title`, ...).
+
+        Returns:
+            LiveDashboard: Tableau de bord à démarrer avec `start` (ou comme gestionnaire de contexte).
+        """
+        return LiveDashboard(**kwargs)
+
+    def export_images(
+        self, figures: Dict[str, "go.Figure"], format: str = "png", n_workers: int = 4
+    ) -> Dict[str, str]:
+        """
+        Exporte des figures en mémoire en images `{nom}.{format}` dans `output_dir` ; les noms sont
+        assainis comme dans `generate_batch`.
+
+        Le moteur Kaleido (qui requiert Chrome) est démarré au premier appel et réutilisé par les
+        suivants jusqu'à `close`.
+
+        Args:
+            figures (Dict[str, go.Figure]): Figures à exporter, par nom (voir `build_dashboard_figure`).
+            format (str): Format des images ('png', 'jpeg', 'webp', 'svg' ou 'pdf').
+            n_workers (int): Rendus simultanés du moteur (pris en compte à son démarrage).
+
+        Returns:
+            Dict[str, str]: Chemin de chaque image.
+        """
+        if format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported image format: {format}. Expected one of {list(SUPPORTED_FORMATS)}")
+        output_files = self._output_files(figures, format)
+        if self._image_renderer is None:
+            self._image_renderer = ImageRenderer(n_workers=n_workers)
+        names = list(figures)
+        paths = [os.path.join(self.output_dir, output_files[name]) for name in names]
+        self._image_renderer.export([figures[name] for name in names], paths, format=format)
+        return dict(zip(names, paths))
+
+    def close(self):
+        """
+        Arrête le moteur d'export d'images s'il a été démarré.
+        """
+        if self._image_renderer is not None:
+            self._image_renderer.stop()
+            self._image_renderer = None
+
     def export_to_image(self, input_file: str, output_file: str):
         """
         Exporte un tableau de bord HTML en image (PNG).
 
+        Lance un navigateur Chrome par appel ; préférer `export_images` pour les figures en mémoire.
+
         Args:
             input_file (str): Chemin du fichier HTML d’entrée.
             output_file (str): Chemin du fichier image exporté.
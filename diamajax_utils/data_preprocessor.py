@@ -1,40 +1,355 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-from typing import List, Union
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from .instrumentation import Metrics, get_metrics
+
+ArrayLike = Union[List[List[float]], np.ndarray]
+
 
 class DataPreprocessor:
     """
     Gère le prétraitement des données pour le clustering ou les modèles.
     """
 
-    def __init__(self, normalize: bool = True, standardize: bool = True):
+    def __init__(
+        self,
+        normalize: bool = True,
+        standardize: bool = True,
+        n_jobs: int = 1,
+        chunk_size: int = 65536,
+        metrics: Optional[Metrics] = None,
+    ):
         """
         Initialise les paramètres de prétraitement.
 
         Args:
             normalize (bool): Normaliser les données (MinMax Scaling).
             standardize (bool): Standardiser les données (Moyenne=0, Écart-type=1).
+            n_jobs (int): Threads utilisés pour traiter les blocs de lignes (-1 pour tous les cœurs).
+            chunk_size (int): Nombre de lignes par bloc.
+            metrics (Optional[Metrics]): Registre des mesures (par défaut, le registre partagé de `get_metrics`).
         """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size doit être strictement positif.")
+        if n_jobs == 0 or n_jobs < -1:
+            raise ValueError("n_jobs doit être strictement positif ou -1.")
         self.normalize = normalize
         self.standardize = standardize
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self.metrics = metrics if metrics is not None else get_metrics()
+        self.reset()
+
+    def reset(self):
+        """
+        Efface les statistiques accumulées par `partial_fit`.
+        """
+        self.n_samples_ = 0
+        self.mean_: Optional[np.ndarray] = None
+        self.m2_: Optional[np.ndarray] = None
+        self.min_: Optional[np.ndarray] = None
+        self.max_: Optional[np.ndarray] = None
+
+    @property
+    def is_fitted(self) -> bool:
+        """
+        Indique si des statistiques ont été accumulées.
+        """
+        return self.n_samples_ > 0
 
-    def preprocess(self, data: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+    @property
+    def std_(self) -> np.ndarray:
+        """
+        Écart-type (population) par colonne des données vues.
+        """
+        self._check_fitted()
+        return np.sqrt(self.m2_ / self.n_samples_)
+
+    def preprocess(self, data: ArrayLike, out: Optional[np.ndarray] = None, dtype: Optional[np.dtype] = None) -> np.ndarray:
         """
         Applique le prétraitement sur les données.
 
+        Les statistiques sont calculées sur `data` elles-mêmes (sans modifier celles ajustées par
+        `fit`), puis appliquées en une seule transformation affine via `transform`.
+
         Args:
             data (Union[List[List[float]], np.ndarray]): Données brutes.
+            out (Optional[np.ndarray]): Tampon de sortie (peut être `data` pour un calcul en place).
+            dtype (Optional[np.dtype]): Dtype de sortie (par défaut, celui des données si flottant, sinon float64).
 
         Returns:
             np.ndarray: Données prétraitées.
         """
         data = self._validate_and_convert(data)
+        stats = DataPreprocessor(
+            normalize=self.normalize,
+            standardize=self.standardize,
+            n_jobs=self.n_jobs,
+            chunk_size=self.chunk_size,
+            metrics=self.metrics,
+        ).fit(data)
+        return stats.transform(data, out=out, dtype=dtype)
+
+    def partial_fit(self, chunk: ArrayLike) -> "DataPreprocessor":
+        """
+        Met à jour incrémentalement moyenne, variance, minimum et maximum avec un bloc de lignes.
+
+        Les moments sont fusionnés par la formule de Chan (Welford par blocs), numériquement stable.
 
-        if self.standardize:
-            data = (data - np.mean(data, axis=0)) / np.std(data, axis=0)
+        Args:
+            chunk (Union[List[List[float]], np.ndarray]): Bloc de données brutes.
+
+        Returns:
+            DataPreprocessor: L'instance courante.
+        """
+        return self._merge_moments(self._chunk_moments(self._validate_and_convert(chunk)))
+
+    def _chunk_moments(self, chunk: np.ndarray) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calcule effectif, moyenne, somme des carrés des écarts, minimum et maximum d'un bloc.
+        """
+        chunk_mean = chunk.mean(axis=0, dtype=np.float64)
+        chunk_m2 = ((chunk - chunk_mean) ** 2).sum(axis=0, dtype=np.float64)
+        return (
+            chunk.shape[0],
+            chunk_mean,
+            chunk_m2,
+            chunk.min(axis=0).astype(np.float64),
+            chunk.max(axis=0).astype(np.float64),
+        )
+
+    def _merge_moments(self, moments: Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]) -> "DataPreprocessor":
+        """
+        Fusionne les moments d'un bloc dans les statistiques accumulées.
+        """
+        count, chunk_mean, chunk_m2, chunk_min, chunk_max = moments
+        if self.is_fitted and chunk_mean.shape[0] != self.mean_.shape[0]:
+            raise ValueError(
+                f"Nombre de colonnes incohérent : {chunk_mean.shape[0]} au lieu de {self.mean_.shape[0]}."
+            )
+
+        if not self.is_fitted:
+            self.n_samples_ = count
+            self.mean_, self.m2_ = chunk_mean, chunk_m2
+            self.min_, self.max_ = chunk_min, chunk_max
+            return self
+
+        total = self.n_samples_ + count
+        delta = chunk_mean - self.mean_
+        self.mean_ = self.mean_ + delta * (count / total)
+        self.m2_ = self.m2_ + chunk_m2 + delta ** 2 * (self.n_samples_ * count / total)
+        self.min_ = np.minimum(self.min_, chunk_min)
+        self.max_ = np.maximum(self.max_, chunk_max)
+        self.n_samples_ = total
+        return self
+
+    def fit(
+        self, data: Union[ArrayLike, str, Iterable[np.ndarray]], chunk_size: Optional[int] = None
+    ) -> "DataPreprocessor":
+        """
+        Calcule les statistiques sur un jeu complet, un fichier .npy ou un itérateur de blocs.
+
+        Pour les tableaux et fichiers, les moments des blocs sont calculés en parallèle sur
+        `n_jobs` threads puis fusionnés dans l'ordre ; les itérateurs sont consommés séquentiellement.
+
+        Args:
+            data (Union[ArrayLike, str, Iterable[np.ndarray]]): Données, chemin .npy (mappé en mémoire) ou blocs.
+            chunk_size (Optional[int]): Nombre de lignes par bloc (par défaut, `self.chunk_size`).
+
+        Returns:
+            DataPreprocessor: L'instance courante.
+        """
+        self.reset()
+        chunk_size = chunk_size or self.chunk_size
+        if isinstance(data, str):
+            data = np.load(data, mmap_mode="r")
+        if isinstance(data, list) and not (data and isinstance(data[0], np.ndarray)):
+            data = self._validate_and_convert(data)
+        if isinstance(data, np.ndarray):
+            chunks = list(self.iter_chunks(self._validate_and_convert(data), chunk_size))
+            for moments in self._map_chunks(self._chunk_moments, chunks):
+                self._merge_moments(moments)
+            return self
+
+        for chunk in self.iter_chunks(data, chunk_size):
+            self.partial_fit(chunk)
+        return self
+
+    def affine_params(self, dtype: np.dtype = np.float64) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Précalcule la transformation affine fusionnée `(x - offset) * scale` équivalente au prétraitement.
+
+        Standardiser puis normaliser revient à une normalisation MinMax des données brutes, la
+        standardisation étant affine croissante. Soustraire avant de multiplier évite les pertes
+        de précision en float32. Les colonnes constantes reçoivent scale = 0 (sortie nulle) au
+        lieu d'une division par zéro.
+
+        Args:
+            dtype (np.dtype): Dtype des coefficients.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Coefficients `offset` et `scale` par colonne.
+        """
+        self._check_fitted()
         if self.normalize:
-            data = (data - np.min(data, axis=0)) / (np.max(data, axis=0) - np.min(data, axis=0))
+            span = self.max_ - self.min_
+            center = self.min_
+        elif self.standardize:
+            span = self.std_
+            center = self.mean_
+        else:
+            return np.zeros_like(self.mean_, dtype=dtype), np.ones_like(self.mean_, dtype=dtype)
 
-        return data
+        scale = np.divide(1.0, span, out=np.zeros_like(span), where=span != 0)
+        return center.astype(dtype), scale.astype(dtype)
+
+    def transform(self, data: ArrayLike, out: Optional[np.ndarray] = None, dtype: Optional[np.dtype] = None) -> np.ndarray:
+        """
+        Applique le prétraitement avec les statistiques ajustées, sans les recalculer.
+
+        Le calcul se fait en deux passes sur le tampon de sortie, sans tableau temporaire.
+
+        Args:
+            data (Union[List[List[float]], np.ndarray]): Données brutes.
+            out (Optional[np.ndarray]): Tampon de sortie (peut être `data` pour un calcul en place).
+            dtype (Optional[np.dtype]): Dtype de sortie (par défaut, celui de `out`, sinon celui des
+                données si flottant, sinon float64).
+
+        Returns:
+            np.ndarray: Données prétraitées.
+        """
+        self._check_fitted()
+        data = self._validate_and_convert(data)
+        if data.shape[1] != self.mean_.shape[0]:
+            raise ValueError(
+                f"Nombre de colonnes incohérent : {data.shape[1]} au lieu de {self.mean_.shape[0]}."
+            )
+
+        if out is not None:
+            if out.shape != data.shape:
+                raise ValueError(f"Forme du tampon de sortie incohérente : {out.shape} au lieu de {data.shape}.")
+            dtype = out.dtype
+        elif dtype is None:
+            dtype = data.dtype if np.issubdtype(data.dtype, np.floating) else np.float64
+        if not np.issubdtype(dtype, np.floating):
+            raise ValueError(f"Le dtype de sortie doit être flottant, reçu : {dtype}.")
+
+        offset, scale = self.affine_params(dtype)
+        if out is None:
+            out = np.empty(data.shape, dtype=dtype)
+
+        def apply(rows: slice):
+            np.subtract(data[rows], offset, out=out[rows], casting="unsafe")
+            np.multiply(out[rows], scale, out=out[rows])
+
+        # Chaque thread écrit sa propre tranche de lignes du tampon partagé (NumPy libère le GIL).
+        row_slices = [slice(start, start + self.chunk_size) for start in range(0, data.shape[0], self.chunk_size)]
+        with self.metrics.timer("preprocess.transform"):
+            for _ in self._map_chunks(apply, row_slices):
+                pass
+        self.metrics.increment("preprocess.rows", data.shape[0])
+        return out
+
+    def transform_stream(
+        self, data: Union[str, np.ndarray, Iterable[np.ndarray]], chunk_size: Optional[int] = None
+    ) -> Iterator[np.ndarray]:
+        """
+        Transforme un flux de blocs (itérateur, tableau ou fichier .npy mappé en mémoire) bloc par bloc.
+
+        Args:
+            data (Union[str, np.ndarray, Iterable[np.ndarray]]): Source des blocs.
+            chunk_size (Optional[int]): Nombre de lignes par bloc (par défaut, `self.chunk_size`).
+
+        Yields:
+            np.ndarray: Blocs prétraités.
+        """
+        self._check_fitted()
+        for chunk in self.iter_chunks(data, chunk_size or self.chunk_size):
+            yield self.transform(chunk)
+
+    def save_stats(self, path: str):
+        """
+        Enregistre les statistiques ajustées (format .npz).
+
+        Args:
+            path (str): Chemin du fichier.
+        """
+        self._check_fitted()
+        np.savez(
+            path,
+            n_samples=self.n_samples_,
+            mean=self.mean_,
+            m2=self.m2_,
+            min=self.min_,
+            max=self.max_,
+            normalize=self.normalize,
+            standardize=self.standardize,
+        )
+
+    @classmethod
+    def load_stats(cls, path: str) -> "DataPreprocessor":
+        """
+        Recrée un préprocesseur ajusté depuis un fichier écrit par `save_stats`.
+
+        Args:
+            path (str): Chemin du fichier .npz.
+
+        Returns:
+            DataPreprocessor: Préprocesseur prêt pour `transform`.
+        """
+        with np.load(path) as stats:
+            preprocessor = cls(normalize=bool(stats["normalize"]), standardize=bool(stats["standardize"]))
+            preprocessor.n_samples_ = int(stats["n_samples"])
+            preprocessor.mean_ = stats["mean"]
+            preprocessor.m2_ = stats["m2"]
+            preprocessor.min_ = stats["min"]
+            preprocessor.max_ = stats["max"]
+        return preprocessor
+
+    @staticmethod
+    def iter_chunks(data: Union[ArrayLike, str, Iterable[np.ndarray]], chunk_size: int = 65536) -> Iterator[np.ndarray]:
+        """
+        Découpe une source de données en blocs de lignes.
+
+        Args:
+            data (Union[ArrayLike, str, Iterable[np.ndarray]]): Tableau, liste 2D, chemin .npy, EmbeddingStore
+                ou itérateur de blocs.
+            chunk_size (int): Nombre de lignes par bloc pour les tableaux et fichiers.
+
+        Yields:
+            np.ndarray: Blocs de données (vues sans copie pour les tableaux et fichiers mappés).
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size doit être strictement positif.")
+        if isinstance(data, str):
+            data = np.load(data, mmap_mode="r")
+        if isinstance(data, list) and not (data and isinstance(data[0], np.ndarray)):
+            data = np.asarray(data)
+        elif not isinstance(data, (list, np.ndarray)) and hasattr(data, "__array__"):
+            # EmbeddingStore : blocs lus dans les vecteurs mappés en mémoire.
+            data = np.asarray(data)
+        if isinstance(data, np.ndarray):
+            for start in range(0, len(data), chunk_size):
+                yield data[start:start + chunk_size]
+            return
+        yield from data
+
+    def _map_chunks(self, func, items: List) -> Iterator:
+        """
+        Applique `func` à chaque élément, sur un pool de threads si `n_jobs` et le nombre de blocs le justifient.
+        """
+        workers = (os.cpu_count() or 1) if self.n_jobs == -1 else self.n_jobs
+        if workers == 1 or len(items) <= 1:
+            return map(func, items)
+        with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+            return iter(list(executor.map(func, items)))
+
+    def _check_fitted(self):
+        if not self.is_fitted:
+            raise ValueError("Le préprocesseur n'est pas ajusté : appelez fit ou partial_fit d'abord.")
 
     def _validate_and_convert(self, data: Union[List[List[float]], np.ndarray]) -> np.ndarray:
         """
@@ -46,8 +361,9 @@ class DataPreprocessor:
         Returns:
             np.ndarray: Données validées.
         """
-        if isinstance(data, list):
-            data = np.array(data)
+        # Tableaux, memmaps et EmbeddingStore sont utilisés tels quels (vue, sans copie).
+        if isinstance(data, list) or hasattr(data, "__array__"):
+            data = np.asarray(data)
         if not isinstance(data, np.ndarray) or data.ndim != 2 or data.size == 0:
             raise ValueError("Les données doivent être une liste 2D ou un tableau numpy non vide.")
         return data
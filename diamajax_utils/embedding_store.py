@@ -0,0 +1,297 @@
+import json
+import logging
+import os
+import shutil
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+HEADER_FILE = "header.json"
+VECTORS_FILE = "vectors.bin"
+IDS_FILE = "ids.bin"
+FORMAT_VERSION = 1
+SUPPORTED_DTYPES = ("float32", "float16")
+
+
+class EmbeddingStore:
+    """
+    Stockage compact sur disque d'embeddings : vecteurs bruts float32/float16 lus par memmap,
+    colonne d'identifiants, colonnes de résultats (projections UMAP, labels...) alignées sur les
+    vecteurs et en-tête JSON de métadonnées. Les services acceptent le store directement : ils
+    travaillent sur la vue mappée, sans copie en mémoire.
+
+    Un seul processus doit écrire dans un store à la fois ; les lecteurs voient les lignes
+    validées dans l'en-tête.
+    """
+
+    def __init__(self, path: str, readonly: bool = False):
+        """
+        Ouvre un store existant.
+
+        Args:
+            path (str): Répertoire du store (créé par `create`).
+            readonly (bool): Interdire les écritures.
+        """
+        header_path = os.path.join(path, HEADER_FILE)
+        if not os.path.exists(header_path):
+            raise ValueError(f"No embedding store at {path}. Use EmbeddingStore.create first.")
+        with open(header_path, encoding="utf-8") as header_file:
+            self._header: Dict[str, Any] = json.load(header_file)
+        if self._header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported embedding store version: {self._header.get('version')}")
+        self.path = path
+        self.readonly = readonly
+        self._views: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        dim: int,
+        dtype: str = "float32",
+        metadata: Optional[Dict[str, Any]] = None,
+        overwrite: bool = False,
+    ) -> "EmbeddingStore":
+        """
+        Crée un store vide.
+
+        Args:
+            path (str): Répertoire du store.
+            dim (int): Dimension des vecteurs.
+            dtype (str): Type de stockage des vecteurs ('float32' ou 'float16').
+            metadata (Optional[Dict[str, Any]]): Métadonnées libres (modèle source, préprocesseur...), sérialisables en JSON.
+            overwrite (bool): Remplacer un store existant.
+
+        Returns:
+            EmbeddingStore: Store ouvert en écriture.
+        """
+        if dim < 1:
+            raise ValueError("dim must be >= 1.")
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype}. Expected one of {list(SUPPORTED_DTYPES)}")
+        if os.path.exists(os.path.join(path, HEADER_FILE)):
+            if not overwrite:
+                raise ValueError(f"An embedding store already exists at {path}.")
+            shutil.rmtree(path)
+        os.makedirs(path, exist_ok=True)
+        for name in (VECTORS_FILE, IDS_FILE):
+            open(os.path.join(path, name), "wb").close()
+        header = {
+            "version": FORMAT_VERSION,
+            "dim": dim,
+            "dtype": dtype,
+            "count": 0,
+            "next_id": 0,
+            "columns": {},
+            "metadata": metadata or {},
+        }
+        cls._write_header(path, header)
+        logger.info(f"Embedding store created at {path} (dim={dim}, dtype={dtype}).")
+        return cls(path)
+
+    @staticmethod
+    def _write_header(path: str, header: Dict[str, Any]):
+        # L'en-tête est réécrit après les données : il ne référence que des lignes complètes.
+        header_path = os.path.join(path, HEADER_FILE)
+        tmp_path = f"{header_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as header_file:
+            json.dump(header, header_file, indent=2)
+        os.replace(tmp_path, header_path)
+
+    def __len__(self) -> int:
+        return self._header["count"]
+
+    def __array__(self, dtype: Optional[np.dtype] = None, copy: Optional[bool] = None) -> np.ndarray:
+        # Permet np.asarray(store) : la vue mappée, sans copie.
+        vectors = self.vectors
+        if copy:
+            return np.array(vectors, dtype=dtype)
+        if dtype is None or np.dtype(dtype) == vectors.dtype:
+            return vectors
+        if copy is False:
+            raise ValueError(f"Cannot convert {vectors.dtype} vectors to {np.dtype(dtype)} without a copy.")
+        return vectors.astype(dtype)
+
+    @property
+    def dim(self) -> int:
+        return self._header["dim"]
+
+    @property
+    def dtype(self) -> np.dtype:
+        return np.dtype(self._header["dtype"])
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """
+        Métadonnées libres de l'en-tête.
+        """
+        return self._header["metadata"]
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        Noms des colonnes de résultats.
+        """
+        return list(self._header["columns"])
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """
+        Vecteurs, mappés en mémoire (forme (len, dim)).
+        """
+        return self._view(VECTORS_FILE, self.dtype, (self.dim,))
+
+    @property
+    def ids(self) -> np.ndarray:
+        """
+        Identifiants int64 des vecteurs, mappés en mémoire.
+        """
+        return self._view(IDS_FILE, np.dtype(np.int64), ())
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Colonne de résultats, mappée en mémoire ; les lignes jamais écrites valent 0.
+
+        Args:
+            name (str): Nom de la colonne.
+
+        Returns:
+            np.ndarray: Vue de forme (len, *forme de ligne).
+        """
+        spec = self._header["columns"].get(name)
+        if spec is None:
+            raise ValueError(f"Unknown column: {name}. Expected one of {self.columns}")
+        return self._view(self._column_file(name), np.dtype(spec["dtype"]), tuple(spec["shape"]))
+
+    def _column_file(self, name: str) -> str:
+        return f"column.{name}.bin"
+
+    def _view(self, file_name: str, dtype: np.dtype, row_shape: Tuple[int, ...]) -> np.ndarray:
+        view = self._views.get(file_name)
+        if view is not None and len(view) == len(self):
+            return view
+        if len(self) == 0:
+            return np.empty((0,) + row_shape, dtype=dtype)
+        file_path = os.path.join(self.path, file_name)
+        row_bytes = dtype.itemsize * int(np.prod(row_shape, dtype=np.int64))
+        shape = (len(self),) + row_shape
+        stored_rows = os.path.getsize(file_path) // row_bytes if row_bytes else len(self)
+        if stored_rows < len(self):
+            if self.readonly:
+                # Lecture seule : le fichier n'est jamais modifié, les lignes manquantes valent 0 en mémoire.
+                padded = np.zeros(shape, dtype=dtype)
+                if stored_rows:
+                    padded[:stored_rows] = np.memmap(file_path, dtype=dtype, mode="r", shape=(stored_rows,) + row_shape)
+                padded.setflags(write=False)
+                return padded
+            # Colonne créée ou prolongée sans écrire toutes les lignes : complétée par des zéros.
+            with open(file_path, "r+b") as column_file:
+                column_file.truncate(len(self) * row_bytes)
+        view = np.memmap(file_path, dtype=dtype, mode="r" if self.readonly else "r+", shape=shape)
+        self._views[file_name] = view
+        return view
+
+    def _check_writable(self):
+        if self.readonly:
+            raise ValueError(f"Embedding store {self.path} is opened read-only.")
+
+    def append(self, vectors: Any, ids: Optional[Any] = None) -> np.ndarray:
+        """
+        Ajoute des vecteurs en fin de store, par exemple la sortie d'une inférence ONNX.
+
+        Args:
+            vectors (Any): Tableau 2D (n, dim), converti au dtype du store.
+            ids (Optional[Any]): Identifiants int64 (par défaut, la suite des identifiants attribués).
+
+        Returns:
+            np.ndarray: Identifiants des vecteurs ajoutés.
+        """
+        self._check_writable()
+        vectors = np.ascontiguousarray(vectors, dtype=self.dtype)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            raise ValueError(f"Vectors must have shape (n, {self.dim}), got {vectors.shape}.")
+        n = len(vectors)
+        if ids is None:
+            ids = np.arange(self._header["next_id"], self._header["next_id"] + n, dtype=np.int64)
+        else:
+            ids = np.ascontiguousarray(ids, dtype=np.int64)
+            if ids.shape != (n,):
+                raise ValueError(f"ids must have shape ({n},), got {ids.shape}.")
+        if n == 0:
+            return ids
+
+        count = len(self)
+        for file_name, data in ((VECTORS_FILE, vectors), (IDS_FILE, ids)):
+            # Écriture à la position validée : des octets laissés par un ajout interrompu sont écrasés.
+            with open(os.path.join(self.path, file_name), "r+b") as data_file:
+                data_file.seek(count * data[0].nbytes)
+                data_file.write(data.tobytes())
+                data_file.truncate()
+        self._header["count"] = count + n
+        self._header["next_id"] = max(self._header["next_id"], int(ids.max()) + 1)
+        self._write_header(self.path, self._header)
+        self._views.clear()
+        return ids
+
+    def write_column(self, name: str, values: Any, start: int = 0):
+        """
+        Écrit des résultats (projections UMAP, labels...) alignés sur les vecteurs, éventuellement
+        bloc par bloc. La colonne est créée au premier appel avec le dtype et la forme de ligne de `values`.
+
+        Args:
+            name (str): Nom de la colonne.
+            values (Any): Valeurs des lignes `start` à `start + len(values)`.
+            start (int): Première ligne écrite.
+        """
+        self._check_writable()
+        if not name.replace("_", "").isalnum():
+            raise ValueError(f"Invalid column name: {name}. Use letters, digits and underscores.")
+        values = np.asarray(values)
+        if values.ndim == 0:
+            raise ValueError("values must have one row per vector.")
+        if start < 0 or start + len(values) > len(self):
+            raise ValueError(f"Rows {start}:{start + len(values)} are out of range for a store of {len(self)} vectors.")
+
+        spec = self._header["columns"].get(name)
+        if spec is None:
+            spec = {"dtype": values.dtype.str, "shape": list(values.shape[1:])}
+            open(os.path.join(self.path, self._column_file(name)), "wb").close()
+            self._header["columns"][name] = spec
+            self._write_header(self.path, self._header)
+        elif tuple(spec["shape"]) != values.shape[1:]:
+            raise ValueError(f"Column {name} has rows of shape {tuple(spec['shape'])}, got {values.shape[1:]}.")
+
+        column = self.column(name)
+        column[start:start + len(values)] = values
+        column.flush()
+
+    def iter_chunks(self, chunk_size: int = 65536, column: Optional[str] = None) -> Iterator[np.ndarray]:
+        """
+        Parcourt les vecteurs (ou une colonne) par blocs de lignes mappés en mémoire.
+
+        Args:
+            chunk_size (int): Nombre de lignes par bloc.
+            column (Optional[str]): Colonne parcourue (par défaut, les vecteurs).
+
+        Yields:
+            np.ndarray: Blocs (vues sans copie).
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be > 0.")
+        data = self.vectors if column is None else self.column(column)
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+
+    def update_metadata(self, **metadata: Any):
+        """
+        Met à jour les métadonnées de l'en-tête.
+        """
+        self._check_writable()
+        self._header["metadata"].update(metadata)
+        self._write_header(self.path, self._header)
+
+    def __repr__(self) -> str:
+        return f"EmbeddingStore(path={self.path!r}, count={len(self)}, dim={self.dim}, dtype={self.dtype.name})"
+
@@ -0,0 +1,200 @@
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Sequence
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ("png", "jpeg", "webp", "svg", "pdf")
+
+
+def _find_chrome() -> Optional[str]:
+    """
+    Cherche le Chrome utilisé par kaleido>=1.0 (installé sur le système ou téléchargé par kaleido).
+
+    Returns:
+        Optional[str]: Chemin du navigateur, None s'il est introuvable.
+    """
+    try:
+        from choreographer.browsers.chromium import Chromium
+    except ImportError:
+        # Kaleido < 1.0 embarque son propre Chromium.
+        return "bundled"
+    return Chromium.find_browser(skip_local=False)
+
+
+class ImageRenderer:
+    """
+    Export d'images statiques de figures Plotly par Kaleido, qui pilote un Chrome installé
+    (kaleido>=1.0) : le moteur est démarré une fois et réutilisé pour tous les exports, avec
+    plusieurs onglets de rendu en parallèle.
+    """
+
+    def __init__(
+        self,
+        n_workers: int = 4,
+        format: str = "png",
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        scale: Optional[float] = None,
+        timeout: Optional[float] = 120.0,
+    ):
+        """
+        Initialise le moteur de rendu (démarré au premier export ou par `start`).
+
+        Args:
+            n_workers (int): Nombre de rendus simultanés du serveur Kaleido.
+            format (str): Format par défaut ('png', 'jpeg', 'webp', 'svg' ou 'pdf').
+            width (Optional[int]): Largeur par défaut en pixels (par défaut, celle de Plotly).
+            height (Optional[int]): Hauteur par défaut en pixels (par défaut, celle de Plotly).
+            scale (Optional[float]): Facteur d'échelle par défaut.
+            timeout (Optional[float]): Durée maximale en secondes d'un rendu ou d'un lot (None pour illimité).
+        """
+        if n_workers < 1:
+            raise ValueError("n_workers must be >= 1.")
+        self._check_format(format)
+        self.n_workers = n_workers
+        self.format = format
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.timeout = timeout
+        self._kaleido = None
+        self._server_started = False
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Indique si le serveur Kaleido persistant est démarré.
+        """
+        return self._server_started
+
+    def start(self):
+        """
+        Démarre le serveur Kaleido persistant ; les exports suivants le réutilisent.
+        """
+        if self._server_started:
+            return
+        try:
+            import kaleido
+        except ImportError as e:
+            raise ImportError("Image export requires kaleido>=1.0: pip install diamajax_utils[export]") from e
+        # Sans navigateur, kaleido>=1.0 attend indéfiniment au lieu d'échouer.
+        if _find_chrome() is None:
+            raise RuntimeError(
+                "Image export requires Chrome. Install it, or download it with kaleido.get_chrome_sync() "
+                "or the plotly_get_chrome command."
+            )
+        self._kaleido = kaleido
+        if hasattr(kaleido, "start_sync_server"):
+            kaleido.start_sync_server(n=self.n_workers, silence_warnings=True)
+            self._server_started = True
+            logger.info(f"Kaleido renderer started with {self.n_workers} workers.")
+        else:
+            # Kaleido < 1.1 : pas de serveur persistant, chaque lot démarre son propre moteur.
+            logger.warning("Installed kaleido has no persistent server; each export batch starts a new renderer.")
+
+    def stop(self):
+        """
+        Arrête le serveur Kaleido.
+        """
+        if self._server_started:
+            self._kaleido.stop_sync_server(silence_warnings=True)
+            self._server_started = False
+            logger.info("Kaleido renderer stopped.")
+
+    @staticmethod
+    def _check_format(format: str):
+        if format not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported image format: {format}. Expected one of {list(SUPPORTED_FORMATS)}")
+
+    def _call_with_timeout(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Exécute un appel au moteur dans un thread et échoue s'il dépasse `timeout`.
+        """
+        if self.timeout is None:
+            return func(*args, **kwargs)
+        outcome: List[Any] = []
+
+        def target():
+            try:
+                outcome.append((True, func(*args, **kwargs)))
+            except BaseException as e:
+                outcome.append((False, e))
+
+        worker = threading.Thread(target=target, name="diamajax-kaleido", daemon=True)
+        worker.start()
+        worker.join(self.timeout)
+        if worker.is_alive():
+            raise TimeoutError(f"Image rendering did not complete within {self.timeout}s.")
+        succeeded, value = outcome[0]
+        if not succeeded:
+            raise value
+        return value
+
+    def __enter__(self) -> "ImageRenderer":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def to_image(self, fig: "go.Figure", format: Optional[str] = None) -> bytes:
+        """
+        Rend une figure en mémoire.
+
+        Args:
+            fig (go.Figure): Figure Plotly.
+            format (Optional[str]): Format de l'image (par défaut, celui du moteur).
+
+        Returns:
+            bytes: Contenu de l'image.
+        """
+        import plotly.io as pio
+
+        format = format or self.format
+        self._check_format(format)
+        self.start()
+        return self._call_with_timeout(
+            pio.to_image, fig, format=format, width=self.width, height=self.height, scale=self.scale
+        )
+
+    def export(
+        self, figures: Sequence["go.Figure"], paths: Sequence[str], format: Optional[str] = None
+    ) -> List[str]:
+        """
+        Exporte un lot de figures en un seul appel au moteur, réparti sur ses rendus simultanés.
+
+        Args:
+            figures (Sequence[go.Figure]): Figures Plotly en mémoire.
+            paths (Sequence[str]): Fichier de destination de chaque figure.
+            format (Optional[str]): Format des images (par défaut, celui du moteur).
+
+        Returns:
+            List[str]: Chemins des images écrites.
+        """
+        if len(figures) != len(paths):
+            raise ValueError("figures and paths must have the same length.")
+        format = format or self.format
+        self._check_format(format)
+        if not figures:
+            return []
+        import plotly.io as pio
+
+        self.start()
+        for path in paths:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._call_with_timeout(
+            pio.write_images,
+            list(figures),
+            list(paths),
+            format=format,
+            width=self.width,
+            height=self.height,
+            scale=self.scale,
+        )
+        logger.info(f"Exported {len(paths)} images.")
+        return list(paths)
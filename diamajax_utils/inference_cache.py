@@ -0,0 +1,317 @@
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def hash_array(array: np.ndarray, hasher: Optional[Any] = None) -> str:
+    """
+    Calcule une empreinte de contenu d'un tableau (octets bruts, forme et dtype).
+
+    Args:
+        array (np.ndarray): Tableau à hacher.
+        hasher (Optional[Any]): Objet hashlib à alimenter (par défaut, un nouveau blake2b).
+
+    Returns:
+        str: Empreinte hexadécimale.
+    """
+    hasher = hasher or hashlib.blake2b(digest_size=16)
+    array = np.ascontiguousarray(array)
+    hasher.update(array.dtype.str.encode())
+    hasher.update(repr(array.shape).encode())
+    hasher.update(array.data)
+    return hasher.hexdigest()
+
+
+def hash_inputs(input_data: Dict[str, Any]) -> str:
+    """
+    Calcule une empreinte de contenu pour un dictionnaire d'entrées de modèle.
+
+    Args:
+        input_data (Dict[str, Any]): Entrées du modèle.
+
+    Returns:
+        str: Empreinte hexadécimale, indépendante de l'ordre des clés.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    for name in sorted(input_data):
+        hasher.update(name.encode())
+        hash_array(np.asarray(input_data[name]), hasher)
+    return hasher.hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """
+    Calcule une empreinte de contenu d'un fichier, lu par blocs.
+
+    Args:
+        path (str): Chemin du fichier.
+
+    Returns:
+        str: Empreinte hexadécimale.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+class InferenceCache:
+    """
+    Cache de résultats d'inférence en mémoire (LRU borné en octets, TTL optionnel),
+    avec un niveau disque optionnel de fichiers .npy mappés en mémoire.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl: Optional[float] = None,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+    ):
+        """
+        Initialise le cache.
+
+        Args:
+            max_bytes (int): Taille maximale des résultats conservés en mémoire (octets).
+            ttl (Optional[float]): Durée de vie d'une entrée (secondes), None pour illimitée.
+            disk_dir (Optional[str]): Répertoire du niveau disque, None pour le désactiver.
+            max_disk_bytes (int): Taille maximale du niveau disque (octets) ; les fragments les plus
+                anciens sont supprimés au-delà. Le décompte est propre à chaque processus.
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0.")
+        if max_disk_bytes <= 0:
+            raise ValueError("max_disk_bytes must be > 0.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be > 0.")
+
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        # Fragments disque par date d'écriture : clé -> taille (octets).
+        self._disk_entries: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._scan_disk()
+        logger.info(f"InferenceCache initialized (max_bytes={max_bytes}, ttl={ttl}, disk_dir={disk_dir}).")
+
+    def get(self, key: str) -> Optional[List[np.ndarray]]:
+        """
+        Récupère les sorties associées à une clé.
+
+        Args:
+            key (str): Empreinte des entrées.
+
+        Returns:
+            Optional[List[np.ndarray]]: Sorties en lecture seule, ou None si absentes ou expirées.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                outputs, nbytes, created_at = entry
+                if self.ttl is not None and now - created_at > self.ttl:
+                    self._remove(key)
+                    self._expirations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return outputs
+
+        loaded = self._load_from_disk(key, now)
+        with self._lock:
+            if loaded is None:
+                self._misses += 1
+                return None
+            outputs, created_at = loaded
+            self._disk_hits += 1
+            self._store(key, outputs, created_at)
+        return outputs
+
+    def put(self, key: str, outputs: List[Any]):
+        """
+        Enregistre les sorties d'une inférence.
+
+        Args:
+            key (str): Empreinte des entrées.
+            outputs (List[Any]): Sorties du modèle (copiées en lecture seule).
+        """
+        frozen = []
+        for output in outputs:
+            array = np.array(output, copy=True)
+            array.setflags(write=False)
+            frozen.append(array)
+
+        now = time.time()
+        with self._lock:
+            self._store(key, frozen, now)
+        if self.disk_dir:
+            self._save_to_disk(key, frozen)
+
+    def clear(self):
+        """
+        Vide le niveau mémoire et, le cas échéant, le niveau disque.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._disk_entries.clear()
+            self._disk_bytes = 0
+        if self.disk_dir:
+            shutil.rmtree(self.disk_dir, ignore_errors=True)
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Retourne les statistiques du cache.
+
+        Returns:
+            Dict[str, int]: Succès (mémoire et disque), échecs, évictions, expirations, entrées et octets.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "disk_entries": len(self._disk_entries),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def _store(self, key: str, outputs: List[np.ndarray], created_at: float):
+        """
+        Insère une entrée en mémoire et évince les moins récemment utilisées (verrou tenu).
+        """
+        nbytes = sum(output.nbytes for output in outputs)
+        if key in self._entries:
+            self._remove(key)
+        if nbytes > self.max_bytes:
+            logger.debug(f"Cache entry of {nbytes} bytes exceeds max_bytes, not kept in memory.")
+            return
+        while self._bytes + nbytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._evictions += 1
+        self._entries[key] = (outputs, nbytes, created_at)
+        self._bytes += nbytes
+
+    def _remove(self, key: str):
+        _, nbytes, _ = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    def _shard_dir(self, key: str) -> str:
+        # Répartition sur la fin de la clé : les clés préfixées par un même modèle restent dispersées.
+        return os.path.join(self.disk_dir, key[-2:], key)
+
+    def _scan_disk(self):
+        """
+        Recense les fragments déjà présents sur disque, du plus ancien au plus récent.
+        """
+        shards = []
+        for bucket in os.listdir(self.disk_dir):
+            bucket_dir = os.path.join(self.disk_dir, bucket)
+            if not os.path.isdir(bucket_dir):
+                continue
+            for key in os.listdir(bucket_dir):
+                shard = os.path.join(bucket_dir, key)
+                if not os.path.isdir(shard) or key.startswith("tmp"):
+                    continue
+                nbytes = sum(entry.stat().st_size for entry in os.scandir(shard) if entry.is_file())
+                shards.append((os.path.getmtime(shard), key, nbytes))
+        for _, key, nbytes in sorted(shards):
+            self._disk_entries[key] = nbytes
+            self._disk_bytes += nbytes
+
+    def _track_disk(self, key: str, nbytes: int):
+        """
+        Enregistre un nouveau fragment et supprime les plus anciens au-delà de `max_disk_bytes`.
+        """
+        evicted = []
+        with self._lock:
+            if key in self._disk_entries:
+                self._disk_bytes -= self._disk_entries.pop(key)
+            self._disk_entries[key] = nbytes
+            self._disk_bytes += nbytes
+            while self._disk_bytes > self.max_disk_bytes and len(self._disk_entries) > 1:
+                oldest, size = self._disk_entries.popitem(last=False)
+                self._disk_bytes -= size
+                evicted.append(oldest)
+        for oldest in evicted:
+            shutil.rmtree(self._shard_dir(oldest), ignore_errors=True)
+
+    def _untrack_disk(self, key: str):
+        with self._lock:
+            if key in self._disk_entries:
+                self._disk_bytes -= self._disk_entries.pop(key)
+
+    def _save_to_disk(self, key: str, outputs: List[np.ndarray]):
+        """
+        Écrit les sorties dans un fragment disque de façon atomique.
+        """
+        target = self._shard_dir(key)
+        if os.path.isdir(target):
+            return
+        parent = os.path.dirname(target)
+        os.makedirs(parent, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=parent)
+        try:
+            for index, output in enumerate(outputs):
+                np.save(os.path.join(staging, f"{index}.npy"), output)
+            nbytes = sum(entry.stat().st_size for entry in os.scandir(staging))
+            os.replace(staging, target)
+            self._track_disk(key, nbytes)
+        except OSError as e:
+            logger.error(f"Error writing cache shard {key}: {e}")
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _load_from_disk(self, key: str, now: float) -> Optional[Tuple[List[np.ndarray], float]]:
+        """
+        Charge un fragment disque en mappage mémoire, en appliquant le TTL.
+
+        Returns:
+            Optional[Tuple[List[np.ndarray], float]]: Sorties et date d'écriture, ou None.
+        """
+        if not self.disk_dir:
+            return None
+        shard = self._shard_dir(key)
+        if not os.path.isdir(shard):
+            return None
+        created_at = os.path.getmtime(shard)
+        if self.ttl is not None and now - created_at > self.ttl:
+            shutil.rmtree(shard, ignore_errors=True)
+            self._untrack_disk(key)
+            with self._lock:
+                self._expirations += 1
+            return None
+        try:
+            count = len([name for name in os.listdir(shard) if name.endswith(".npy")])
+            outputs = [np.load(os.path.join(shard, f"{index}.npy"), mmap_mode="r") for index in range(count)]
+            return outputs, created_at
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading cache shard {key}: {e}")
+            return None
@@ -0,0 +1,333 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, ContextManager, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (50, 95, 99)
+
+# Contexte partagé renvoyé par `timer` quand la mesure est désactivée : aucun objet alloué par appel.
+_NULL_TIMER = nullcontext()
+
+
+class _Histogram:
+    """
+    Distribution d'une mesure : totaux cumulés et dernières valeurs pour les percentiles.
+    """
+
+    __slots__ = ("values", "count", "sum", "max")
+
+    def __init__(self, window: int):
+        self.values: "deque[float]" = deque(maxlen=window)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.values.append(value)
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def summary(self) -> Dict[str, float]:
+        values = np.array(self.values, dtype=np.float64)
+        summary = {"count": self.count, "sum": self.sum, "max": self.max}
+        for pct in QUANTILES:
+            summary[f"p{pct}"] = float(np.percentile(values, pct)) if values.size else 0.0
+        return summary
+
+
+class _Timer:
+    __slots__ = ("_metrics", "_name", "_start")
+
+    def __init__(self, metrics: "Metrics", name: str):
+        self._metrics = metrics
+        self._name = name
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._metrics.observe(self._name, time.perf_counter() - self._start)
+        if exc_type is not None:
+            self._metrics.increment(f"{self._name}.errors")
+
+
+class Metrics:
+    """
+    Registre de mesures partagé par les services : durées par étape, histogrammes (p50/p95/p99)
+    et compteurs, transmis à un exportateur. Désactivé, chaque appel se réduit à un test de booléen.
+    """
+
+    def __init__(self, enabled: bool = True, window: int = 10000, exporter: Optional[Any] = None):
+        """
+        Initialise le registre.
+
+        Args:
+            enabled (bool): Enregistrer les mesures ; modifiable à chaud via l'attribut `enabled`.
+            window (int): Nombre de valeurs récentes conservées par histogramme pour les percentiles.
+            exporter (Optional[Any]): Destination de `export` (objet avec une méthode `export(snapshot)`),
+                par exemple InMemoryExporter, PrometheusFileExporter ou OpenTelemetryExporter.
+        """
+        if window < 1:
+            raise ValueError("window must be >= 1.")
+        self.enabled = enabled
+        self.window = window
+        self.exporter = exporter
+        self._counters: Dict[str, float] = {}
+        self._histograms: Dict[str, _Histogram] = {}
+        self._lock = threading.Lock()
+        self._export_thread: Optional[threading.Thread] = None
+        self._export_stop = threading.Event()
+
+    def timer(self, name: str) -> ContextManager:
+        """
+        Mesure la durée (secondes) d'un bloc `with` dans l'histogramme `name` ; une exception
+        levée dans le bloc incrémente aussi le compteur `{name}.errors`.
+
+        Args:
+            name (str): Nom de l'étape, par exemple 'onnx.run'.
+
+        Returns:
+            ContextManager: Chronomètre (contexte vide si le registre est désactivé).
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def observe(self, name: str, value: float):
+        """
+        Ajoute une valeur à l'histogramme `name`.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = _Histogram(self.window)
+            histogram.observe(float(value))
+
+    def increment(self, name: str, value: float = 1):
+        """
+        Incrémente le compteur `name` (appels, erreurs, octets...).
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Retourne l'état courant des mesures.
+
+        Returns:
+            Dict[str, Any]: Compteurs et résumé de chaque histogramme (count, sum, max, p50, p95, p99).
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {name: histogram.summary() for name, histogram in self._histograms.items()}
+        return {"timestamp": time.time(), "counters": counters, "histograms": histograms}
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Retourne les mesures à plat (`{histogramme}.p95`, compteurs...), par exemple pour `LiveDashboard.watch`.
+
+        Returns:
+            Dict[str, float]: Valeurs numériques par nom.
+        """
+        snapshot = self.snapshot()
+        stats = dict(snapshot["counters"])
+        for name, summary in snapshot["histograms"].items():
+            for field, value in summary.items():
+                stats[f"{name}.{field}"] = value
+        return stats
+
+    def export(self) -> Dict[str, Any]:
+        """
+        Transmet l'état courant à l'exportateur configuré.
+
+        Returns:
+            Dict[str, Any]: Instantané exporté.
+        """
+        snapshot = self.snapshot()
+        if self.exporter is not None:
+            self.exporter.export(snapshot)
+        return snapshot
+
+    def start_periodic_export(self, interval_s: float = 15.0):
+        """
+        Exporte l'état courant à intervalle régulier depuis un thread d'arrière-plan.
+
+        Args:
+            interval_s (float): Intervalle entre deux exports.
+        """
+        if self._export_thread is not None:
+            return
+        self._export_stop.clear()
+
+        def run():
+            while not self._export_stop.wait(interval_s):
+                try:
+                    self.export()
+                except Exception as e:
+                    logger.error(f"Error exporting metrics: {e}")
+
+        self._export_thread = threading.Thread(target=run, name="metrics-export", daemon=True)
+        self._export_thread.start()
+
+    def stop_periodic_export(self):
+        """
+        Arrête l'export périodique après un dernier export.
+        """
+        if self._export_thread is None:
+            return
+        self._export_stop.set()
+        self._export_thread.join()
+        self._export_thread = None
+        self.export()
+
+    def reset(self):
+        """
+        Efface toutes les mesures.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class InMemoryExporter:
+    """
+    Conserve les derniers instantanés exportés (tests, inspection, tableaux de bord).
+    """
+
+    def __init__(self, max_snapshots: int = 100):
+        self.snapshots: "deque[Dict[str, Any]]" = deque(maxlen=max_snapshots)
+
+    @property
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """
+        Dernier instantané exporté, ou None.
+        """
+        return self.snapshots[-1] if self.snapshots else None
+
+    def export(self, snapshot: Dict[str, Any]):
+        self.snapshots.append(snapshot)
+
+
+class PrometheusFileExporter:
+    """
+    Écrit les mesures au format texte Prometheus, par exemple pour le collecteur textfile de node_exporter.
+    """
+
+    def __init__(self, path: str, prefix: str = "diamajax_"):
+        """
+        Args:
+            path (str): Fichier `.prom` réécrit (atomiquement) à chaque export.
+            prefix (str): Préfixe des noms de métriques.
+        """
+        self.path = path
+        self.prefix = prefix
+
+    def metric_name(self, name: str) -> str:
+        return self.prefix + re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+    def render(self, snapshot: Dict[str, Any]) -> str:
+        """
+        Formate un instantané au format texte Prometheus (compteurs et résumés avec quantiles).
+        """
+        lines: List[str] = []
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = self.metric_name(name) + "_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name, summary in sorted(snapshot["histograms"].items()):
+            metric = self.metric_name(name)
+            lines.append(f"# TYPE {metric} summary")
+            for pct in QUANTILES:
+                lines.append(f'{metric}{{quantile="{pct / 100}"}} {summary[f"p{pct}"]}')
+            lines += [f"{metric}_sum {summary['sum']}", f"{metric}_count {summary['count']}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self, snapshot: Dict[str, Any]):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as prom_file:
+            prom_file.write(self.render(snapshot))
+        os.replace(tmp_path, self.path)
+
+
+class OpenTelemetryExporter:
+    """
+    Publie les mesures via l'API OpenTelemetry : compteurs en incréments, percentiles en jauges.
+    """
+
+    def __init__(self, meter: Optional[Any] = None):
+        """
+        Args:
+            meter (Optional[Any]): Meter OpenTelemetry (par défaut, `metrics.get_meter("diamajax_utils")`).
+        """
+        if meter is None:
+            try:
+                from opentelemetry import metrics as otel_metrics
+            except ImportError as e:
+                raise ImportError("OpenTelemetryExporter requires opentelemetry-api: pip install opentelemetry-api") from e
+            meter = otel_metrics.get_meter("diamajax_utils")
+        self.meter = meter
+        self._instruments: Dict[str, Any] = {}
+        self._last_counts: Dict[str, float] = {}
+
+    def _instrument(self, kind: str, name: str) -> Any:
+        instrument = self._instruments.get(name)
+        if instrument is None:
+            factory = self.meter.create_counter if kind == "counter" else self.meter.create_gauge
+            instrument = self._instruments[name] = factory(f"diamajax.{name}")
+        return instrument
+
+    def _add_delta(self, name: str, total: float):
+        delta = total - self._last_counts.get(name, 0)
+        self._last_counts[name] = total
+        if delta > 0:
+            self._instrument("counter", name).add(delta)
+
+    def export(self, snapshot: Dict[str, Any]):
+        for name, value in snapshot["counters"].items():
+            self._add_delta(name, value)
+        for name, summary in snapshot["histograms"].items():
+            self._add_delta(f"{name}.count", summary["count"])
+            for pct in QUANTILES:
+                self._instrument("gauge", f"{name}.p{pct}").set(summary[f"p{pct}"])
+
+
+# Registre par défaut des services, désactivé tant que `configure_metrics` ne l'active pas.
+_default_metrics = Metrics(enabled=False)
+
+
+def get_metrics() -> Metrics:
+    """
+    Retourne le registre par défaut, utilisé par les services construits sans `metrics`.
+    """
+    return _default_metrics
+
+
+def configure_metrics(enabled: bool = True, exporter: Optional[Any] = None) -> Metrics:
+    """
+    Active (ou désactive) le registre par défaut et choisit son exportateur.
+
+    Args:
+        enabled (bool): Enregistrer les mesures.
+        exporter (Optional[Any]): Exportateur utilisé par `export`.
+
+    Returns:
+        Metrics: Registre par défaut.
+    """
+    _default_metrics.enabled = enabled
+    if exporter is not None:
+        _default_metrics.exporter = exporter
+    return _default_metrics
@@ -0,0 +1,351 @@
+import json
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="/plotly.min.js"></script>
+<style>body {{ font-family: sans-serif; background: #111; color: #eee; }} .plot {{ height: 320px; }}</style>
+</head>
+<body>
+<h1>{title}</h1>
+<div id="plots"></div>
+<script>
+const plots = document.getElementById("plots");
+const layout = (name) => ({{ title: name, template: "plotly_dark", paper_bgcolor: "#111", plot_bgcolor: "#111",
+  font: {{ color: "#eee" }}, margin: {{ t: 40 }} }});
+function plotFor(series) {{
+  let div = document.getElementById("series-" + series.name);
+  if (!div) {{
+    div = document.createElement("div");
+    div.id = "series-" + series.name;
+    div.className = "plot";
+    plots.appendChild(div);
+  }}
+  return div;
+}}
+function draw(series) {{
+  const trace = series.kind === "bar" ? {{ type: "bar", x: series.x, y: series.y }}
+                                      : {{ type: "scattergl", mode: "lines", x: series.x, y: series.y }};
+  Plotly.react(plotFor(series), [trace], layout(series.name));
+}}
+const source = new EventSource("/events");
+source.onmessage = (message) => {{
+  const event = JSON.parse(message.data);
+  if (event.type === "snapshot") {{
+    plots.innerHTML = "";
+    event.series.forEach(draw);
+  }} else if (event.type === "series") {{
+    draw(event);
+  }} else if (event.type === "extend") {{
+    Plotly.extendTraces(plotFor(event), {{ x: [event.x], y: [event.y] }}, [0], event.max_points);
+  }} else if (event.type === "counts") {{
+    Plotly.restyle(plotFor(event), {{ x: [event.x], y: [event.y] }}, [0]);
+  }}
+}};
+</script>
+</body>
+</html>
+"""
+
+
+class _Series:
+    """
+    État côté serveur d'une série : historique borné (ligne) ou comptes par catégorie (barres).
+    """
+
+    def __init__(self, name: str, kind: str, history: int):
+        self.name = name
+        self.kind = kind
+        self.x: "deque[Any]" = deque(maxlen=history)
+        self.y: "deque[float]" = deque(maxlen=history)
+        self.counts: "OrderedDict[str, float]" = OrderedDict()
+        self.next_x = 0
+
+    def to_event(self) -> Dict[str, Any]:
+        if self.kind == "bar":
+            x, y = list(self.counts), list(self.counts.values())
+        else:
+            x, y = list(self.x), list(self.y)
+        return {"name": self.name, "kind": self.kind, "x": x, "y": y}
+
+
+class LiveDashboard:
+    """
+    Tableau de bord en direct : l'état des figures est conservé côté serveur et seuls les
+    incréments sont poussés au navigateur (Server-Sent Events, `Plotly.extendTraces`).
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        history: int = 10000,
+        title: str = "Live Dashboard",
+        client_queue_size: int = 1000,
+        keepalive_s: float = 15.0,
+    ):
+        """
+        Initialise le tableau de bord (le serveur démarre avec `start`).
+
+        Args:
+            host (str): Adresse d'écoute du serveur HTTP.
+            port (int): Port d'écoute (0 pour un port libre choisi par le système).
+            history (int): Nombre de points conservés par série ; la mémoire reste constante.
+            title (str): Titre de la page.
+            client_queue_size (int): Événements en attente par navigateur ; au-delà, le client lent
+                reçoit un instantané complet au lieu des incréments perdus.
+            keepalive_s (float): Intervalle des commentaires SSE qui maintiennent la connexion.
+        """
+        if history < 1:
+            raise ValueError("history must be >= 1.")
+        self.host = host
+        self.port = port
+        self.history = history
+        self.title = title
+        self.client_queue_size = client_queue_size
+        self.keepalive_s = keepalive_s
+
+        self._series: "OrderedDict[str, _Series]" = OrderedDict()
+        self._clients: List["queue.Queue[Optional[Dict[str, Any]]]"] = []
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._server_thread: Optional[threading.Thread] = None
+        self._watchers: List[threading.Thread] = []
+        self._stop_event = threading.Event()
+        self._plotlyjs: Optional[bytes] = None
+
+    @property
+    def url(self) -> str:
+        """
+        Adresse de la page (après `start`).
+        """
+        if self._server is None:
+            raise RuntimeError("LiveDashboard is not started.")
+        return f"http://{self.host}:{self._server.server_address[1]}/"
+
+    def start(self) -> "LiveDashboard":
+        """
+        Démarre le serveur HTTP dans un thread d'arrière-plan.
+        """
+        if self._server is not None:
+            return self
+        self._stop_event.clear()
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self._server_thread = threading.Thread(target=self._server.serve_forever, name="live-dashboard", daemon=True)
+        self._server_thread.start()
+        logger.info(f"Live dashboard serving on {self.url}")
+        return self
+
+    def stop(self):
+        """
+        Arrête le serveur, les flux des navigateurs et les sources surveillées.
+        """
+        self._stop_event.set()
+        with self._lock:
+            for client in self._clients:
+                self._offer(client, None, force=True)
+        for watcher in self._watchers:
+            watcher.join()
+        self._watchers = []
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server_thread.join()
+            self._server = None
+            logger.info("Live dashboard stopped.")
+
+    def __enter__(self) -> "LiveDashboard":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def append(self, name: str, y: Union[float, Sequence[float]], x: Optional[Union[Any, Sequence[Any]]] = None):
+        """
+        Ajoute un ou plusieurs points à une série (courbe), créée au premier appel.
+
+        Args:
+            name (str): Nom de la série.
+            y (Union[float, Sequence[float]]): Valeur(s) à ajouter.
+            x (Optional[Union[Any, Sequence[Any]]]): Abscisse(s) ; par défaut, un compteur par série.
+        """
+        ys = np.atleast_1d(np.asarray(y, dtype=np.float64)).tolist()
+        with self._lock:
+            series = self._get_series(name, "line")
+            if x is None:
+                xs = list(range(series.next_x, series.next_x + len(ys)))
+            else:
+                xs = np.atleast_1d(np.asarray(x)).tolist()
+                if len(xs) != len(ys):
+                    raise ValueError("x and y must have the same length.")
+            series.next_x += len(ys)
+            series.x.extend(xs)
+            series.y.extend(ys)
+            self._broadcast({"type": "extend", "name": name, "x": xs, "y": ys, "max_points": self.history})
+
+    def update_counts(self, name: str, counts: Dict[str, float], increment: bool = False):
+        """
+        Met à jour les comptes d'une série par catégorie (barres), créée au premier appel.
+
+        Args:
+            name (str): Nom de la série.
+            counts (Dict[str, float]): Valeurs par catégorie.
+            increment (bool): Ajouter aux comptes existants au lieu de les remplacer.
+        """
+        with self._lock:
+            series = self._get_series(name, "bar")
+            for label, value in counts.items():
+                label = str(label)
+                series.counts[label] = (series.counts.get(label, 0) if increment else 0) + float(value)
+            event = series.to_event()
+            event["type"] = "counts"
+            self._broadcast(event)
+
+    def watch(self, source: Callable[[], Dict[str, Any]], interval_s: float = 1.0, prefix: str = ""):
+        """
+        Interroge périodiquement une source de métriques (par exemple `BatchingInferenceServer.get_stats`)
+        et ajoute chacune de ses valeurs numériques comme point d'une série `{prefix}{clé}`.
+
+        Args:
+            source (Callable[[], Dict[str, Any]]): Fonction retournant les métriques courantes.
+            interval_s (float): Intervalle entre deux interrogations.
+            prefix (str): Préfixe des noms de séries.
+        """
+        def poll():
+            while not self._stop_event.wait(interval_s):
+                try:
+                    metrics = source()
+                except Exception as e:
+                    logger.error(f"Error polling live dashboard source: {e}")
+                    continue
+                now = time.strftime("%Y-%m-%d %H:%M:%S")
+                for key, value in metrics.items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        self.append(f"{prefix}{key}", value, x=now)
+
+        watcher = threading.Thread(target=poll, name="live-dashboard-watch", daemon=True)
+        self._watchers.append(watcher)
+        watcher.start()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Retourne l'état complet des séries, envoyé à chaque navigateur à sa connexion.
+
+        Returns:
+            Dict[str, Any]: Événement 'snapshot' avec toutes les séries.
+        """
+        with self._lock:
+            return {"type": "snapshot", "series": [series.to_event() for series in self._series.values()]}
+
+    def _get_series(self, name: str, kind: str) -> _Series:
+        series = self._series.get(name)
+        if series is None:
+            series = self._series[name] = _Series(name, kind, self.history)
+            event = series.to_event()
+            event["type"] = "series"
+            self._broadcast(event)
+        elif series.kind != kind:
+            raise ValueError(f"Series {name} is a {series.kind} series.")
+        return series
+
+    def _broadcast(self, event: Dict[str, Any]):
+        # Appelé verrou tenu : l'ordre des événements est celui des mises à jour.
+        for client in self._clients:
+            self._offer(client, event)
+
+    def _offer(self, client: "queue.Queue", event: Optional[Dict[str, Any]], force: bool = False):
+        try:
+            client.put_nowait(event)
+        except queue.Full:
+            # Client trop lent : ses incréments en attente sont remplacés par un instantané complet.
+            while True:
+                try:
+                    client.get_nowait()
+                except queue.Empty:
+                    break
+            client.put_nowait(None if force else {"type": "resync"})
+
+    def _stream(self, write: Callable[[bytes], None]):
+        """
+        Envoie l'instantané puis les incréments à un navigateur jusqu'à sa déconnexion.
+        """
+        client: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=self.client_queue_size)
+        with self._lock:
+            initial = {"type": "snapshot", "series": [series.to_event() for series in self._series.values()]}
+            self._clients.append(client)
+        try:
+            write(f"data: {json.dumps(initial, default=str)}\n\n".encode("utf-8"))
+            while not self._stop_event.is_set():
+                try:
+                    event = client.get(timeout=self.keepalive_s)
+                except queue.Empty:
+                    write(b": keepalive\n\n")
+                    continue
+                if event is None:
+                    break
+                if event["type"] == "resync":
+                    event = self.snapshot()
+                write(f"data: {json.dumps(event, default=str)}\n\n".encode("utf-8"))
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with self._lock:
+                self._clients.remove(client)
+
+    def _make_handler(self):
+        dashboard = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                logger.debug(f"Live dashboard request: {format % args}")
+
+            def _send(self, body: bytes, content_type: str):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/":
+                    self._send(PAGE_TEMPLATE.format(title=dashboard.title).encode("utf-8"), "text/html; charset=utf-8")
+                elif self.path == "/plotly.min.js":
+                    self._send(dashboard._plotlyjs_bundle(), "application/javascript")
+                elif self.path == "/snapshot":
+                    self._send(json.dumps(dashboard.snapshot(), default=str).encode("utf-8"), "application/json")
+                elif self.path == "/events":
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Cache-Control", "no-cache")
+                    self.end_headers()
+
+                    def write(chunk: bytes):
+                        self.wfile.write(chunk)
+                        self.wfile.flush()
+
+                    dashboard._stream(write)
+                else:
+                    self.send_error(404)
+
+        return Handler
+
+    def _plotlyjs_bundle(self) -> bytes:
+        if self._plotlyjs is None:
+            from plotly.offline import get_plotlyjs
+
+            self._plotlyjs = get_plotlyjs().encode("utf-8")
+        return self._plotlyjs
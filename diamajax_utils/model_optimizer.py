@@ -0,0 +1,253 @@
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .inference_cache import hash_file
+from .onnx_wrapper import ONNXModelWrapper
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_VARIANTS = ("dynamic_int8", "static_int8", "float16")
+
+
+class _SampleCalibrationReader:
+    """
+    Lecteur de calibration ONNX Runtime alimenté par une liste d'entrées.
+    """
+
+    def __init__(self, samples: Sequence[Dict[str, np.ndarray]]):
+        self._samples = iter(samples)
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        return next(self._samples, None)
+
+
+class ModelOptimizer:
+    """
+    Produit des variantes optimisées d'un modèle ONNX float32 pour le CPU (INT8 dynamique, INT8
+    statique calibré, poids float16), vérifie leur précision par rapport au modèle d'origine,
+    mesure leur latence et retient la plus rapide qui respecte la tolérance.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        output_dir: Optional[str] = None,
+        rtol: float = 1e-2,
+        atol: float = 1e-2,
+        repeat: int = 20,
+        device_preference: str = "cpu",
+    ):
+        """
+        Initialise l'optimiseur.
+
+        Args:
+            model_path (str): Chemin du modèle ONNX d'origine.
+            output_dir (Optional[str]): Répertoire des variantes et du rapport (par défaut, celui du modèle).
+            rtol (float): Tolérance relative de l'écart des sorties par rapport au modèle d'origine.
+            atol (float): Tolérance absolue de l'écart des sorties.
+            repeat (int): Nombre de passes sur les échantillons pour mesurer la latence.
+            device_preference (str): Device des sessions de mesure ('cpu', 'gpu', ou 'auto').
+        """
+        if repeat < 1:
+            raise ValueError("repeat must be >= 1.")
+        self.model_path = model_path
+        self.output_dir = output_dir or os.path.dirname(os.path.abspath(model_path))
+        self.rtol = rtol
+        self.atol = atol
+        self.repeat = repeat
+        self.device_preference = device_preference
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._stem = os.path.splitext(os.path.basename(model_path))[0]
+
+    @property
+    def report_path(self) -> str:
+        """
+        Chemin du rapport JSON de la dernière optimisation.
+        """
+        return os.path.join(self.output_dir, f"{self._stem}.variants.json")
+
+    def _variant_path(self, variant: str) -> str:
+        return os.path.join(self.output_dir, f"{self._stem}.{variant}.onnx")
+
+    def quantize_dynamic(self) -> str:
+        """
+        Quantifie les poids en INT8 ; les activations sont quantifiées à la volée à l'exécution.
+
+        Returns:
+            str: Chemin du modèle quantifié.
+        """
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        output_path = self._variant_path("dynamic_int8")
+        quantize_dynamic(self.model_path, output_path, weight_type=QuantType.QInt8)
+        logger.info(f"Dynamic INT8 model written to {output_path}.")
+        return output_path
+
+    def quantize_static(self, samples: Sequence[Dict[str, np.ndarray]]) -> str:
+        """
+        Quantifie poids et activations en INT8 (format QDQ), avec des plages calibrées sur `samples`.
+
+        Args:
+            samples (Sequence[Dict[str, np.ndarray]]): Entrées représentatives pour la calibration.
+
+        Returns:
+            str: Chemin du modèle quantifié.
+        """
+        from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+
+        if not samples:
+            raise ValueError("Static quantization requires at least one calibration sample.")
+        output_path = self._variant_path("static_int8")
+        quantize_static(
+            self.model_path,
+            output_path,
+            _SampleCalibrationReader(samples),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QInt8,
+            weight_type=QuantType.QInt8,
+        )
+        logger.info(f"Static INT8 model written to {output_path} ({len(samples)} calibration samples).")
+        return output_path
+
+    def convert_float16(self) -> str:
+        """
+        Convertit les poids et calculs en float16 en conservant des entrées/sorties float32.
+
+        Returns:
+            str: Chemin du modèle converti.
+        """
+        import onnx
+        from onnxruntime.transformers.float16 import convert_float_to_float16
+
+        output_path = self._variant_path("float16")
+        model = convert_float_to_float16(onnx.load(self.model_path), keep_io_types=True)
+        onnx.save(model, output_path)
+        logger.info(f"Float16 model written to {output_path}.")
+        return output_path
+
+    def optimize(
+        self,
+        samples: Iterable[Dict[str, np.ndarray]],
+        variants: Sequence[str] = SUPPORTED_VARIANTS,
+        max_samples: int = 100,
+        force: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Produit les variantes, les valide et les mesure, puis retient la plus rapide qui passe
+        le contrôle de précision (le modèle d'origine est toujours candidat).
+
+        Le rapport est enregistré à côté des variantes et réutilisé tant que le modèle d'origine,
+        les variantes demandées et les tolérances ne changent pas.
+
+        Args:
+            samples (Iterable[Dict[str, np.ndarray]]): Entrées représentatives (calibration, précision, latence).
+            variants (Sequence[str]): Variantes à produire parmi 'dynamic_int8', 'static_int8' et 'float16'.
+            max_samples (int): Nombre maximal d'échantillons lus depuis `samples`.
+            force (bool): Refaire l'optimisation même si un rapport valide existe.
+
+        Returns:
+            Dict[str, Any]: Rapport avec la variante retenue (`selected`, `selected_path`) et une ligne
+                par candidat (chemin, écart maximal, validité, latences).
+        """
+        unknown = [variant for variant in variants if variant not in SUPPORTED_VARIANTS]
+        if unknown:
+            raise ValueError(f"Unsupported variants: {unknown}. Expected some of {list(SUPPORTED_VARIANTS)}")
+
+        source_hash = hash_file(self.model_path)
+        settings = {"source_hash": source_hash, "variants": list(variants), "rtol": self.rtol, "atol": self.atol}
+        if not force:
+            report = self._load_report()
+            if report is not None and all(report.get(key) == value for key, value in settings.items()):
+                if os.path.exists(report["selected_path"]):
+                    logger.info(f"Reusing model variant report {self.report_path}: {report['selected']}.")
+                    return report
+
+        samples = [sample for sample, _ in zip(samples, range(max_samples))]
+        if not samples:
+            raise ValueError("At least one sample is required to validate model variants.")
+
+        builders = {
+            "dynamic_int8": self.quantize_dynamic,
+            "static_int8": lambda: self.quantize_static(samples),
+            "float16": self.convert_float16,
+        }
+        reference = ONNXModelWrapper(self.model_path, device_preference=self.device_preference)
+        expected = [reference._run(sample) for sample in samples]
+        rows = [self._evaluate("original", self.model_path, samples, expected)]
+        for variant in variants:
+            try:
+                path = builders[variant]()
+            except Exception as e:
+                logger.warning(f"Could not build {variant} variant: {e}")
+                rows.append({"variant": variant, "path": None, "passed": False, "error": str(e)})
+                continue
+            rows.append(self._evaluate(variant, path, samples, expected))
+
+        best = min((row for row in rows if row["passed"]), key=lambda row: row["latency_p50_ms"])
+        report = {**settings, "selected": best["variant"], "selected_path": best["path"], "candidates": rows}
+        tmp_path = f"{self.report_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+        os.replace(tmp_path, self.report_path)
+        logger.info(f"Selected model variant {best['variant']} ({best['latency_p50_ms']:.3f} ms p50).")
+        return report
+
+    def _evaluate(
+        self, variant: str, path: str, samples: List[Dict[str, np.ndarray]], expected: List[List[np.ndarray]]
+    ) -> Dict[str, Any]:
+        """
+        Compare les sorties d'une variante à celles du modèle d'origine et mesure sa latence par échantillon.
+
+        Returns:
+            Dict[str, Any]: Ligne du rapport.
+        """
+        row: Dict[str, Any] = {"variant": variant, "path": path, "passed": False}
+        try:
+            model = ONNXModelWrapper(path, device_preference=self.device_preference)
+            max_error = 0.0
+            passed = True
+            for sample, reference in zip(samples, expected):
+                for output, target in zip(model._run(sample), reference):
+                    output = np.asarray(output, dtype=np.float64)
+                    target = np.asarray(target, dtype=np.float64)
+                    max_error = max(max_error, float(np.max(np.abs(output - target), initial=0.0)))
+                    passed = passed and bool(np.allclose(output, target, rtol=self.rtol, atol=self.atol))
+
+            latencies = []
+            for _ in range(self.repeat):
+                for sample in samples:
+                    start = time.perf_counter()
+                    model._run(sample)
+                    latencies.append(time.perf_counter() - start)
+            model.close()
+        except Exception as e:
+            logger.warning(f"Could not evaluate {variant} variant: {e}")
+            row["error"] = str(e)
+            return row
+
+        row.update(
+            passed=passed,
+            max_abs_error=max_error,
+            latency_p50_ms=float(np.percentile(latencies, 50)) * 1000,
+            latency_p95_ms=float(np.percentile(latencies, 95)) * 1000,
+            size_bytes=os.path.getsize(path),
+        )
+        logger.info(
+            f"Variant {variant}: max_abs_error={max_error:.4g}, passed={passed}, p50={row['latency_p50_ms']:.3f} ms."
+        )
+        return row
+
+    def _load_report(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.report_path):
+            return None
+        try:
+            with open(self.report_path, encoding="utf-8") as report_file:
+                return json.load(report_file)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable variant report {self.report_path}: {e}")
+            return None
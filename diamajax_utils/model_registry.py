@@ -0,0 +1,286 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .onnx_wrapper import ONNXModelWrapper
+
+logger = logging.getLogger(__name__)
+
+
+class _ModelEntry:
+    """
+    Version enregistrée d'un modèle et son wrapper éventuellement chargé.
+    """
+
+    def __init__(self, model_path: str, memory_bytes: int, wrapper_kwargs: Dict[str, Any]):
+        self.model_path = model_path
+        self.memory_bytes = memory_bytes
+        self.wrapper_kwargs = wrapper_kwargs
+        self.wrapper: Optional[ONNXModelWrapper] = None
+        self.in_use = 0
+        self.load_lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Registre multi-modèles : chargement à la demande par nom/version, éviction LRU sous un
+    budget mémoire et bascule atomique vers une nouvelle version.
+    """
+
+    def __init__(
+        self,
+        memory_budget_bytes: Optional[int] = None,
+        memory_factor: float = 2.0,
+        warmup: bool = True,
+        **wrapper_kwargs,
+    ):
+        """
+        Initialise le registre.
+
+        Args:
+            memory_budget_bytes (Optional[int]): Budget mémoire des sessions chargées, None pour illimité.
+            memory_factor (float): Multiplicateur appliqué à la taille du fichier ONNX pour estimer
+                l'empreinte mémoire d'une session.
+            warmup (bool): Exécuter `warmup` avec des entrées synthétiques à chaque chargement.
+            **wrapper_kwargs: Paramètres par défaut transmis à ONNXModelWrapper.
+        """
+        if memory_budget_bytes is not None and memory_budget_bytes <= 0:
+            raise ValueError("memory_budget_bytes must be > 0.")
+
+        self.memory_budget_bytes = memory_budget_bytes
+        self.memory_factor = memory_factor
+        self.warmup = warmup
+        self.wrapper_kwargs = wrapper_kwargs
+
+        self._entries: Dict[Tuple[str, str], _ModelEntry] = {}
+        self._active: Dict[str, str] = {}
+        self._loaded: "OrderedDict[Tuple[str, str], None]" = OrderedDict()
+        self._loaded_bytes = 0
+        self._lock = threading.RLock()
+        self._loads = 0
+        self._evictions = 0
+        logger.info(f"ModelRegistry initialized (memory_budget_bytes={memory_budget_bytes}).")
+
+    def register(
+        self,
+        name: str,
+        model_path: str,
+        version: str = "1",
+        activate: bool = True,
+        memory_bytes: Optional[int] = None,
+        **wrapper_kwargs,
+    ):
+        """
+        Enregistre une version de modèle sans la charger.
+
+        Si `activate` est vrai et qu'une autre version est active, la nouvelle version est chargée
+        (et préchauffée) puis substituée atomiquement ; les appels en cours terminent sur l'ancienne.
+
+        Args:
+            name (str): Nom du modèle.
+            model_path (str): Chemin vers le fichier ONNX.
+            version (str): Identifiant de version.
+            activate (bool): Faire de cette version la version servie par défaut.
+            memory_bytes (Optional[int]): Empreinte mémoire estimée (par défaut, taille du fichier × memory_factor).
+            **wrapper_kwargs: Paramètres spécifiques transmis à ONNXModelWrapper.
+        """
+        if memory_bytes is None:
+            memory_bytes = int(os.path.getsize(model_path) * self.memory_factor)
+        entry = _ModelEntry(model_path, memory_bytes, {**self.wrapper_kwargs, **wrapper_kwargs})
+        with self._lock:
+            key = (name, version)
+            if key in self._entries:
+                raise ValueError(f"Model {name} version {version} is already registered.")
+            self._entries[key] = entry
+            has_active = name in self._active
+        logger.info(f"Model {name} version {version} registered from {model_path}.")
+
+        if activate:
+            if has_active:
+                self.activate(name, version)
+            else:
+                with self._lock:
+                    self._active[name] = version
+
+    def activate(self, name: str, version: str):
+        """
+        Bascule atomiquement la version servie par défaut d'un modèle.
+
+        La nouvelle version est chargée avant la bascule afin qu'aucun appel ne paie son chargement.
+
+        Args:
+            name (str): Nom du modèle.
+            version (str): Version à activer.
+        """
+        self._load((name, version))
+        with self._lock:
+            previous = self._active.get(name)
+            self._active[name] = version
+        logger.info(f"Model {name} switched from version {previous} to {version}.")
+
+    def unregister(self, name: str, version: str):
+        """
+        Retire une version inactive du registre.
+
+        Args:
+            name (str): Nom du modèle.
+            version (str): Version à retirer.
+        """
+        with self._lock:
+            if self._active.get(name) == version:
+                raise ValueError(f"Cannot unregister active version {version} of model {name}.")
+            key = (name, version)
+            self._entry(key)
+            wrapper = self._unload(key) if key in self._loaded else None
+            del self._entries[key]
+        if wrapper is not None:
+            wrapper.close()
+
+    def get(self, name: str, version: Optional[str] = None) -> ONNXModelWrapper:
+        """
+        Retourne le wrapper d'un modèle, chargé à la demande.
+
+        Args:
+            name (str): Nom du modèle.
+            version (Optional[str]): Version souhaitée (par défaut, la version active).
+
+        Returns:
+            ONNXModelWrapper: Wrapper chargé.
+        """
+        return self._load(self._resolve(name, version))
+
+    @contextmanager
+    def acquire(self, name: str, version: Optional[str] = None) -> Iterator[ONNXModelWrapper]:
+        """
+        Réserve un wrapper le temps d'un bloc `with` ; il n'est pas évincé pendant son utilisation.
+
+        Args:
+            name (str): Nom du modèle.
+            version (Optional[str]): Version souhaitée (par défaut, la version active).
+
+        Yields:
+            ONNXModelWrapper: Wrapper chargé.
+        """
+        key = self._resolve(name, version)
+        with self._lock:
+            entry = self._entry(key)
+            entry.in_use += 1
+        try:
+            yield self._load(key)
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+
+    def predict(self, name: str, input_data: Dict[str, Any], version: Optional[str] = None) -> List[Any]:
+        """
+        Effectue une prédiction avec la version demandée (ou active) d'un modèle.
+
+        Args:
+            name (str): Nom du modèle.
+            input_data (Dict[str, Any]): Données d'entrée au modèle.
+            version (Optional[str]): Version souhaitée (par défaut, la version active).
+
+        Returns:
+            List[Any]: Résultats de la prédiction.
+        """
+        with self.acquire(name, version) as wrapper:
+            return wrapper.predict(input_data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne l'état du registre.
+
+        Returns:
+            Dict[str, Any]: Modèles enregistrés, chargés, versions actives, octets estimés, chargements et évictions.
+        """
+        with self._lock:
+            return {
+                "registered": len(self._entries),
+                "loaded": [f"{name}:{version}" for name, version in self._loaded],
+                "active": dict(self._active),
+                "loaded_bytes": self._loaded_bytes,
+                "loads": self._loads,
+                "evictions": self._evictions,
+            }
+
+    def _resolve(self, name: str, version: Optional[str]) -> Tuple[str, str]:
+        with self._lock:
+            if version is None:
+                if name not in self._active:
+                    raise KeyError(f"No active version for model: {name}")
+                version = self._active[name]
+            key = (name, version)
+            self._entry(key)
+            return key
+
+    def _entry(self, key: Tuple[str, str]) -> _ModelEntry:
+        if key not in self._entries:
+            raise KeyError(f"Unknown model {key[0]} version {key[1]}")
+        return self._entries[key]
+
+    def _load(self, key: Tuple[str, str]) -> ONNXModelWrapper:
+        """
+        Charge (ou retourne) le wrapper d'une version et met à jour l'ordre LRU.
+        """
+        with self._lock:
+            entry = self._entry(key)
+            if entry.wrapper is not None:
+                self._loaded.move_to_end(key)
+                return entry.wrapper
+
+        # Chargement hors du verrou global : les autres modèles restent servis pendant ce temps.
+        with entry.load_lock:
+            wrapper = entry.wrapper
+            if wrapper is None:
+                wrapper = ONNXModelWrapper(entry.model_path, **entry.wrapper_kwargs)
+                if self.warmup:
+                    wrapper.warmup()
+                with self._lock:
+                    # Version retirée (ou réenregistrée) par `unregister` pendant le chargement.
+                    registered = self._entries.get(key) is entry
+                    if registered:
+                        entry.wrapper = wrapper
+                        self._loaded[key] = None
+                        self._loaded_bytes += entry.memory_bytes
+                        self._loads += 1
+                        evicted = self._enforce_budget(protect=key)
+                if not registered:
+                    wrapper.close()
+                    raise KeyError(f"Model {key[0]} version {key[1]} was unregistered while loading.")
+                # Fermeture hors du verrou global : elle attend la fin des inférences en cours.
+                for evicted_wrapper in evicted:
+                    evicted_wrapper.close()
+                logger.info(f"Model {key[0]} version {key[1]} loaded ({entry.memory_bytes} bytes estimated).")
+        return wrapper
+
+    def _enforce_budget(self, protect: Tuple[str, str]) -> List[ONNXModelWrapper]:
+        """
+        Évince les versions les moins récemment utilisées jusqu'à respecter le budget (verrou tenu).
+
+        Returns:
+            List[ONNXModelWrapper]: Wrappers évincés, à fermer par l'appelant après avoir relâché le verrou.
+        """
+        evicted: List[ONNXModelWrapper] = []
+        if self.memory_budget_bytes is None:
+            return evicted
+        for key in list(self._loaded):
+            if self._loaded_bytes <= self.memory_budget_bytes:
+                break
+            if key == protect or self._entries[key].in_use:
+                continue
+            evicted.append(self._unload(key))
+            self._evictions += 1
+            logger.info(f"Model {key[0]} version {key[1]} evicted to respect memory budget.")
+        return evicted
+
+    def _unload(self, key: Tuple[str, str]) -> ONNXModelWrapper:
+        # Détache le wrapper (verrou tenu) ; l'appelant le ferme hors du verrou. Les appelants
+        # qui détiennent encore une référence terminent normalement.
+        entry = self._entries[key]
+        wrapper, entry.wrapper = entry.wrapper, None
+        del self._loaded[key]
+        self._loaded_bytes -= entry.memory_bytes
+        return wrapper
@@ -0,0 +1,156 @@
+import logging
+from collections import deque
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+
+from .clustering_service import validate_embeddings
+
+logger = logging.getLogger(__name__)
+
+
+class OnlineClusteringService:
+    """
+    Clustering incrémental pour des embeddings arrivant en continu : mise à jour des centroïdes
+    par mini-batchs, suivi de la dérive et réajustement complet seulement au-delà d'un seuil.
+    """
+
+    def __init__(
+        self,
+        n_clusters: int = 5,
+        batch_size: int = 1024,
+        drift_threshold: float = 0.25,
+        window_size: int = 50000,
+        random_state: int = 42,
+    ):
+        """
+        Initialise le service de clustering en ligne.
+
+        Args:
+            n_clusters (int): Nombre de clusters.
+            batch_size (int): Taille des mini-batchs du réajustement complet.
+            drift_threshold (float): Dérive relative au-delà de laquelle le modèle est réajusté.
+            window_size (int): Nombre de points récents conservés pour un réajustement.
+            random_state (int): État aléatoire pour reproductibilité.
+        """
+        if n_clusters < 1:
+            raise ValueError("n_clusters must be >= 1.")
+        if drift_threshold <= 0:
+            raise ValueError("drift_threshold must be > 0.")
+        if window_size < n_clusters:
+            raise ValueError("window_size must be >= n_clusters.")
+
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.drift_threshold = drift_threshold
+        self.window_size = window_size
+        self.random_state = random_state
+
+        self.model: Optional[MiniBatchKMeans] = None
+        self.reference_centers_: Optional[np.ndarray] = None
+        self.reference_distance_: Optional[float] = None
+        self.drift_history = deque(maxlen=1000)
+        self._window: "deque[np.ndarray]" = deque()
+        self._window_rows = 0
+        self.n_batches_ = 0
+        self.n_points_ = 0
+        self.n_refits_ = 0
+        logger.info(f"OnlineClusteringService initialized (n_clusters={n_clusters}, drift_threshold={drift_threshold}).")
+
+    def partial_fit(self, embeddings: Union[List[List[float]], np.ndarray]) -> Dict[str, Any]:
+        """
+        Intègre un batch d'embeddings : affecte les points, met à jour les centroïdes et mesure la dérive.
+
+        Args:
+            embeddings (Union[List[List[float]], np.ndarray]): Batch d'embeddings.
+
+        Returns:
+            Dict[str, Any]: Labels du batch, dérive mesurée et indicateur de réajustement.
+        """
+        embeddings = validate_embeddings(embeddings)
+        self._append_to_window(embeddings)
+        self.n_batches_ += 1
+        self.n_points_ += len(embeddings)
+
+        if self.model is None:
+            if self._window_rows < self.n_clusters:
+                # Pas encore assez de points pour initialiser les centroïdes.
+                return {"labels": np.full(len(embeddings), -1, dtype=np.int64), "drift": 0.0, "refitted": False}
+            self._refit()
+            return {"labels": self.model.predict(embeddings), "drift": 0.0, "refitted": True}
+
+        drift = self._measure_drift(embeddings)
+        self.drift_history.append(drift)
+        refitted = drift > self.drift_threshold
+        if refitted:
+            logger.info(f"Cluster drift {drift:.3f} exceeds threshold {self.drift_threshold}; refitting.")
+            self._refit()
+        else:
+            self.model.partial_fit(embeddings)
+        return {"labels": self.model.predict(embeddings), "drift": drift, "refitted": refitted}
+
+    def predict(self, embeddings: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+        """
+        Affecte des embeddings aux clusters courants sans mettre à jour le modèle.
+
+        Args:
+            embeddings (Union[List[List[float]], np.ndarray]): Embeddings à affecter.
+
+        Returns:
+            np.ndarray: Labels des clusters.
+        """
+        if self.model is None:
+            raise ValueError("Online clustering model is not initialized yet.")
+        return self.model.predict(validate_embeddings(embeddings))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retourne l'état du service.
+
+        Returns:
+            Dict[str, Any]: Batchs et points ingérés, réajustements, dernière dérive et taille de la fenêtre.
+        """
+        return {
+            "batches": self.n_batches_,
+            "points": self.n_points_,
+            "refits": self.n_refits_,
+            "last_drift": self.drift_history[-1] if self.drift_history else 0.0,
+            "window_rows": self._window_rows,
+        }
+
+    def _measure_drift(self, embeddings: np.ndarray) -> float:
+        """
+        Mesure la dérive d'un batch par rapport au modèle de référence.
+
+        La dérive est le maximum entre le déplacement moyen des centroïdes depuis le dernier
+        réajustement et la hausse relative de la distance moyenne au centroïde le plus proche,
+        tous deux rapportés à la distance moyenne de référence.
+
+        Returns:
+            float: Dérive relative (0 = aucune).
+        """
+        scale = self.reference_distance_ or 1.0
+        centroid_shift = np.linalg.norm(self.model.cluster_centers_ - self.reference_centers_, axis=1).mean() / scale
+        batch_distance = self.model.transform(embeddings).min(axis=1).mean()
+        distance_increase = batch_distance / scale - 1.0
+        return float(max(centroid_shift, distance_increase, 0.0))
+
+    def _refit(self):
+        """
+        Réajuste complètement le modèle sur la fenêtre de points récents et réinitialise la référence.
+        """
+        window = np.concatenate(list(self._window))
+        self.model = MiniBatchKMeans(
+            n_clusters=self.n_clusters, batch_size=self.batch_size, random_state=self.random_state, n_init=3
+        ).fit(window)
+        self.reference_centers_ = self.model.cluster_centers_.copy()
+        self.reference_distance_ = float(self.model.transform(window).min(axis=1).mean())
+        self.n_refits_ += 1
+
+    def _append_to_window(self, embeddings: np.ndarray):
+        # Copie : l'appelant peut réutiliser son tampon (sorties de `predict_bound`, blocs préalloués).
+        self._window.append(np.array(embeddings, copy=True))
+        self._window_rows += len(embeddings)
+        while self._window_rows - len(self._window[0]) >= self.window_size:
+            self._window_rows -= len(self._window.popleft())
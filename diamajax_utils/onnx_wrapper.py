@@ -1,29 +1,374 @@
+import json
 import logging
-from typing import Any, Dict, List
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
 import onnxruntime as ort
 
+from .inference_cache import InferenceCache, hash_file, hash_inputs
+from .instrumentation import Metrics, get_metrics
+
 logger = logging.getLogger(__name__)
 
+# Correspondance entre les types de tenseurs ONNX Runtime et les dtypes NumPy.
+ONNX_TYPE_TO_NUMPY = {
+    "tensor(float)": np.dtype(np.float32),
+    "tensor(float16)": np.dtype(np.float16),
+    "tensor(double)": np.dtype(np.float64),
+    "tensor(int8)": np.dtype(np.int8),
+    "tensor(int16)": np.dtype(np.int16),
+    "tensor(int32)": np.dtype(np.int32),
+    "tensor(int64)": np.dtype(np.int64),
+    "tensor(uint8)": np.dtype(np.uint8),
+    "tensor(uint16)": np.dtype(np.uint16),
+    "tensor(uint32)": np.dtype(np.uint32),
+    "tensor(uint64)": np.dtype(np.uint64),
+    "tensor(bool)": np.dtype(np.bool_),
+}
+
 class ONNXModelWrapper:
     """
     Encapsulation pour les modèles ONNX avec support multi-device et gestion des erreurs.
     """
 
-    def __init__(self, model_path: str, device_preference: str = "auto"):
+    EXECUTION_MODES = {
+        "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+        "parallel": ort.ExecutionMode.ORT_PARALLEL,
+    }
+
+    GRAPH_OPTIMIZATION_LEVELS = {
+        "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }
+
+    # Réglages de session qu'un profil de `SessionTuner` peut fixer.
+    TUNABLE_OPTIONS = (
+        "graph_optimization_level",
+        "execution_mode",
+        "intra_op_num_threads",
+        "inter_op_num_threads",
+        "enable_cpu_mem_arena",
+        "allow_spinning",
+    )
+
+    def __init__(
+        self,
+        model_path: str,
+        device_preference: str = "auto",
+        pool_size: int = 1,
+        intra_op_num_threads: Optional[int] = None,
+        inter_op_num_threads: Optional[int] = None,
+        execution_mode: str = "sequential",
+        cache: Optional[InferenceCache] = None,
+        optimized_cache_dir: Optional[str] = None,
+        lazy: bool = False,
+        metrics: Optional[Metrics] = None,
+        graph_optimization_level: str = "all",
+        enable_cpu_mem_arena: bool = True,
+        allow_spinning: Optional[bool] = None,
+        tuning_profile: Optional[str] = None,
+    ):
         """
         Initialise la classe avec un chemin de modèle ONNX.
 
         Args:
             model_path (str): Chemin vers le fichier ONNX.
             device_preference (str): Préférence de device ('cpu', 'gpu', ou 'auto').
+            pool_size (int): Nombre de sessions ONNX partagées entre appelants concurrents.
+            intra_op_num_threads (Optional[int]): Threads intra-opérateur par session
+                (par défaut, les cœurs disponibles répartis entre les sessions du pool).
+            inter_op_num_threads (Optional[int]): Threads inter-opérateurs par session.
+            execution_mode (str): Mode d'exécution du graphe ('sequential' ou 'parallel').
+            cache (Optional[InferenceCache]): Cache de résultats consulté par `predict` (désactivé par défaut).
+            optimized_cache_dir (Optional[str]): Répertoire où persister le graphe optimisé pour les démarrages suivants.
+            lazy (bool): Différer la création des sessions jusqu'à la première utilisation.
+            metrics (Optional[Metrics]): Registre des mesures (par défaut, le registre partagé de `get_metrics`).
+            graph_optimization_level (str): Niveau d'optimisation du graphe ('disable', 'basic', 'extended' ou 'all').
+            enable_cpu_mem_arena (bool): Utiliser l'arène mémoire CPU d'ONNX Runtime.
+            allow_spinning (Optional[bool]): Attente active des threads entre deux opérateurs
+                (par défaut, le comportement d'ONNX Runtime).
+            tuning_profile (Optional[str]): Profil JSON produit par `SessionTuner` ; ses réglages
+                remplacent les options de session ci-dessus.
         """
+        if pool_size < 1:
+            raise ValueError("pool_size must be >= 1.")
+
         self.model_path = model_path
         self.device = self._select_device(device_preference)
-        self.session = ort.InferenceSession(model_path, providers=[self.device])
-        self.input_metadata = {input.name: input.shape for input in self.session.get_inputs()}
-        self.output_metadata = {output.name: output.shape for output in self.session.get_outputs()}
-        logger.info(f"Model loaded from {model_path} on device: {self.device}")
+        self.pool_size = pool_size
+        self.cache = cache
+        self.optimized_cache_dir = optimized_cache_dir
+        self.intra_op_num_threads = intra_op_num_threads
+        self.inter_op_num_threads = inter_op_num_threads
+        self.execution_mode = execution_mode
+        self.graph_optimization_level = graph_optimization_level
+        self.enable_cpu_mem_arena = enable_cpu_mem_arena
+        self.allow_spinning = allow_spinning
+        self.tuning_profile: Optional[Dict[str, Any]] = None
+        if tuning_profile is not None:
+            self._apply_tuning_profile(tuning_profile)
+        if self.execution_mode not in self.EXECUTION_MODES:
+            raise ValueError(
+                f"Unsupported execution mode: {self.execution_mode}. Expected one of {list(self.EXECUTION_MODES)}"
+            )
+        if self.graph_optimization_level not in self.GRAPH_OPTIMIZATION_LEVELS:
+            raise ValueError(
+                f"Unsupported graph optimization level: {self.graph_optimization_level}. "
+                f"Expected one of {list(self.GRAPH_OPTIMIZATION_LEVELS)}"
+            )
+        self._warmup_input: Optional[Dict[str, Any]] = None
+        # Identité du modèle dans les clés du cache : un cache partagé entre modèles, versions ou
+        # variantes ne renvoie jamais les sorties d'un autre modèle.
+        self._cache_namespace = f"onnx-{hash_file(model_path)}-{self.device}" if cache is not None else ""
+        self.session_options = self._build_session_options()
+        self.load_timings: Dict[str, Any] = {}
+        # Rapport de `ModelOptimizer` quand le wrapper est construit par `from_best_variant`.
+        self.variant_report: Optional[Dict[str, Any]] = None
+        self.metrics = metrics if metrics is not None else get_metrics()
+
+        self._session = None
+        self._sessions: List[Any] = []
+        self._available_sessions: "queue.Queue" = queue.Queue()
+        self._load_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._bindings: Dict[Tuple, Tuple[Any, Dict[str, np.ndarray], List[np.ndarray]]] = {}
+
+        if lazy:
+            logger.info(f"Model {model_path} registered for lazy loading on device: {self.device}")
+        else:
+            self._ensure_loaded()
+
+    @classmethod
+    def from_best_variant(
+        cls,
+        model_path: str,
+        samples: Iterable[Dict[str, np.ndarray]],
+        optimizer_options: Optional[Dict[str, Any]] = None,
+        variants: Optional[Sequence[str]] = None,
+        force: bool = False,
+        **kwargs,
+    ) -> "ONNXModelWrapper":
+        """
+        Charge la variante la plus rapide du modèle (INT8 dynamique, INT8 statique, float16 ou
+        d'origine) dont les sorties restent dans la tolérance du modèle d'origine.
+
+        Args:
+            model_path (str): Chemin du modèle ONNX float32 d'origine.
+            samples (Iterable[Dict[str, np.ndarray]]): Entrées représentatives (calibration, précision, latence).
+            optimizer_options (Optional[Dict[str, Any]]): Options de `ModelOptimizer` (output_dir, rtol, atol, repeat).
+            variants (Optional[Sequence[str]]): Variantes à essayer (par défaut, toutes).
+            force (bool): Refaire l'optimisation même si un rapport valide existe.
+            **kwargs: Options du wrapper (pool_size, cache, metrics...).
+
+        Returns:
+            ONNXModelWrapper: Wrapper de la variante retenue ; le rapport est disponible dans `variant_report`.
+        """
+        from .model_optimizer import SUPPORTED_VARIANTS, ModelOptimizer
+
+        optimizer_options = dict(optimizer_options or {})
+        optimizer_options.setdefault("device_preference", kwargs.get("device_preference", "cpu"))
+        optimizer = ModelOptimizer(model_path, **optimizer_options)
+        report = optimizer.optimize(samples, variants=variants or SUPPORTED_VARIANTS, force=force)
+        wrapper = cls(report["selected_path"], **kwargs)
+        wrapper.variant_report = report
+        return wrapper
+
+    @property
+    def session(self) -> "ort.InferenceSession":
+        """
+        Session principale (créée au premier accès en mode paresseux).
+        """
+        self._ensure_loaded()
+        return self._session
+
+    @property
+    def input_metadata(self) -> Dict[str, Any]:
+        """
+        Formes des entrées du modèle, indexées par nom.
+        """
+        self._ensure_loaded()
+        return self._input_metadata
+
+    @property
+    def output_metadata(self) -> Dict[str, Any]:
+        """
+        Formes des sorties du modèle, indexées par nom.
+        """
+        self._ensure_loaded()
+        return self._output_metadata
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        Indique si les sessions ONNX ont été créées.
+        """
+        return self._session is not None
+
+    def _ensure_loaded(self):
+        """
+        Crée les sessions du pool si ce n'est pas déjà fait.
+        """
+        if self._session is None:
+            with self._load_lock:
+                if self._session is None:
+                    self._load()
+
+    def _load(self):
+        """
+        Crée les sessions du pool, en réutilisant le graphe optimisé en cache si disponible,
+        et enregistre la décomposition du temps de chargement dans `load_timings`.
+        """
+        start = time.perf_counter()
+        timings: Dict[str, Any] = {"optimized_cache_hit": False}
+
+        source_path = self.model_path
+        first_options = self.session_options
+        pending_path = None
+        if self.optimized_cache_dir:
+            step = time.perf_counter()
+            cached_path = self._optimized_model_path()
+            timings["hash_s"] = time.perf_counter() - step
+            if os.path.exists(cached_path):
+                source_path = cached_path
+                first_options = self._build_session_options(disable_optimizations=True)
+                timings["optimized_cache_hit"] = True
+            else:
+                # Écriture dans un fichier temporaire puis renommage atomique.
+                pending_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                first_options = self._build_session_options()
+                first_options.optimized_model_filepath = pending_path
+
+        step = time.perf_counter()
+        sessions = [self._create_session(source_path, first_options)]
+        if pending_path is not None:
+            if os.path.exists(pending_path):
+                os.replace(pending_path, cached_path)
+                source_path = cached_path
+                self.session_options = self._build_session_options(disable_optimizations=True)
+            else:
+                logger.warning(f"Optimized model was not written to {pending_path}; cache disabled for this load.")
+        elif timings["optimized_cache_hit"]:
+            self.session_options = first_options
+        timings["first_session_s"] = time.perf_counter() - step
+
+        step = time.perf_counter()
+        sessions.extend(self._create_session(source_path, self.session_options) for _ in range(self.pool_size - 1))
+        timings["pool_sessions_s"] = time.perf_counter() - step
+
+        step = time.perf_counter()
+        self._sessions = sessions
+        for session in sessions:
+            self._available_sessions.put(session)
+        self._input_metadata = {input.name: input.shape for input in sessions[0].get_inputs()}
+        self._output_metadata = {output.name: output.shape for output in sessions[0].get_outputs()}
+        self._input_spec = self._compile_input_spec(sessions[0])
+        timings["metadata_s"] = time.perf_counter() - step
+        timings["total_s"] = time.perf_counter() - start
+        self.load_timings = timings
+        # Publiée en dernier : les autres threads ne voient qu'un modèle complètement chargé.
+        self._session = sessions[0]
+        logger.info(
+            f"Model loaded from {self.model_path} on device: {self.device} "
+            f"(pool_size={self.pool_size}, load_time={timings['total_s']:.3f}s, "
+            f"optimized_cache_hit={timings['optimized_cache_hit']})"
+        )
+
+    def _optimized_model_path(self) -> str:
+        """
+        Chemin du graphe optimisé en cache, indexé par empreinte du modèle, provider, niveau
+        d'optimisation et version d'ORT.
+
+        Returns:
+            str: Chemin du fichier ONNX optimisé.
+        """
+        stem = os.path.splitext(os.path.basename(self.model_path))[0]
+        name = (
+            f"{stem}-{hash_file(self.model_path)}-{self.device}-"
+            f"{self.graph_optimization_level}-ort{ort.__version__}.onnx"
+        )
+        os.makedirs(self.optimized_cache_dir, exist_ok=True)
+        return os.path.join(self.optimized_cache_dir, name)
+
+    def _build_session_options(self, disable_optimizations: bool = False) -> "ort.SessionOptions":
+        """
+        Construit les options partagées par les sessions du pool.
+
+        Args:
+            disable_optimizations (bool): Désactiver l'optimisation du graphe (modèle déjà optimisé).
+
+        Returns:
+            ort.SessionOptions: Options de session.
+        """
+        options = ort.SessionOptions()
+        intra_op_num_threads = self.intra_op_num_threads
+        if intra_op_num_threads is None and self.pool_size > 1:
+            # Évite la sursouscription : chaque session reçoit sa part des cœurs.
+            intra_op_num_threads = max(1, (os.cpu_count() or 1) // self.pool_size)
+        if intra_op_num_threads is not None:
+            options.intra_op_num_threads = intra_op_num_threads
+        if self.inter_op_num_threads is not None:
+            options.inter_op_num_threads = self.inter_op_num_threads
+        options.execution_mode = self.EXECUTION_MODES[self.execution_mode]
+        options.enable_cpu_mem_arena = self.enable_cpu_mem_arena
+        if self.allow_spinning is not None:
+            spinning = "1" if self.allow_spinning else "0"
+            options.add_session_config_entry("session.intra_op.allow_spinning", spinning)
+            options.add_session_config_entry("session.inter_op.allow_spinning", spinning)
+        if disable_optimizations:
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        else:
+            options.graph_optimization_level = self.GRAPH_OPTIMIZATION_LEVELS[self.graph_optimization_level]
+        return options
+
+    def _apply_tuning_profile(self, path: str):
+        """
+        Applique les réglages de session d'un profil produit par `SessionTuner`. Un profil établi
+        pour un autre modèle ou un autre provider est ignoré ; un profil mesuré dans d'autres
+        conditions (concurrence, nombre de cœurs, version d'ONNX Runtime) est appliqué avec un avertissement.
+
+        Args:
+            path (str): Chemin du profil JSON.
+        """
+        with open(path, encoding="utf-8") as profile_file:
+            profile = json.load(profile_file)
+        if profile.get("model_hash") != hash_file(self.model_path) or profile.get("device") != self.device:
+            logger.warning(f"Tuning profile {path} was built for another model or device; ignoring it.")
+            return
+        options = profile.get("options", {})
+        unknown = [name for name in options if name not in self.TUNABLE_OPTIONS]
+        if unknown:
+            raise ValueError(f"Unsupported options in tuning profile {path}: {unknown}")
+        current = {"concurrency": self.pool_size, "cpu_count": os.cpu_count(), "onnxruntime": ort.__version__}
+        mismatches = [
+            f"{key}={profile.get(key)} (now {value})" for key, value in current.items() if profile.get(key) != value
+        ]
+        if mismatches:
+            logger.warning(f"Tuning profile {path} was measured under other conditions: {', '.join(mismatches)}.")
+        for name, value in options.items():
+            setattr(self, name, value)
+        self.tuning_profile = profile
+        logger.info(f"Session options loaded from tuning profile {path}: {options}")
+
+    def _create_session(self, model_path: str, options: "ort.SessionOptions") -> "ort.InferenceSession":
+        """
+        Crée une session ONNX avec les options et le device configurés.
+
+        Args:
+            model_path (str): Chemin du modèle à charger.
+            options (ort.SessionOptions): Options de session.
+
+        Returns:
+            ort.InferenceSession: Nouvelle session.
+        """
+        return ort.InferenceSession(model_path, sess_options=options, providers=[self.device])
 
     def _select_device(self, preference: str) -> str:
         """
@@ -39,9 +384,29 @@ class ONNXModelWrapper:
             return "CUDAExecutionProvider"
         return "CPUExecutionProvider"
 
+    def _compile_input_spec(
+        self, session: "ort.InferenceSession"
+    ) -> Dict[str, Tuple[Optional[np.dtype], Tuple[Optional[int], ...]]]:
+        """
+        Compile une fois les contraintes d'entrée (dtype et dimensions statiques) depuis la session.
+
+        Args:
+            session (ort.InferenceSession): Session de référence.
+
+        Returns:
+            Dict[str, Tuple[Optional[np.dtype], Tuple[Optional[int], ...]]]: Dtype attendu (None si inconnu)
+                et dimensions par entrée (None pour une dimension dynamique).
+        """
+        spec = {}
+        for meta in session.get_inputs():
+            dtype = ONNX_TYPE_TO_NUMPY.get(getattr(meta, "type", None))
+            dims = tuple(dim if isinstance(dim, int) and dim > 0 else None for dim in meta.shape)
+            spec[meta.name] = (dtype, dims)
+        return spec
+
     def validate_input(self, input_data: Dict[str, Any]) -> bool:
         """
-        Valide les données d'entrée pour le modèle ONNX.
+        Valide les données d'entrée pour le modèle ONNX (clés, rang, dimensions statiques et dtype).
 
         Args:
             input_data (Dict[str, Any]): Données d'entrée.
@@ -49,14 +414,23 @@ class ONNXModelWrapper:
         Returns:
             bool: True si les données sont valides, sinon False.
         """
+        self._ensure_loaded()
         for key, value in input_data.items():
-            if key not in self.input_metadata:
+            spec = self._input_spec.get(key)
+            if spec is None:
                 logger.error(f"Invalid input key: {key}. Expected keys: {list(self.input_metadata.keys())}")
                 return False
-            if len(value.shape) != len(self.input_metadata[key]):
-                logger.error(f"Shape mismatch for input '{key}': {value.shape} != {self.input_metadata[key]}")
+            dtype, dims = spec
+            shape = value.shape
+            if len(shape) != len(dims) or any(
+                expected is not None and actual != expected for actual, expected in zip(shape, dims)
+            ):
+                logger.error(f"Shape mismatch for input '{key}': {shape} != {self.input_metadata[key]}")
                 return False
-        logger.info("Input validation passed.")
+            if dtype is not None and value.dtype != dtype:
+                logger.error(f"Dtype mismatch for input '{key}': {value.dtype} != {dtype}")
+                return False
+        logger.debug("Input validation passed.")
         return True
 
     def predict(self, input_data: Dict[str, Any]) -> List[Any]:
@@ -69,18 +443,171 @@ class ONNXModelWrapper:
         Returns:
             List[Any]: Résultats de la prédiction.
         """
-        if not self.validate_input(input_data):
+        metrics = self.metrics
+        metrics.increment("onnx.calls")
+        with metrics.timer("onnx.validate"):
+            valid = self.validate_input(input_data)
+        if not valid:
+            metrics.increment("onnx.errors")
             raise ValueError("Invalid input data provided.")
+        if metrics.enabled:
+            metrics.increment("onnx.input_bytes", sum(getattr(value, "nbytes", 0) for value in input_data.values()))
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = f"{self._cache_namespace}-{hash_inputs(input_data)}"
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                metrics.increment("onnx.cache_hits")
+                return cached
 
         try:
-            logger.info(f"Running inference on model: {self.model_path}")
-            outputs = self.session.run(None, input_data)
-            logger.info("Inference completed successfully.")
+            # Chemin critique : message formaté seulement si le niveau DEBUG est actif.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Running inference on model: {self.model_path}")
+            with metrics.timer("onnx.run"):
+                outputs = self._run(input_data)
+            if cache_key is not None:
+                self.cache.put(cache_key, outputs)
             return outputs
         except Exception as e:
+            metrics.increment("onnx.errors")
             logger.error(f"Error during inference: {e}")
             return []
 
+    def _run(self, input_data: Dict[str, Any]) -> List[Any]:
+        """
+        Exécute la session ONNX sans validation ni capture d'erreur.
+
+        Args:
+            input_data (Dict[str, Any]): Données d'entrée déjà validées.
+
+        Returns:
+            List[Any]: Sorties brutes de la session.
+        """
+        if self.pool_size == 1:
+            return self.session.run(None, input_data)
+
+        self._ensure_loaded()
+        session = self._available_sessions.get()
+        try:
+            return session.run(None, input_data)
+        finally:
+            self._available_sessions.put(session)
+
+    def predict_bound(self, input_data: Dict[str, np.ndarray]) -> List[np.ndarray]:
+        """
+        Effectue une prédiction via IOBinding avec des tampons de sortie préalloués et réutilisés.
+
+        Les tampons sont indexés par les formes d'entrée : le premier appel pour une forme valide
+        les entrées et alloue les sorties, les appels suivants n'allouent rien et sautent la
+        validation. Les tableaux retournés sont réécrits à l'appel suivant de même forme ; les
+        copier pour les conserver. Non thread-safe : à utiliser depuis un seul thread.
+
+        Args:
+            input_data (Dict[str, np.ndarray]): Tableaux NumPy C-contigus (ValueError sinon), de préférence
+                réutilisés d'un appel à l'autre.
+
+        Returns:
+            List[np.ndarray]: Tampons de sortie remplis par la session.
+        """
+        key = tuple((name, value.shape) for name, value in input_data.items())
+        entry = self._bindings.get(key)
+        if entry is None:
+            if not self.validate_input(input_data):
+                raise ValueError("Invalid input data provided.")
+            entry = self._create_binding(input_data)
+            self._bindings[key] = entry
+
+        binding, bound_inputs, outputs = entry
+        for name, value in input_data.items():
+            # Ne relie l'entrée que si l'appelant fournit un autre tampon ; la référence le garde vivant.
+            if bound_inputs.get(name) is not value:
+                # Le binding lit directement la mémoire du tableau : une copie contiguë ne verrait
+                # pas les écritures ultérieures de l'appelant dans son tampon.
+                if not isinstance(value, np.ndarray) or not value.flags.c_contiguous:
+                    raise ValueError(f"Input '{name}' must be a C-contiguous numpy array for predict_bound.")
+                dtype = self._input_spec[name][0]
+                if dtype is not None and value.dtype != dtype:
+                    raise ValueError(f"Dtype mismatch for input '{name}': {value.dtype} != {dtype}")
+                binding.bind_cpu_input(name, value)
+                bound_inputs[name] = value
+        self.metrics.increment("onnx.calls")
+        with self.metrics.timer("onnx.run"):
+            self.session.run_with_iobinding(binding)
+        return outputs
+
+    def allocate_input_buffers(self, input_shapes: Dict[str, Tuple[int, ...]]) -> Dict[str, np.ndarray]:
+        """
+        Alloue des tampons d'entrée réutilisables au dtype attendu par le modèle.
+
+        Args:
+            input_shapes (Dict[str, Tuple[int, ...]]): Forme de chaque entrée.
+
+        Returns:
+            Dict[str, np.ndarray]: Tampons à remplir en place avant chaque `predict_bound`.
+        """
+        self._ensure_loaded()
+        buffers = {}
+        for name, shape in input_shapes.items():
+            if name not in self._input_spec:
+                raise ValueError(f"Invalid input key: {name}. Expected keys: {list(self.input_metadata.keys())}")
+            dtype = self._input_spec[name][0] or np.dtype(np.float32)
+            buffers[name] = np.zeros(shape, dtype=dtype)
+        return buffers
+
+    def _create_binding(self, input_data: Dict[str, np.ndarray]) -> Tuple[Any, Dict[str, np.ndarray], List[np.ndarray]]:
+        """
+        Crée un IOBinding et ses tampons de sortie pour une combinaison de formes d'entrée.
+
+        Args:
+            input_data (Dict[str, np.ndarray]): Entrées de référence.
+
+        Returns:
+            Tuple[Any, Dict[str, np.ndarray], List[np.ndarray]]: Binding, entrées actuellement liées et tampons de sortie.
+        """
+        # Une exécution classique fixe les formes et dtypes de sortie pour ces formes d'entrée.
+        reference = self.session.run(None, input_data)
+        binding = self.session.io_binding()
+        outputs = []
+        for meta, value in zip(self.session.get_outputs(), reference):
+            buffer = np.empty_like(value)
+            binding.bind_ortvalue_output(meta.name, ort.OrtValue.ortvalue_from_numpy(buffer))
+            outputs.append(buffer)
+        logger.info(f"IOBinding created for input shapes: { {name: value.shape for name, value in input_data.items()} }")
+        return binding, {}, outputs
+
+    def predict_many(self, inputs: List[Dict[str, Any]], max_workers: Optional[int] = None) -> List[List[Any]]:
+        """
+        Répartit une liste d'entrées sur les sessions du pool via un pool de threads.
+
+        Args:
+            inputs (List[Dict[str, Any]]): Entrées à prédire.
+            max_workers (Optional[int]): Threads utilisés (par défaut, la taille du pool de sessions).
+
+        Returns:
+            List[List[Any]]: Résultats dans l'ordre des entrées.
+        """
+        if max_workers is not None and max_workers != self.pool_size:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                return list(executor.map(self.predict, inputs))
+
+        with self._executor_lock:
+            # Créé une seule fois même si plusieurs threads appellent predict_many simultanément.
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="diamajax-onnx")
+            executor = self._executor
+        return list(executor.map(self.predict, inputs))
+
+    def close(self):
+        """
+        Libère le pool de threads utilisé par `predict_many`.
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
     def get_model_metadata(self) -> Dict[str, Any]:
         """
         Récupère les métadonnées du modèle ONNX.
@@ -95,15 +622,72 @@ class ONNXModelWrapper:
         logger.info(f"Model metadata: {metadata}")
         return metadata
 
-    def warmup(self, sample_input: Dict[str, Any]):
+    def synthetic_input(self, batch_size: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Génère des entrées factices conformes aux métadonnées d'entrée du modèle.
+
+        Args:
+            batch_size (int): Taille utilisée pour une première dimension dynamique.
+
+        Returns:
+            Dict[str, np.ndarray]: Entrées nulles au dtype attendu (les autres dimensions dynamiques valent 1).
+        """
+        self._ensure_loaded()
+        inputs = {}
+        for name, (dtype, dims) in self._input_spec.items():
+            shape = tuple(
+                dim if dim is not None else (batch_size if axis == 0 else 1) for axis, dim in enumerate(dims)
+            )
+            inputs[name] = np.zeros(shape, dtype=dtype or np.float32)
+        return inputs
+
+    def autotune(
+        self,
+        sample_input: Optional[Dict[str, Any]] = None,
+        profile_path: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Recherche les meilleures options de session pour ce modèle avec `SessionTuner`. Le profil
+        enregistré est appliqué aux wrappers construits ensuite avec `tuning_profile=profile_path`.
+
+        Args:
+            sample_input (Optional[Dict[str, Any]]): Entrée représentative (par défaut, celle passée à `warmup`).
+            profile_path (Optional[str]): Fichier JSON où enregistrer le profil.
+            concurrency (Optional[int]): Appelants simultanés simulés (par défaut, `pool_size`).
+            **kwargs: Options de `SessionTuner` (requests, objective, search_space, repeats, min_improvement).
+
+        Returns:
+            Dict[str, Any]: Profil retenu.
+        """
+        from .session_tuner import SessionTuner
+
+        if sample_input is None:
+            sample_input = self._warmup_input if self._warmup_input is not None else self.synthetic_input()
+        if not self.validate_input(sample_input):
+            raise ValueError("Invalid sample input for autotuning.")
+        tuner = SessionTuner(
+            self.model_path,
+            device_preference="gpu" if self.device == "CUDAExecutionProvider" else "cpu",
+            concurrency=concurrency or self.pool_size,
+            **kwargs,
+        )
+        return tuner.tune(sample_input, profile_path=profile_path)
+
+    def warmup(self, sample_input: Optional[Dict[str, Any]] = None):
         """
         Réalise une pré-exécution pour réduire la latence initiale.
 
         Args:
-            sample_input (Dict[str, Any]): Exemple de données d'entrée.
+            sample_input (Optional[Dict[str, Any]]): Exemple de données d'entrée
+                (par défaut, entrées synthétiques générées depuis les métadonnées).
         """
         try:
             logger.info("Warming up ONNX model...")
+            if sample_input is None:
+                sample_input = self.synthetic_input()
+            self._warmup_input = sample_input
             self.predict(sample_input)
             logger.info("Warmup completed successfully.")
         except Exception as e:
@@ -0,0 +1,229 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import onnxruntime as ort
+
+from .inference_cache import hash_file
+from .instrumentation import Metrics
+from .onnx_wrapper import ONNXModelWrapper
+
+logger = logging.getLogger(__name__)
+
+OBJECTIVES = ("throughput", "latency")
+
+# Réglages de départ : ceux du wrapper construit sans options.
+DEFAULT_OPTIONS: Dict[str, Any] = {
+    "graph_optimization_level": "all",
+    "execution_mode": "sequential",
+    "intra_op_num_threads": None,
+    "inter_op_num_threads": None,
+    "enable_cpu_mem_arena": True,
+    "allow_spinning": None,
+}
+
+
+class SessionTuner:
+    """
+    Recherche les options de session ONNX Runtime (niveau d'optimisation du graphe, threads,
+    mode d'exécution, arène mémoire, attente active) qui donnent le meilleur débit ou la meilleure
+    latence sous une concurrence cible, et les enregistre dans un profil chargé par `ONNXModelWrapper`.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        device_preference: str = "cpu",
+        concurrency: int = 1,
+        requests: int = 200,
+        objective: str = "throughput",
+        search_space: Optional[Dict[str, Sequence[Any]]] = None,
+        repeats: int = 3,
+        min_improvement: float = 0.05,
+    ):
+        """
+        Initialise le tuner.
+
+        Args:
+            model_path (str): Chemin du modèle ONNX.
+            device_preference (str): Préférence de device ('cpu', 'gpu', ou 'auto').
+            concurrency (int): Nombre d'appelants simultanés simulés (et taille du pool de sessions).
+            requests (int): Nombre d'inférences mesurées par configuration.
+            objective (str): 'throughput' (inférences par seconde) ou 'latency' (p95).
+            search_space (Optional[Dict[str, Sequence[Any]]]): Valeurs essayées par option
+                (par défaut, `default_search_space`).
+            repeats (int): Nombre de mesures par configuration ; la médiane de chaque indicateur est retenue.
+            min_improvement (float): Gain relatif minimal (0.05 pour 5 %) pour préférer un candidat à
+                la meilleure configuration courante, afin de ne pas retenir un écart dû au bruit.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1.")
+        if requests < 1:
+            raise ValueError("requests must be >= 1.")
+        if repeats < 1:
+            raise ValueError("repeats must be >= 1.")
+        if min_improvement < 0:
+            raise ValueError("min_improvement must be >= 0.")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unsupported objective: {objective}. Expected one of {list(OBJECTIVES)}")
+        self.model_path = model_path
+        self.device_preference = device_preference
+        self.concurrency = concurrency
+        self.requests = requests
+        self.objective = objective
+        self.repeats = repeats
+        self.min_improvement = min_improvement
+        self.device: Optional[str] = None
+        self.search_space = dict(search_space) if search_space is not None else self.default_search_space()
+        unknown = [name for name in self.search_space if name not in ONNXModelWrapper.TUNABLE_OPTIONS]
+        if unknown:
+            raise ValueError(f"Unsupported options: {unknown}. Expected some of {list(ONNXModelWrapper.TUNABLE_OPTIONS)}")
+
+    def default_search_space(self) -> Dict[str, List[Any]]:
+        """
+        Valeurs essayées par défaut ; les nombres de threads suivent les cœurs disponibles par appelant.
+
+        Returns:
+            Dict[str, List[Any]]: Valeurs candidates par option.
+        """
+        cores = max(1, (os.cpu_count() or 1) // self.concurrency)
+        threads = sorted({1, cores} | {2**i for i in range(1, cores.bit_length()) if 2**i < cores})
+        return {
+            "graph_optimization_level": ["basic", "extended", "all"],
+            "execution_mode": ["sequential", "parallel"],
+            "intra_op_num_threads": threads,
+            "inter_op_num_threads": threads,
+            "enable_cpu_mem_arena": [True, False],
+            "allow_spinning": [True, False],
+        }
+
+    def measure(self, options: Dict[str, Any], sample_input: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Mesure une configuration : `repeats` séries de `requests` inférences réparties sur
+        `concurrency` appelants.
+
+        Args:
+            options (Dict[str, Any]): Options de session du wrapper.
+            sample_input (Dict[str, Any]): Entrée représentative.
+
+        Returns:
+            Dict[str, float]: Débit (inférences/s) et latences p50/p95 (ms), médianes des séries.
+        """
+        model = ONNXModelWrapper(
+            self.model_path,
+            device_preference=self.device_preference,
+            pool_size=self.concurrency,
+            metrics=Metrics(enabled=False),
+            **options,
+        )
+        self.device = model.device
+
+        def timed_run(_):
+            start = time.perf_counter()
+            model._run(sample_input)
+            return time.perf_counter() - start
+
+        runs = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                # Chauffe : chaque session du pool exécute au moins une inférence.
+                list(executor.map(timed_run, range(self.concurrency)))
+                for _ in range(self.repeats):
+                    start = time.perf_counter()
+                    latencies = list(executor.map(timed_run, range(self.requests)))
+                    elapsed = time.perf_counter() - start
+                    runs.append(
+                        {
+                            "throughput_per_s": self.requests / elapsed if elapsed > 0 else float("inf"),
+                            "latency_p50_ms": float(np.percentile(latencies, 50)) * 1000,
+                            "latency_p95_ms": float(np.percentile(latencies, 95)) * 1000,
+                        }
+                    )
+        finally:
+            model.close()
+        return {key: float(np.median([run[key] for run in runs])) for key in runs[0]}
+
+    def _improves(self, result: Dict[str, float], best: Dict[str, float]) -> bool:
+        # Un candidat n'est retenu que s'il dépasse la meilleure mesure d'au moins min_improvement.
+        if self.objective == "throughput":
+            return result["throughput_per_s"] > best["throughput_per_s"] * (1 + self.min_improvement)
+        return result["latency_p95_ms"] < best["latency_p95_ms"] * (1 - self.min_improvement)
+
+    def tune(self, sample_input: Dict[str, Any], profile_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Recherche option par option (descente par coordonnées) : chaque option prend tour à tour
+        ses valeurs candidates, les autres restant fixées aux meilleures trouvées. Le coût est la
+        somme des candidats et non leur produit.
+
+        Args:
+            sample_input (Dict[str, Any]): Entrée représentative, par exemple celle passée à `warmup`.
+            profile_path (Optional[str]): Fichier JSON où enregistrer le profil retenu.
+
+        Returns:
+            Dict[str, Any]: Profil avec les options retenues, leurs mesures, celles des options
+                par défaut et l'historique des essais.
+        """
+        best_options = dict(DEFAULT_OPTIONS)
+        baseline = self.measure(best_options, sample_input)
+        best = baseline
+        trials = [{"options": dict(best_options), **baseline}]
+        for name, values in self.search_space.items():
+            # Les threads inter-opérateurs ne servent qu'en mode parallèle.
+            if name == "inter_op_num_threads" and best_options["execution_mode"] != "parallel":
+                continue
+            for value in values:
+                if value == best_options[name]:
+                    continue
+                candidate = {**best_options, name: value}
+                try:
+                    result = self.measure(candidate, sample_input)
+                except Exception as e:
+                    logger.warning(f"Skipping session options {candidate}: {e}")
+                    continue
+                trials.append({"options": candidate, **result})
+                if self._improves(result, best):
+                    best_options, best = candidate, result
+            logger.info(f"Best {name}: {best_options[name]}")
+
+        profile = {
+            "model_hash": hash_file(self.model_path),
+            "device": self.device,
+            "onnxruntime": ort.__version__,
+            "cpu_count": os.cpu_count(),
+            "concurrency": self.concurrency,
+            "objective": self.objective,
+            "repeats": self.repeats,
+            "min_improvement": self.min_improvement,
+            "options": best_options,
+            "result": best,
+            "baseline": baseline,
+            "trials": trials,
+        }
+        logger.info(
+            f"Tuned session options: {best_options} (throughput {baseline['throughput_per_s']:.1f} -> "
+            f"{best['throughput_per_s']:.1f}/s, p95 {baseline['latency_p95_ms']:.3f} -> {best['latency_p95_ms']:.3f} ms)"
+        )
+        if profile_path is not None:
+            self.save_profile(profile, profile_path)
+        return profile
+
+    @staticmethod
+    def save_profile(profile: Dict[str, Any], path: str):
+        """
+        Écrit un profil de manière atomique.
+
+        Args:
+            profile (Dict[str, Any]): Profil renvoyé par `tune`.
+            path (str): Fichier JSON de destination.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as profile_file:
+            json.dump(profile, profile_file, indent=2)
+        os.replace(tmp_path, path)
+        logger.info(f"Tuning profile written to {path}.")
@@ -0,0 +1,292 @@
+import logging
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .data_preprocessor import DataPreprocessor
+from .instrumentation import Metrics, get_metrics
+from .onnx_wrapper import ONNXModelWrapper
+
+if TYPE_CHECKING:
+    from .clustering_service import ClusteringService
+    from .dashboard_generator import DashboardGenerator
+    from .live_dashboard import LiveDashboard
+
+logger = logging.getLogger(__name__)
+
+# Marque la fin du flux dans les files entre étapes.
+_DONE = object()
+
+
+class StreamingPipeline:
+    """
+    Enchaîne prétraitement, inférence ONNX, réduction UMAP et affectation aux clusters bloc par bloc.
+    Chaque étape tourne dans son propre thread et communique par des files bornées : les étapes se
+    recouvrent (inférence du bloc k pendant le prétraitement du bloc k+1) et la mémoire reste
+    proportionnelle à `queue_size` blocs, quelle que soit la taille du jeu de données.
+    """
+
+    def __init__(
+        self,
+        model: ONNXModelWrapper,
+        preprocessor: DataPreprocessor,
+        clusterer: Any,
+        clustering: Optional["ClusteringService"] = None,
+        input_name: Optional[str] = None,
+        output_index: int = 0,
+        chunk_size: int = 8192,
+        queue_size: int = 4,
+        dashboard: Optional["DashboardGenerator"] = None,
+        live_dashboard: Optional["LiveDashboard"] = None,
+        metrics: Optional[Metrics] = None,
+    ):
+        """
+        Initialise le pipeline à partir de composants déjà ajustés.
+
+        Args:
+            model (ONNXModelWrapper): Modèle produisant les embeddings.
+            preprocessor (DataPreprocessor): Préprocesseur ajusté (`fit`, `partial_fit` ou `load_stats`).
+            clusterer (Any): Modèle de clustering ajusté exposant `predict` (par exemple celui de
+                `ClusteringService.partial_fit_kmeans`), ou OnlineClusteringService mis à jour au fil du flux.
+            clustering (Optional[ClusteringService]): Service dont le réducteur UMAP ajusté projette les
+                embeddings avant le clustering (par défaut, clustering directement sur les embeddings).
+            input_name (Optional[str]): Entrée du modèle alimentée (par défaut, la première).
+            output_index (int): Indice de la sortie du modèle utilisée comme embeddings.
+            chunk_size (int): Nombre de lignes par bloc.
+            queue_size (int): Nombre maximal de blocs en attente entre deux étapes.
+            dashboard (Optional[DashboardGenerator]): Générateur du rapport final (temps par étape, tailles des clusters).
+            live_dashboard (Optional[LiveDashboard]): Tableau de bord mis à jour après chaque bloc.
+            metrics (Optional[Metrics]): Registre des mesures (par défaut, le registre partagé de `get_metrics`).
+        """
+        from .online_clustering import OnlineClusteringService
+
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be > 0.")
+        if queue_size <= 0:
+            raise ValueError("queue_size must be > 0.")
+        if not preprocessor.is_fitted:
+            raise ValueError("Preprocessor is not fitted. Call fit, partial_fit or load_stats first.")
+        if clustering is not None and not clustering.is_fitted:
+            raise ValueError("UMAP reducer is not fitted. Call fit, reduce_dimensions or load first.")
+        self._online = isinstance(clusterer, OnlineClusteringService)
+        if not self._online and not hasattr(clusterer, "predict"):
+            raise ValueError("clusterer must expose predict or be an OnlineClusteringService.")
+
+        self.model = model
+        self.preprocessor = preprocessor
+        self.clusterer = clusterer
+        self.clustering = clustering
+        self.input_name = input_name or next(iter(model.input_metadata))
+        if self.input_name not in model.input_metadata:
+            raise ValueError(f"Unknown model input: {self.input_name}. Expected one of {list(model.input_metadata)}")
+        self.output_index = output_index
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size
+        self.dashboard = dashboard
+        self.live_dashboard = live_dashboard
+        self.metrics = metrics if metrics is not None else get_metrics()
+        self._input_dtype = model._input_spec[self.input_name][0] or np.float32
+
+        self._stop = threading.Event()
+        self._errors: List[Tuple[str, BaseException]] = []
+
+    @property
+    def stages(self) -> List[Tuple[str, Callable[[Any], Any]]]:
+        """
+        Étapes exécutées chacune dans un thread, dans l'ordre du flux.
+        """
+        stages = [("preprocess", self._preprocess), ("infer", self._infer)]
+        if self.clustering is not None:
+            stages.append(("reduce", self.clustering.transform))
+        stages.append(("cluster", self._cluster))
+        return stages
+
+    def _preprocess(self, chunk: np.ndarray) -> np.ndarray:
+        return self.preprocessor.transform(chunk, dtype=self._input_dtype)
+
+    def _infer(self, chunk: np.ndarray) -> np.ndarray:
+        outputs = self.model.predict({self.input_name: chunk})
+        if not outputs:
+            raise RuntimeError(f"Inference failed for a chunk of {len(chunk)} rows.")
+        return outputs[self.output_index]
+
+    def _cluster(self, embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self._online:
+            labels = self.clusterer.partial_fit(embeddings)["labels"]
+        else:
+            labels = self.clusterer.predict(embeddings)
+        return embeddings, labels
+
+    def run(
+        self,
+        data: Union[str, np.ndarray, Iterable[np.ndarray]],
+        on_chunk: Optional[Callable[[int, np.ndarray, np.ndarray], None]] = None,
+        report_file: str = "pipeline_report.html",
+    ) -> Dict[str, Any]:
+        """
+        Traite un flux de données brutes jusqu'aux labels de clusters.
+
+        Args:
+            data (Union[str, np.ndarray, Iterable[np.ndarray]]): Tableau, fichier .npy (mappé en mémoire)
+                ou itérateur de blocs.
+            on_chunk (Optional[Callable[[int, np.ndarray, np.ndarray], None]]): Appelé dans le thread
+                appelant, dans l'ordre des blocs, avec l'indice du bloc, ses embeddings réduits et ses labels.
+            report_file (str): Nom du rapport HTML écrit par `dashboard`.
+
+        Returns:
+            Dict[str, Any]: Résumé : blocs et lignes traités, durée, débit, temps cumulé par étape,
+                étape limitante, tailles des clusters et chemin du rapport.
+        """
+        self._stop.clear()
+        self._errors = []
+        stages = [("read", None)] + self.stages
+        stage_seconds = {name: 0.0 for name, _ in stages}
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in stages]
+        threads = [
+            threading.Thread(
+                target=self._read_worker, args=(data, queues[0], stage_seconds), name="pipeline-read", daemon=True
+            )
+        ]
+        for i, (name, func) in enumerate(stages[1:], start=1):
+            threads.append(
+                threading.Thread(
+                    target=self._stage_worker,
+                    args=(name, func, queues[i - 1], queues[i], stage_seconds),
+                    name=f"pipeline-{name}",
+                    daemon=True,
+                )
+            )
+
+        cluster_counts: Dict[str, int] = {}
+        n_chunks = n_rows = 0
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _DONE:
+                    break
+                index, (reduced, labels), timings = item
+                values, counts = np.unique(labels, return_counts=True)
+                chunk_counts = {str(value): int(count) for value, count in zip(values, counts)}
+                for label, count in chunk_counts.items():
+                    cluster_counts[label] = cluster_counts.get(label, 0) + count
+                n_chunks += 1
+                n_rows += len(labels)
+                self.metrics.increment("pipeline.rows", len(labels))
+                if self.live_dashboard is not None:
+                    for name, seconds in timings.items():
+                        self.live_dashboard.append(f"pipeline.{name}_ms", seconds * 1000, x=index)
+                    self.live_dashboard.update_counts("pipeline.clusters", chunk_counts, increment=True)
+                if on_chunk is not None:
+                    on_chunk(index, reduced, labels)
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            for thread in threads:
+                thread.join()
+        if self._errors:
+            name, error = self._errors[0]
+            logger.error(f"Pipeline stage {name} failed: {error}")
+            raise error
+        elapsed = time.perf_counter() - start
+
+        summary: Dict[str, Any] = {
+            "chunks": n_chunks,
+            "rows": n_rows,
+            "elapsed_s": elapsed,
+            "rows_per_s": n_rows / elapsed if elapsed > 0 else 0.0,
+            "stage_seconds": stage_seconds,
+            "bottleneck": max(stage_seconds, key=stage_seconds.get),
+            "cluster_counts": dict(sorted(cluster_counts.items(), key=lambda item: int(item[0]))),
+            "report_path": None,
+        }
+        if self.dashboard is not None:
+            report = {
+                "Cluster sizes": summary["cluster_counts"],
+                "Stage time (s)": {name: round(seconds, 6) for name, seconds in stage_seconds.items()},
+            }
+            summary["report_path"] = self.dashboard.create_dashboard(report, report_file) or None
+        logger.info(
+            f"Pipeline processed {n_rows} rows in {n_chunks} chunks ({summary['rows_per_s']:.1f} rows/s, "
+            f"bottleneck: {summary['bottleneck']})."
+        )
+        return summary
+
+    def _read_worker(self, data: Any, outbox: "queue.Queue", stage_seconds: Dict[str, float]):
+        """
+        Découpe la source en blocs ; le temps de lecture (disque, générateur amont) est compté à part.
+        """
+        try:
+            chunks = iter(DataPreprocessor.iter_chunks(data, self.chunk_size))
+            index = 0
+            while True:
+                start = time.perf_counter()
+                chunk = next(chunks, None)
+                elapsed = time.perf_counter() - start
+                if chunk is None:
+                    break
+                stage_seconds["read"] += elapsed
+                if not self._put(outbox, (index, chunk, {"read": elapsed})):
+                    return
+                index += 1
+        except Exception as e:
+            self._fail("read", e)
+            return
+        self._put(outbox, _DONE)
+
+    def _stage_worker(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        inbox: "queue.Queue",
+        outbox: "queue.Queue",
+        stage_seconds: Dict[str, float],
+    ):
+        """
+        Applique une étape à chaque bloc de `inbox` et transmet le résultat à `outbox`.
+        """
+        try:
+            while True:
+                item = self._get(inbox)
+                if item is _DONE:
+                    break
+                index, payload, timings = item
+                start = time.perf_counter()
+                with self.metrics.timer(f"pipeline.{name}"):
+                    result = func(payload)
+                timings[name] = time.perf_counter() - start
+                stage_seconds[name] += timings[name]
+                if not self._put(outbox, (index, result, timings)):
+                    return
+        except Exception as e:
+            self._fail(name, e)
+            return
+        self._put(outbox, _DONE)
+
+    def _fail(self, name: str, error: BaseException):
+        self._errors.append((name, error))
+        self._stop.set()
+
+    def _get(self, inbox: "queue.Queue") -> Any:
+        # Attente interrompue par l'arrêt du pipeline (erreur dans une autre étape).
+        while not self._stop.is_set():
+            try:
+                return inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _put(self, outbox: "queue.Queue", item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                outbox.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
@@ -12,4 +12,7 @@ setup(
     "scikit-learn",
     # …
   ],
+  extras_require={
+    "export": ["kaleido>=1.0"],     # export des figures en images (ImageRenderer) ; requiert Chrome (plotly_get_chrome)
+  },
 )
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+
+def make_linear_onnx_model(path, in_features: int = 4, out_features: int = 3, seed: int = 0):
+    """
+    Écrit un petit modèle ONNX linéaire (MatMul + Add) à axe batch dynamique.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Poids et biais du modèle.
+    """
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    rng = np.random.RandomState(seed)
+    weight = rng.randn(in_features, out_features).astype(np.float32)
+    bias = rng.randn(out_features).astype(np.float32)
+    graph = helper.make_graph(
+        [
+            helper.make_node("MatMul", ["input", "weight"], ["hidden"]),
+            helper.make_node("Add", ["hidden", "bias"], ["output"]),
+        ],
+        "linear",
+        [helper.make_tensor_value_info("input", TensorProto.FLOAT, ["batch", in_features])],
+        [helper.make_tensor_value_info("output", TensorProto.FLOAT, ["batch", out_features])],
+        initializer=[numpy_helper.from_array(weight, "weight"), numpy_helper.from_array(bias, "bias")],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    return weight, bias
+
+
+@pytest.fixture
+def linear_onnx_model(tmp_path):
+    # Modèle ONNX réel pour les tests qui exercent onnxruntime
+    path = tmp_path / "linear.onnx"
+    weight, bias = make_linear_onnx_model(path)
+    return str(path), weight, bias
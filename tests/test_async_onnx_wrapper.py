@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+import numpy as np
+import onnxruntime as ort
+import pytest
+
+from diamajax_utils.async_onnx_wrapper import AsyncONNXModelWrapper
+from diamajax_utils.onnx_wrapper import ONNXModelWrapper
+
+# Stub pour InferenceSession avec une latence configurable
+class DummyMeta:
+    def __init__(self, name, shape):
+        self.name = name
+        self.shape = shape
+
+class DummySession:
+    delay = 0.0
+
+    def __init__(self, model_path, sess_options=None, providers=None):
+        self._inputs = [DummyMeta("input", ["batch", 4])]
+        self._outputs = [DummyMeta("output", ["batch", 4])]
+    def get_inputs(self):
+        return self._inputs
+    def get_outputs(self):
+        return self._outputs
+    def run(self, output_names, input_feed):
+        time.sleep(DummySession.delay)
+        return [input_feed["input"] + 1]
+
+@pytest.fixture(autouse=True)
+def patch_onnx(monkeypatch):
+    monkeypatch.setattr(ort, "get_device", lambda: "CPU")
+    monkeypatch.setattr(ort, "InferenceSession", DummySession)
+    DummySession.delay = 0.0
+
+@pytest.fixture
+def wrapper(tmp_path):
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"")
+    return ONNXModelWrapper(str(model_path), device_preference="cpu", pool_size=2)
+
+@pytest.mark.asyncio
+async def test_apredict_and_apredict_many(wrapper):
+    async with AsyncONNXModelWrapper(wrapper, max_in_flight=2) as model:
+        out = await model.apredict({"input": np.zeros((1, 4), dtype=np.float32)})
+        assert np.array_equal(out[0], np.ones((1, 4)))
+
+        inputs = [{"input": np.full((1, 4), i, dtype=np.float32)} for i in range(6)]
+        results = await model.apredict_many(inputs)
+        assert [float(r[0][0, 0]) for r in results] == [i + 1 for i in range(6)]
+        assert model.in_flight == 0
+
+        with pytest.raises(ValueError):
+            await model.apredict({"bad": np.zeros((1, 4), dtype=np.float32)})
+
+@pytest.mark.asyncio
+async def test_timeout_and_backpressure(wrapper):
+    DummySession.delay = 0.2
+    async with AsyncONNXModelWrapper(wrapper, max_in_flight=1, max_pending=1) as model:
+        sample = {"input": np.zeros((1, 4), dtype=np.float32)}
+        first = asyncio.ensure_future(model.apredict(sample))
+        second = asyncio.ensure_future(model.apredict(sample))
+        await asyncio.sleep(0.05)
+        assert model.in_flight == 1
+        assert model.pending == 1
+
+        # file pleine : la requête suivante est rejetée
+        with pytest.raises(RuntimeError):
+            await model.apredict(sample)
+
+        await asyncio.gather(first, second)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await model.apredict(sample, timeout=0.01)
@@ -0,0 +1,126 @@
+import threading
+
+import numpy as np
+import onnxruntime as ort
+import pytest
+
+from diamajax_utils.batching_server import BatchingInferenceServer
+from diamajax_utils.onnx_wrapper import ONNXModelWrapper
+
+# Stub pour InferenceSession : sortie = entrée * 2, axe batch dynamique
+class DummyMeta:
+    def __init__(self, name, shape):
+        self.name = name
+        self.shape = shape
+
+class DummySession:
+    run_calls = 0
+
+    def __init__(self, model_path, sess_options=None, providers=None):
+        self._inputs = [DummyMeta("input", ["batch", 4])]
+        self._outputs = [DummyMeta("output", ["batch", 4])]
+    def get_inputs(self):
+        return self._inputs
+    def get_outputs(self):
+        return self._outputs
+    def run(self, output_names, input_feed):
+        DummySession.run_calls += 1
+        return [input_feed["input"] * 2]
+
+@pytest.fixture(autouse=True)
+def patch_onnx(monkeypatch):
+    monkeypatch.setattr(ort, "get_device", lambda: "CPU")
+    monkeypatch.setattr(ort, "InferenceSession", DummySession)
+    DummySession.run_calls = 0
+
+@pytest.fixture
+def wrapper(tmp_path):
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"")
+    return ONNXModelWrapper(str(model_path), device_preference="cpu")
+
+def test_requests_are_coalesced_and_scattered(wrapper):
+    samples = [np.full((1, 4), i, dtype=np.float32) for i in range(8)]
+    with BatchingInferenceServer(wrapper, max_batch_size=4, max_wait_ms=200) as server:
+        futures = [server.submit({"input": s}) for s in samples]
+        results = [f.result(timeout=5) for f in futures]
+
+    for sample, out in zip(samples, results):
+        assert out[0].shape == (1, 4)
+        assert np.array_equal(out[0], sample * 2)
+
+    stats = server.get_stats()
+    assert stats["requests"] == 8
+    assert stats["batches"] == DummySession.run_calls
+    assert stats["batches"] < 8
+    assert stats["avg_batch_size"] > 1
+    assert stats["latency_p99_ms"] >= stats["latency_p50_ms"] >= 0
+
+def test_concurrent_callers(wrapper):
+    results = {}
+
+    def call(i):
+        results[i] = server.predict({"input": np.full((1, 4), i, dtype=np.float32)}, timeout=5)
+
+    with BatchingInferenceServer(wrapper, max_batch_size=16, max_wait_ms=20) as server:
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert all(np.all(results[i][0] == 2 * i) for i in range(20))
+    assert server.get_stats()["rows"] == 20
+
+def test_submit_requires_running_server_and_valid_input(wrapper):
+    server = BatchingInferenceServer(wrapper)
+    with pytest.raises(RuntimeError):
+        server.submit({"input": np.zeros((1, 4), dtype=np.float32)})
+    with server:
+        with pytest.raises(ValueError):
+            server.submit({"bad": np.zeros((1, 4), dtype=np.float32)})
+
+def test_cancelled_requests_are_skipped(wrapper):
+    sample = np.ones((1, 4), dtype=np.float32)
+    with BatchingInferenceServer(wrapper, max_wait_ms=50) as server:
+        cancelled = server.submit({"input": sample})
+        assert cancelled.cancel()
+        assert np.array_equal(server.predict({"input": sample}, timeout=5)[0], sample * 2)
+        assert np.array_equal(server.predict({"input": sample}, timeout=5)[0], sample * 2)
+
+def test_stop_fails_requests_left_in_queue(wrapper):
+    server = BatchingInferenceServer(wrapper).start()
+    # Simule un arrêt du thread avant qu'il n'atteigne la dernière requête.
+    server._stop_event.set()
+    server._worker.join(5)
+    server._stop_event.clear()
+    future = server.submit({"input": np.ones((1, 4), dtype=np.float32)})
+    server.stop()
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+
+def test_stop_timeout_keeps_running_worker(wrapper):
+    server = BatchingInferenceServer(wrapper).start()
+    release = threading.Event()
+    run_batch = server._run_batch
+
+    def slow_run_batch(batch):
+        release.wait(5)
+        run_batch(batch)
+    server._run_batch = slow_run_batch
+    sample = np.ones((1, 4), dtype=np.float32)
+    future = server.submit({"input": sample})
+    while not future.running():
+        release.wait(0.01)
+
+    server.stop(timeout=0.05)
+    # le thread traite encore la requête : elle n'est pas mise en échec et aucun second thread ne démarre
+    assert server._worker is not None and server._worker.is_alive()
+    assert not future.done()
+    with pytest.raises(RuntimeError):
+        server.start()
+
+    release.set()
+    server.stop()
+    assert server._worker is None
+    assert np.array_equal(future.result(timeout=5)[0], sample * 2)
@@ -1,8 +1,10 @@
 import numpy as np
 import pytest
 import os
+import hdbscan
 
 from diamajax_utils.clustering_service import ClusteringService
+from diamajax_utils.inference_cache import InferenceCache
 
 @pytest.fixture
 def sample_embeddings():
@@ -63,3 +65,127 @@ def test_apply_clustering_other_algos(sample_embeddings, method, extra):
     labels = res["labels"]
     assert isinstance(labels, np.ndarray)
     assert labels.shape == (50,)
+
+def test_fit_transform_save_and_load(tmp_path, sample_embeddings):
+    svc = ClusteringService(n_neighbors=5, random_state=1, cache=InferenceCache())
+    with pytest.raises(ValueError):
+        svc.transform(sample_embeddings)
+
+    svc.fit(sample_embeddings)
+    new_points = np.random.RandomState(1).rand(10, 5)
+    projected = svc.transform(new_points)
+    assert projected.shape == (10, 2)
+
+    # deuxième appel servi par le cache
+    assert np.array_equal(svc.transform(new_points), projected)
+    assert svc.cache.get_stats()["hits"] == 1
+
+    path = str(tmp_path / "reducer.joblib")
+    svc.save(path)
+    loaded = ClusteringService.load(path)
+    assert loaded.is_fitted
+    assert loaded.transform(new_points).shape == (10, 2)
+
+@pytest.fixture
+def blobs():
+    # 3 groupes bien séparés en 2D
+    rng = np.random.RandomState(0)
+    centers = np.array([[0, 0], [10, 10], [-10, 10]])
+    return np.vstack([c + rng.randn(400, 2) * 0.3 for c in centers])
+
+@pytest.mark.parametrize("method,extra", [
+    ("minibatch_kmeans", {"n_clusters": 3, "batch_size": 256}),
+    ("dbscan", {"eps": 1.0, "min_samples": 5, "sample_size": 300, "chunk_size": 100}),
+    ("hdbscan", {"min_cluster_size": 20, "sample_size": 300, "chunk_size": 100}),
+])
+def test_scalable_clustering_modes(blobs, method, extra):
+    svc = ClusteringService()
+    res = svc.apply_clustering(blobs, method=method, n_jobs=2, **extra)
+    labels = res["labels"]
+    assert labels.shape == (1200,)
+    # chaque groupe reçoit un label majoritaire distinct
+    majority = [np.bincount(labels[i * 400:(i + 1) * 400][labels[i * 400:(i + 1) * 400] >= 0]).argmax() for i in range(3)]
+    assert len(set(majority)) == 3
+    if "sample_size" in extra:
+        assert res["sample_indices"].shape == (300,)
+
+def test_partial_fit_kmeans_over_chunks(blobs):
+    svc = ClusteringService()
+    shuffled = blobs[np.random.RandomState(1).permutation(len(blobs))]
+    model = svc.partial_fit_kmeans((shuffled[i:i + 200] for i in range(0, 1200, 200)), n_clusters=3)
+    labels = model.predict(blobs)
+    assert len(set(labels[:400])) == 1 and len(set(labels)) == 3
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_sweep_clustering_ranks_configurations(blobs, n_jobs):
+    svc = ClusteringService()
+    table = svc.sweep_clustering(
+        blobs,
+        {
+            "kmeans": {"n_clusters": [2, 3]},
+            "dbscan": {"eps": [0.005, 1.0], "min_samples": [5]},
+            "hdbscan": {"min_cluster_size": [20, 50]},
+        },
+        n_jobs=n_jobs,
+        score_sample_size=500,
+    )
+    assert len(table) == 6
+    assert [row["rank"] for row in table] == list(range(1, 7))
+    best = table[0]
+    assert best["n_clusters"] == 3
+    assert best["silhouette"] == max(row["silhouette"] for row in table if row["silhouette"] is not None)
+    # eps trop petit : tout est du bruit, non noté, classé en dernier
+    assert table[-1]["method"] == "dbscan" and table[-1]["silhouette"] is None
+
+def test_sweep_hdbscan_reuses_cached_tree(blobs, tmp_path):
+    svc = ClusteringService()
+    table = svc.sweep_clustering(
+        blobs, {"hdbscan": {"min_cluster_size": [20, 50, 80]}}, cache_dir=str(tmp_path), score_sample_size=300
+    )
+    assert {row["params"]["min_samples"] for row in table} == {20}
+    # un seul arbre calculé et mis en cache pour les trois configurations
+    outputs = [name for _, _, files in os.walk(tmp_path) for name in files if name == "output.pkl"]
+    assert len(outputs) == 1
+
+def test_best_hdbscan_sweep_row_reproduced_by_apply_clustering(blobs):
+    rng = np.random.RandomState(1)
+    noisy = np.vstack([blobs, rng.uniform(-15, 15, (300, 2))])
+    svc = ClusteringService()
+    table = svc.sweep_clustering(noisy, {"hdbscan": {"min_cluster_size": [20, 80]}}, score_sample_size=len(noisy))
+    for row in table:
+        assert row["params"]["min_samples"] == 20
+        labels = svc.apply_clustering(noisy, method="hdbscan", **row["params"])["labels"]
+        assert np.unique(labels[labels >= 0]).size == row["n_clusters"]
+        assert float((labels < 0).mean()) == pytest.approx(row["noise_ratio"])
+    best = table[0]
+    expected = hdbscan.HDBSCAN(**best["params"]).fit_predict(noisy)
+    np.testing.assert_array_equal(svc.apply_clustering(noisy, method="hdbscan", **best["params"])["labels"], expected)
+
+def test_visualize_clusters_headless_large(tmp_path, monkeypatch):
+    import plotly.graph_objects as go
+
+    def fail_show(*args, **kwargs):
+        raise AssertionError("show() must not be called in headless mode")
+    monkeypatch.setattr(go.Figure, "show", fail_show)
+
+    rng = np.random.RandomState(0)
+    points = rng.randn(20_000, 2)
+    labels = np.zeros(20_000, dtype=int)
+    labels[:10] = 1  # petit cluster conservé malgré le sous-échantillonnage
+
+    svc = ClusteringService()
+    out_path = tmp_path / "clusters.html"
+    fig = svc.visualize_clusters(
+        points, labels, headless=True, save_path=str(out_path), max_points=2000, webgl_threshold=1000
+    )
+
+    assert fig.data[0].type == "scattergl"
+    assert 2000 <= len(fig.data[0].x) <= 2002
+    assert 1 in set(fig.data[0].marker.color)
+    # plotly.js partagé, non intégré dans le HTML
+    assert (tmp_path / "plotly.min.js").exists()
+    assert out_path.stat().st_size < 1_000_000
+
+    density = svc.visualize_clusters(points, labels, headless=True, mode="density", density_bins=50)
+    assert density.data[0].type == "heatmap"
+    assert np.asarray(density.data[0].z).sum() == 20_000
@@ -38,3 +38,56 @@ def test_generate_sentiment_dashboard(tmp_out):
     content = open(output_path, encoding="utf-8").read()
     assert "sentiment distribution" in content.lower()
     assert "sentiment details" in content.lower()
+
+def test_generate_batch_shares_bundle_and_skips_unchanged(tmp_out, monkeypatch):
+    import plotly
+    import diamajax_utils.dashboard_generator as dashboard_module
+
+    rendered = []
+    render = dashboard_module._render_dashboard
+    monkeypatch.setattr(
+        dashboard_module, "_render_dashboard", lambda kind, data, path, bundle: rendered.append(path) or render(kind, data, path, bundle)
+    )
+    dashboards = {f"tenant{i}": {"Usage": {"a": i, "b": 2 * i}} for i in range(3)}
+    gen = DashboardGenerator(output_dir=tmp_out)
+
+    paths = gen.generate_batch(dashboards)
+    assert sorted(paths) == ["tenant0", "tenant1", "tenant2"]
+    assert len(rendered) == 3
+    bundle = f"plotly-{plotly.__version__}.min.js"
+    assert os.path.exists(os.path.join(tmp_out, bundle))
+    content = open(paths["tenant0"], encoding="utf-8").read()
+    # plotly.js n'est pas inclus dans chaque fichier
+    assert f'src="{bundle}"' in content
+    assert os.path.getsize(paths["tenant0"]) < 100_000
+
+    # seules les données modifiées sont régénérées
+    rendered.clear()
+    dashboards["tenant1"] = {"Usage": {"a": 100, "b": 0}}
+    assert gen.generate_batch(dashboards) == paths
+    assert rendered == [paths["tenant1"]]
+
+    rendered.clear()
+    gen.generate_batch(dashboards, force=True)
+    assert len(rendered) == 3
+
+def test_generate_batch_process_pool(tmp_out):
+    gen = DashboardGenerator(output_dir=tmp_out)
+    paths = gen.generate_batch(
+        {"day1": {"positive": 8, "negative": 2}, "day2": {"positive": 3, "negative": 5}}, kind="sentiment", n_jobs=2
+    )
+    for path in paths.values():
+        assert "sentiment distribution" in open(path, encoding="utf-8").read().lower()
+    with pytest.raises(ValueError):
+        gen.generate_batch({}, kind="unknown")
+
+def test_generate_batch_sanitizes_names(tmp_out):
+    gen = DashboardGenerator(output_dir=tmp_out)
+    paths = gen.generate_batch({"../escape": {"Usage": {"a": 1}}, "team a/b": {"Usage": {"a": 2}}})
+    assert paths == {
+        "../escape": os.path.join(tmp_out, "_escape.html"),
+        "team a/b": os.path.join(tmp_out, "team_a_b.html"),
+    }
+    assert all(os.path.exists(path) for path in paths.values())
+    with pytest.raises(ValueError):
+        gen.generate_batch({"a/b": {"Usage": {"a": 1}}, "a b": {"Usage": {"a": 1}}})
@@ -19,3 +19,73 @@ def test_preprocess_standardize_and_normalize():
     assert out.shape == (2, 2)
     assert np.allclose(out.min(axis=0), 0.0)
     assert np.allclose(out.max(axis=0), 1.0)
+
+def test_partial_fit_matches_full_statistics():
+    rng = np.random.RandomState(0)
+    data = rng.randn(1000, 3) * [1.0, 10.0, 0.1] + [5.0, -2.0, 100.0]
+    dp = DataPreprocessor()
+    for start in range(0, 1000, 128):
+        dp.partial_fit(data[start:start + 128])
+
+    assert dp.n_samples_ == 1000
+    assert np.allclose(dp.mean_, data.mean(axis=0))
+    assert np.allclose(dp.std_, data.std(axis=0))
+    assert np.allclose(dp.min_, data.min(axis=0))
+    assert np.allclose(dp.max_, data.max(axis=0))
+    # transform avec les statistiques ajustées == preprocess sur le jeu complet
+    assert np.allclose(dp.transform(data), DataPreprocessor().preprocess(data))
+
+def test_transform_requires_fit():
+    with pytest.raises(ValueError):
+        DataPreprocessor().transform([[1.0, 2.0]])
+
+def test_transform_stream_from_npy_and_persisted_stats(tmp_path):
+    rng = np.random.RandomState(1)
+    data = rng.rand(500, 4)
+    path = str(tmp_path / "features.npy")
+    np.save(path, data)
+
+    dp = DataPreprocessor(normalize=False, standardize=True).fit(path, chunk_size=64)
+    dp.save_stats(str(tmp_path / "stats.npz"))
+    restored = DataPreprocessor.load_stats(str(tmp_path / "stats.npz"))
+    assert restored.standardize and not restored.normalize
+
+    chunks = list(restored.transform_stream(path, chunk_size=100))
+    assert [c.shape[0] for c in chunks] == [100] * 5
+    expected = (data - data.mean(axis=0)) / data.std(axis=0)
+    assert np.allclose(np.vstack(chunks), expected)
+
+def test_preprocess_float32_in_place_and_constant_columns():
+    rng = np.random.RandomState(2)
+    data = rng.rand(200, 3).astype(np.float32)
+    data[:, 1] = 7.0  # colonne constante
+    expected = DataPreprocessor().preprocess(data.astype(np.float64))
+
+    dp = DataPreprocessor()
+    out = dp.preprocess(data, out=data)
+    assert out is data
+    assert out.dtype == np.float32
+    assert np.all(np.isfinite(out))
+    assert np.all(out[:, 1] == 0.0)
+    assert np.allclose(out, expected, atol=1e-6)
+
+    std_only = DataPreprocessor(normalize=False).preprocess(np.array([[1.0, 3.0], [1.0, 5.0]]))
+    assert np.array_equal(std_only, [[0.0, -1.0], [0.0, 1.0]])
+
+def test_parallel_chunked_matches_sequential():
+    rng = np.random.RandomState(3)
+    data = rng.randn(10_000, 6).astype(np.float32)
+    sequential = DataPreprocessor().preprocess(data)
+
+    dp = DataPreprocessor(n_jobs=4, chunk_size=1000)
+    out = np.empty_like(data)
+    parallel = dp.preprocess(data, out=out)
+    assert parallel is out
+    assert np.allclose(parallel, sequential, atol=1e-6)
+
+    dp.fit(data)
+    assert np.allclose(dp.mean_, data.astype(np.float64).mean(axis=0))
+    assert np.allclose(dp.std_, data.astype(np.float64).std(axis=0))
+
+    with pytest.raises(ValueError):
+        DataPreprocessor(n_jobs=0)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from diamajax_utils.clustering_service import ClusteringService
+from diamajax_utils.data_preprocessor import DataPreprocessor
+from diamajax_utils.embedding_store import EmbeddingStore
+from diamajax_utils.onnx_wrapper import ONNXModelWrapper
+from diamajax_utils.online_clustering import OnlineClusteringService
+
+def test_append_reopen_and_write_back_columns(linear_onnx_model, tmp_path):
+    path, weight, bias = linear_onnx_model
+    model = ONNXModelWrapper(path, device_preference="cpu")
+    store = EmbeddingStore.create(str(tmp_path / "store"), dim=3, dtype="float16", metadata={"model": "linear"})
+    rng = np.random.RandomState(0)
+    batches = [rng.rand(n, 4).astype(np.float32) for n in (5, 7)]
+    for batch in batches:
+        store.append(model.predict({"input": batch})[0])
+    assert store.append(np.ones((2, 3)), ids=[100, 101]).tolist() == [100, 101]
+    np.testing.assert_array_equal(store.append(np.zeros((1, 3))), [102])
+
+    for start, chunk in zip(range(0, 15, 4), store.iter_chunks(chunk_size=4)):
+        store.write_column("labels", np.full(len(chunk), start // 4), start=start)
+    store.write_column("reduced", np.zeros((15, 2), dtype=np.float32))
+    store.update_metadata(reducer="umap")
+
+    reopened = EmbeddingStore(str(tmp_path / "store"), readonly=True)
+    assert len(reopened) == 15 and reopened.vectors.dtype == np.float16
+    expected = np.concatenate([batch @ weight + bias for batch in batches])
+    np.testing.assert_allclose(reopened.vectors[:12], expected, rtol=1e-2, atol=1e-2)
+    assert reopened.ids.tolist() == list(range(12)) + [100, 101, 102]
+    assert reopened.column("labels").tolist() == [0] * 4 + [1] * 4 + [2] * 4 + [3] * 3
+    assert reopened.columns == ["labels", "reduced"] and reopened.column("reduced").shape == (15, 2)
+    assert reopened.metadata == {"model": "linear", "reducer": "umap"}
+    with pytest.raises(ValueError):
+        reopened.append(np.zeros((1, 3)))
+    with pytest.raises(ValueError):
+        store.append(np.zeros((1, 4)))
+    with pytest.raises(ValueError):
+        store.write_column("labels", np.zeros(2), start=14)
+
+def test_readonly_store_never_writes(tmp_path):
+    store = EmbeddingStore.create(str(tmp_path / "store"), dim=2)
+    store.append(np.ones((3, 2)))
+    store.write_column("labels", np.arange(3))
+    store.append(np.ones((4, 2)))
+    column_file = tmp_path / "store" / "column.labels.bin"
+    size = column_file.stat().st_size
+
+    reader = EmbeddingStore(str(tmp_path / "store"), readonly=True)
+    assert reader.column("labels").tolist() == [0, 1, 2, 0, 0, 0, 0]
+    assert column_file.stat().st_size == size
+
+    assert np.shares_memory(np.asarray(store, dtype=np.float32), store.vectors)
+    with pytest.raises(ValueError):
+        store.__array__(dtype=np.float64, copy=False)
+
+def test_services_read_store_without_copy(tmp_path):
+    store = EmbeddingStore.create(str(tmp_path / "store"), dim=3)
+    store.append(np.random.RandomState(0).rand(200, 3))
+    vectors = store.vectors
+
+    assert np.shares_memory(ClusteringService()._validate_and_convert_embeddings(store), vectors)
+    assert np.shares_memory(DataPreprocessor()._validate_and_convert(store), vectors)
+    preprocessed = DataPreprocessor().fit(store).transform(store)
+    assert preprocessed.shape == (200, 3)
+    assert sum(len(chunk) for chunk in DataPreprocessor.iter_chunks(store, chunk_size=64)) == 200
+
+    online = OnlineClusteringService(n_clusters=2, window_size=100)
+    assert online.partial_fit(store)["labels"].shape == (200,)
@@ -0,0 +1,102 @@
+import os
+import sys
+import types
+
+import plotly.io as pio
+import pytest
+
+from diamajax_utils.dashboard_generator import DashboardGenerator
+from diamajax_utils import image_renderer
+from diamajax_utils.image_renderer import ImageRenderer
+
+# Stub pour kaleido (non requis par les tests) : enregistre le cycle de vie du serveur et les lots rendus
+@pytest.fixture
+def fake_kaleido(monkeypatch):
+    calls = []
+    kaleido = types.ModuleType("kaleido")
+    kaleido.start_sync_server = lambda **kw: calls.append(("start", kw))
+    kaleido.stop_sync_server = lambda **kw: calls.append(("stop", kw))
+    monkeypatch.setitem(sys.modules, "kaleido", kaleido)
+    monkeypatch.setattr(image_renderer, "_find_chrome", lambda: "/usr/bin/chrome")
+
+    def write_images(figs, files, format=None, **kw):
+        calls.append(("write", len(figs), format))
+        for path in files:
+            with open(path, "wb") as image_file:
+                image_file.write(b"\x89PNG")
+
+    monkeypatch.setattr(pio, "write_images", write_images)
+    monkeypatch.setattr(pio, "to_image", lambda fig, format=None, **kw: b"\x89PNG")
+    return calls
+
+def test_renderer_reuses_server_across_batches(tmp_path, fake_kaleido):
+    gen = DashboardGenerator(output_dir=str(tmp_path))
+    figures = {f"tenant{i}": gen.build_dashboard_figure({"Usage": {"a": i}}) for i in range(3)}
+
+    paths = gen.export_images(figures, n_workers=2)
+    assert sorted(paths) == ["tenant0", "tenant1", "tenant2"]
+    assert all(os.path.exists(path) and path.endswith(".png") for path in paths.values())
+    gen.export_images({"extra": figures["tenant0"]})
+    gen.close()
+
+    # un seul démarrage, un appel au moteur par lot
+    assert fake_kaleido == [
+        ("start", {"n": 2, "silence_warnings": True}),
+        ("write", 3, "png"),
+        ("write", 1, "png"),
+        ("stop", {"silence_warnings": True}),
+    ]
+
+def test_renderer_validation_and_missing_kaleido(monkeypatch, fake_kaleido):
+    with ImageRenderer() as renderer:
+        assert renderer.is_running
+        assert renderer.to_image(DashboardGenerator.build_sentiment_figure({"positive": 1})) == b"\x89PNG"
+        with pytest.raises(ValueError):
+            renderer.export([], ["a.png"])
+    assert not renderer.is_running
+
+    with pytest.raises(ValueError):
+        ImageRenderer(format="gif")
+
+    monkeypatch.setitem(sys.modules, "kaleido", None)
+    with pytest.raises(ImportError):
+        ImageRenderer().start()
+
+def test_renderer_fails_fast_without_chrome(monkeypatch, fake_kaleido):
+    monkeypatch.setattr(image_renderer, "_find_chrome", lambda: None)
+    with pytest.raises(RuntimeError, match="get_chrome"):
+        ImageRenderer().start()
+    assert fake_kaleido == []
+
+def test_renderer_export_times_out(tmp_path, monkeypatch, fake_kaleido):
+    import time
+
+    monkeypatch.setattr(pio, "write_images", lambda *args, **kwargs: time.sleep(5))
+    renderer = ImageRenderer(timeout=0.1)
+    fig = DashboardGenerator.build_sentiment_figure({"positive": 1})
+    with pytest.raises(TimeoutError):
+        renderer.export([fig], [str(tmp_path / "a.png")])
+    renderer.stop()
+
+def test_export_images_sanitizes_names(tmp_path, fake_kaleido):
+    gen = DashboardGenerator(output_dir=str(tmp_path))
+    fig = gen.build_dashboard_figure({"Usage": {"a": 1}})
+    paths = gen.export_images({"../x": fig, "team a/b": fig})
+    assert paths == {"../x": str(tmp_path / "_x.png"), "team a/b": str(tmp_path / "team_a_b.png")}
+    with pytest.raises(ValueError):
+        gen.export_images({"a/b": fig, "a b": fig})
+    with pytest.raises(ValueError):
+        gen.export_images({"a": fig}, format="gif")
+    gen.close()
+
+def test_renderer_with_real_kaleido(tmp_path):
+    pytest.importorskip("kaleido")
+    # kaleido>=1.0 pilote un Chrome installé (ou téléchargé par plotly_get_chrome)
+    if image_renderer._find_chrome() is None:
+        pytest.skip("kaleido requires Chrome; run plotly_get_chrome")
+    fig = DashboardGenerator.build_dashboard_figure({"Usage": {"a": 1, "b": 2}})
+    with ImageRenderer(n_workers=1) as renderer:
+        assert renderer.to_image(fig, format="png").startswith(b"\x89PNG")
+        path = str(tmp_path / "usage.svg")
+        renderer.export([fig], [path], format="svg")
+    assert "<svg" in open(path, encoding="utf-8").read()
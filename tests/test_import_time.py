@@ -0,0 +1,40 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+import diamajax_utils
+
+# Budget d'import (secondes) des modules légers ; avant les imports paresseux, clustering_service
+# seul en coûtait plusieurs.
+IMPORT_BUDGET_S = 2.0
+HEAVY_MODULES = ["umap", "numba", "hdbscan", "sklearn", "matplotlib", "plotly", "selenium", "PIL"]
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import diamajax_utils
+from diamajax_utils import ONNXModelWrapper, DataPreprocessor
+import diamajax_utils.clustering_service
+import diamajax_utils.dashboard_generator
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def test_import_stays_light_and_within_budget():
+    output = subprocess.run([sys.executable, "-c", SCRIPT], capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.splitlines()[-1])
+    loaded = {name.split(".")[0] for name in result["modules"]}
+    assert loaded.isdisjoint(HEAVY_MODULES), sorted(loaded & set(HEAVY_MODULES))
+    assert result["elapsed"] < IMPORT_BUDGET_S
+
+
+def test_lazy_exports():
+    from diamajax_utils.onnx_wrapper import ONNXModelWrapper
+
+    assert diamajax_utils.ONNXModelWrapper is ONNXModelWrapper
+    assert "ClusteringService" in dir(diamajax_utils)
+    with pytest.raises(AttributeError):
+        diamajax_utils.DoesNotExist
@@ -0,0 +1,72 @@
+import time
+
+import numpy as np
+import pytest
+
+from diamajax_utils.inference_cache import InferenceCache, hash_inputs
+
+def test_hash_inputs_depends_on_content_shape_and_dtype():
+    a = np.arange(6, dtype=np.float32)
+    key = hash_inputs({"input": a})
+    assert key == hash_inputs({"input": a.copy()})
+    assert key != hash_inputs({"input": a.reshape(2, 3)})
+    assert key != hash_inputs({"input": a.astype(np.float64)})
+    assert key != hash_inputs({"other": a})
+    # tableaux non contigus acceptés
+    assert hash_inputs({"input": a[::2]}) == hash_inputs({"input": a[::2].copy()})
+
+def test_lru_eviction_by_bytes():
+    cache = InferenceCache(max_bytes=3 * 400)
+    for i in range(3):
+        cache.put(f"k{i}", [np.zeros(100, dtype=np.float32)])  # 400 octets
+    assert cache.get("k0") is not None  # k0 devient le plus récent
+    cache.put("k3", [np.zeros(100, dtype=np.float32)])
+
+    assert cache.get("k1") is None
+    assert cache.get("k0") is not None
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 3
+    assert stats["bytes"] == 1200
+    assert stats["hits"] == 2 and stats["misses"] == 1
+
+def test_cached_outputs_are_read_only():
+    cache = InferenceCache()
+    source = np.ones(4)
+    cache.put("k", [source])
+    source[:] = 0
+    out = cache.get("k")[0]
+    assert np.all(out == 1)
+    with pytest.raises(ValueError):
+        out[0] = 5
+
+def test_ttl_expiration():
+    cache = InferenceCache(ttl=0.05)
+    cache.put("k", [np.ones(2)])
+    assert cache.get("k") is not None
+    time.sleep(0.1)
+    assert cache.get("k") is None
+    assert cache.get_stats()["expirations"] == 1
+
+def test_disk_tier_survives_restart(tmp_path):
+    cache = InferenceCache(disk_dir=str(tmp_path / "cache"))
+    cache.put("abcdef", [np.arange(5.0), np.array([[1, 2]])])
+
+    restarted = InferenceCache(disk_dir=str(tmp_path / "cache"))
+    out = restarted.get("abcdef")
+    assert isinstance(out[0], np.memmap)
+    assert np.array_equal(out[0], np.arange(5.0))
+    assert np.array_equal(out[1], [[1, 2]])
+    assert restarted.get_stats()["disk_hits"] == 1
+
+def test_disk_tier_is_bounded(tmp_path):
+    cache = InferenceCache(disk_dir=str(tmp_path / "cache"), max_disk_bytes=3000)
+    for i in range(5):
+        cache.put(f"key{i}", [np.full(128, i, dtype=np.float64)])
+    stats = cache.get_stats()
+    assert stats["disk_bytes"] <= 3000 and stats["disk_entries"] < 5
+
+    restarted = InferenceCache(disk_dir=str(tmp_path / "cache"), max_disk_bytes=3000)
+    assert restarted.get_stats()["disk_entries"] == stats["disk_entries"]
+    assert restarted.get("key0") is None
+    assert restarted.get("key4")[0][0] == 4
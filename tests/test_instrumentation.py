@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from diamajax_utils.data_preprocessor import DataPreprocessor
+from diamajax_utils.instrumentation import (
+    InMemoryExporter,
+    Metrics,
+    OpenTelemetryExporter,
+    PrometheusFileExporter,
+    get_metrics,
+)
+from diamajax_utils.onnx_wrapper import ONNXModelWrapper
+
+def test_timers_histograms_and_counters():
+    metrics = Metrics(window=100)
+    for value in range(1, 101):
+        metrics.observe("latency", value)
+    with metrics.timer("stage"):
+        pass
+    with pytest.raises(RuntimeError):
+        with metrics.timer("stage"):
+            raise RuntimeError("boom")
+    metrics.increment("calls")
+    metrics.increment("bytes", 512)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"] == {"calls": 1, "bytes": 512, "stage.errors": 1}
+    latency = snapshot["histograms"]["latency"]
+    assert latency["count"] == 100 and latency["max"] == 100
+    assert latency["p50"] == pytest.approx(50.5) and latency["p99"] == pytest.approx(99.01)
+    assert snapshot["histograms"]["stage"]["count"] == 2
+    assert metrics.get_stats()["latency.p95"] == pytest.approx(95.05)
+
+def test_disabled_mode_records_nothing():
+    metrics = Metrics(enabled=False)
+    assert metrics.timer("a") is metrics.timer("b")
+    with metrics.timer("a"):
+        metrics.increment("calls")
+        metrics.observe("latency", 1.0)
+    assert metrics.snapshot()["counters"] == {} and metrics.snapshot()["histograms"] == {}
+
+def test_exporters(tmp_path):
+    metrics = Metrics(exporter=InMemoryExporter())
+    metrics.increment("onnx.calls", 3)
+    metrics.observe("onnx.run", 0.5)
+    metrics.export()
+    assert metrics.exporter.latest["counters"] == {"onnx.calls": 3}
+
+    path = tmp_path / "diamajax.prom"
+    PrometheusFileExporter(str(path)).export(metrics.snapshot())
+    text = path.read_text()
+    assert "diamajax_onnx_calls_total 3" in text
+    assert 'diamajax_onnx_run{quantile="0.99"} 0.5' in text
+    assert "diamajax_onnx_run_count 1" in text
+
+    # Stub de Meter OpenTelemetry : les compteurs ne reçoivent que les incréments
+    recorded = []
+    class Instrument:
+        def __init__(self, name):
+            self.name = name
+        def add(self, value):
+            recorded.append(("add", self.name, value))
+        def set(self, value):
+            recorded.append(("set", self.name, value))
+    class Meter:
+        create_counter = create_gauge = staticmethod(Instrument)
+
+    exporter = OpenTelemetryExporter(meter=Meter())
+    exporter.export(metrics.snapshot())
+    metrics.increment("onnx.calls", 2)
+    exporter.export(metrics.snapshot())
+    adds = [(name, value) for kind, name, value in recorded if kind == "add"]
+    assert adds == [("diamajax.onnx.calls", 3), ("diamajax.onnx.run.count", 1), ("diamajax.onnx.calls", 2)]
+    assert ("set", "diamajax.onnx.run.p50", 0.5) in recorded
+
+def test_services_record_stages(linear_onnx_model):
+    path, weight, bias = linear_onnx_model
+    assert ONNXModelWrapper(path, device_preference="cpu").metrics is get_metrics()
+
+    metrics = Metrics()
+    model = ONNXModelWrapper(path, device_preference="cpu", metrics=metrics)
+    x = np.ones((2, 4), dtype=np.float32)
+    model.predict({"input": x})
+    model.predict({"input": x})
+    with pytest.raises(ValueError):
+        model.predict({"input": np.ones((2, 5), dtype=np.float32)})
+
+    DataPreprocessor(metrics=metrics).preprocess(np.random.rand(10, 3))
+
+    stats = metrics.get_stats()
+    assert stats["onnx.calls"] == 3 and stats["onnx.errors"] == 1
+    assert stats["onnx.input_bytes"] == 2 * x.nbytes
+    assert stats["onnx.run.count"] == 2 and stats["onnx.validate.count"] == 3
+    assert stats["preprocess.rows"] == 10 and stats["preprocess.transform.count"] == 1
@@ -0,0 +1,63 @@
+import http.client
+import json
+import time
+import urllib.request
+from urllib.parse import urlparse
+
+import numpy as np
+import pytest
+
+from diamajax_utils.live_dashboard import LiveDashboard
+
+def read_event(response):
+    while True:
+        line = response.fp.readline().decode("utf-8").strip()
+        if line.startswith("data: "):
+            return json.loads(line[len("data: "):])
+
+def test_ring_buffer_keeps_memory_bounded():
+    dashboard = LiveDashboard(history=5)
+    dashboard.append("latency_ms", np.arange(8.0))
+    dashboard.append("latency_ms", 42.0)
+    dashboard.update_counts("clusters", {"0": 3, "1": 1})
+    dashboard.update_counts("clusters", {"1": 2}, increment=True)
+
+    series = {s["name"]: s for s in dashboard.snapshot()["series"]}
+    assert series["latency_ms"]["x"] == [4, 5, 6, 7, 8]
+    assert series["latency_ms"]["y"] == [4.0, 5.0, 6.0, 7.0, 42.0]
+    assert series["clusters"]["y"] == [3.0, 3.0]
+    with pytest.raises(ValueError):
+        dashboard.update_counts("latency_ms", {"a": 1})
+
+def test_streams_snapshot_then_deltas():
+    with LiveDashboard() as dashboard:
+        dashboard.append("throughput", [1.0, 2.0])
+        page = urllib.request.urlopen(dashboard.url, timeout=5).read().decode("utf-8")
+        assert "extendTraces" in page
+
+        url = urlparse(dashboard.url)
+        conn = http.client.HTTPConnection(url.hostname, url.port, timeout=5)
+        conn.request("GET", "/events")
+        response = conn.getresponse()
+        assert response.getheader("Content-Type") == "text/event-stream"
+
+        snapshot = read_event(response)
+        assert snapshot["type"] == "snapshot"
+        assert snapshot["series"][0]["y"] == [1.0, 2.0]
+
+        # seul l'incrément est envoyé
+        dashboard.append("throughput", 3.0)
+        assert read_event(response) == {
+            "type": "extend", "name": "throughput", "x": [2], "y": [3.0], "max_points": 10000
+        }
+        conn.close()
+
+def test_watch_polls_metrics_source():
+    stats = {"requests": 0, "avg_batch_size": 1.5, "name": "ignored"}
+    with LiveDashboard() as dashboard:
+        dashboard.watch(lambda: stats, interval_s=0.01, prefix="server.")
+        deadline = time.time() + 5
+        while len(dashboard.snapshot()["series"]) < 2 and time.time() < deadline:
+            time.sleep(0.01)
+    names = [s["name"] for s in dashboard.snapshot()["series"]]
+    assert names == ["server.requests", "server.avg_batch_size"]
@@ -0,0 +1,46 @@
+import json
+
+import numpy as np
+import pytest
+
+from diamajax_utils.model_optimizer import ModelOptimizer
+from diamajax_utils.onnx_wrapper import ONNXModelWrapper
+
+def make_samples(n=8, seed=0):
+    rng = np.random.default_rng(seed)
+    return ({"input": rng.standard_normal((4, 4), dtype=np.float32)} for _ in range(n))
+
+def test_builds_validates_and_selects_fastest_variant(linear_onnx_model, tmp_path):
+    path, weight, bias = linear_onnx_model
+    optimizer = ModelOptimizer(path, output_dir=str(tmp_path / "variants"), rtol=0.1, atol=0.1, repeat=3)
+    report = optimizer.optimize(make_samples())
+
+    candidates = {row["variant"]: row for row in report["candidates"]}
+    assert set(candidates) == {"original", "dynamic_int8", "static_int8", "float16"}
+    assert candidates["original"]["passed"] and candidates["original"]["max_abs_error"] == 0.0
+    assert candidates["float16"]["passed"]
+    passing = [row for row in report["candidates"] if row["passed"]]
+    assert report["selected"] == min(passing, key=lambda row: row["latency_p50_ms"])["variant"]
+    with open(optimizer.report_path, encoding="utf-8") as report_file:
+        assert json.load(report_file)["selected_path"] == report["selected_path"]
+
+    # Rapport réutilisé tant que le modèle et les réglages ne changent pas.
+    assert optimizer.optimize(iter([])) == report
+    with pytest.raises(ValueError):
+        optimizer.optimize(make_samples(), variants=("int4",))
+
+def test_strict_tolerance_falls_back_to_original(linear_onnx_model, tmp_path):
+    path, weight, bias = linear_onnx_model
+    model = ONNXModelWrapper.from_best_variant(
+        path,
+        make_samples(),
+        optimizer_options={"output_dir": str(tmp_path), "rtol": 0.0, "atol": 1e-9, "repeat": 1},
+        variants=("dynamic_int8",),
+        device_preference="cpu",
+    )
+    assert model.variant_report["selected"] == "original" and model.model_path == path
+    dynamic = model.variant_report["candidates"][1]
+    assert dynamic["variant"] == "dynamic_int8" and not dynamic["passed"]
+
+    x = np.ones((2, 4), dtype=np.float32)
+    np.testing.assert_allclose(model.predict({"input": x})[0], x @ weight + bias, rtol=1e-5)
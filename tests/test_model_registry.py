@@ -0,0 +1,130 @@
+import numpy as np
+import onnxruntime as ort
+import pytest
+
+from diamajax_utils.model_registry import ModelRegistry
+
+# Stub pour InferenceSession : la sortie identifie le fichier chargé
+class DummyMeta:
+    def __init__(self, name, shape, type="tensor(float)"):
+        self.name = name
+        self.shape = shape
+        self.type = type
+
+class DummySession:
+    runs = []
+
+    def __init__(self, model_path, sess_options=None, providers=None):
+        self.model_path = model_path
+        self._inputs = [DummyMeta("input", ["batch", 4])]
+        self._outputs = [DummyMeta("output", ["batch", 1])]
+    def get_inputs(self):
+        return self._inputs
+    def get_outputs(self):
+        return self._outputs
+    def run(self, output_names, input_feed):
+        DummySession.runs.append((self.model_path, input_feed["input"].shape))
+        return [np.full((input_feed["input"].shape[0], 1), len(self.model_path), dtype=np.float32)]
+
+@pytest.fixture(autouse=True)
+def patch_onnx(monkeypatch):
+    monkeypatch.setattr(ort, "get_device", lambda: "CPU")
+    monkeypatch.setattr(ort, "InferenceSession", DummySession)
+    DummySession.runs = []
+
+def make_model(tmp_path, name, size=100):
+    path = tmp_path / name
+    path.write_bytes(b"\0" * size)
+    return str(path)
+
+def test_load_on_demand_with_warmup(tmp_path):
+    registry = ModelRegistry(device_preference="cpu")
+    path = make_model(tmp_path, "a.onnx")
+    registry.register("a", path)
+    assert registry.get_stats()["loaded"] == []
+
+    out = registry.predict("a", {"input": np.ones((2, 4), dtype=np.float32)})
+    assert out[0].shape == (2, 1)
+    # warmup avec entrées synthétiques (batch 1) puis la vraie requête
+    assert DummySession.runs == [(path, (1, 4)), (path, (2, 4))]
+    assert registry.get_stats()["loaded"] == ["a:1"]
+
+def test_lru_eviction_under_memory_budget(tmp_path):
+    registry = ModelRegistry(memory_budget_bytes=250, memory_factor=1.0, warmup=False, device_preference="cpu")
+    for name in ("a", "b", "c"):
+        registry.register(name, make_model(tmp_path, f"{name}.onnx"))
+
+    registry.get("a")
+    registry.get("b")
+    registry.get("a")  # b devient le moins récemment utilisé
+    registry.get("c")
+
+    stats = registry.get_stats()
+    assert stats["loaded"] == ["a:1", "c:1"]
+    assert stats["loaded_bytes"] == 200
+    assert stats["evictions"] == 1
+
+    # un modèle réservé n'est pas évincé
+    with registry.acquire("a"):
+        registry.get("b")
+        registry.get("c")
+        assert "a:1" in registry.get_stats()["loaded"]
+
+def test_evicted_wrapper_closed_outside_registry_lock(tmp_path, monkeypatch):
+    import threading
+    from diamajax_utils.onnx_wrapper import ONNXModelWrapper
+
+    registry = ModelRegistry(memory_budget_bytes=150, memory_factor=1.0, warmup=False, device_preference="cpu")
+    for name in ("a", "b"):
+        registry.register(name, make_model(tmp_path, f"{name}.onnx"))
+    closed = []
+
+    def close(wrapper):
+        # un autre thread doit pouvoir utiliser le registre pendant la fermeture
+        probe = threading.Thread(target=registry.get_stats)
+        probe.start()
+        probe.join(timeout=5)
+        closed.append(not probe.is_alive())
+    monkeypatch.setattr(ONNXModelWrapper, "close", close)
+
+    registry.get("a")
+    registry.get("b")
+    assert closed == [True]
+    assert registry.get_stats()["loaded"] == ["b:1"]
+
+def test_unregister_during_load_discards_new_wrapper(tmp_path, monkeypatch):
+    from diamajax_utils.onnx_wrapper import ONNXModelWrapper
+
+    registry = ModelRegistry(memory_budget_bytes=150, memory_factor=1.0, device_preference="cpu")
+    registry.register("a", make_model(tmp_path, "a.onnx"))
+    registry.register("b", make_model(tmp_path, "b.onnx"), version="1", activate=False)
+    closed = []
+    with monkeypatch.context() as patch:
+        # la version est retirée pendant son chargement (préchauffage hors du verrou global)
+        patch.setattr(ONNXModelWrapper, "warmup", lambda wrapper: registry.unregister("b", "1"))
+        patch.setattr(ONNXModelWrapper, "close", lambda wrapper: closed.append(wrapper.model_path))
+        with pytest.raises(KeyError):
+            registry.get("b", "1")
+    assert closed == [str(tmp_path / "b.onnx")]
+    assert registry.get_stats()["loaded"] == [] and registry.get_stats()["loaded_bytes"] == 0
+    assert registry.predict("a", {"input": np.ones((1, 4), dtype=np.float32)})[0].shape == (1, 1)
+
+def test_hot_swap_keeps_in_flight_calls_on_old_version(tmp_path):
+    registry = ModelRegistry(warmup=False, device_preference="cpu")
+    registry.register("model", make_model(tmp_path, "v1.onnx"), version="1")
+
+    with registry.acquire("model") as old:
+        registry.register("model", make_model(tmp_path, "model-v2.onnx"), version="2")
+        assert registry.get_stats()["active"] == {"model": "2"}
+        # l'appel en cours s'exécute toujours sur l'ancienne version
+        assert old.model_path.endswith("v1.onnx")
+        old.predict({"input": np.ones((1, 4), dtype=np.float32)})
+
+    assert registry.get("model").model_path.endswith("model-v2.onnx")
+    assert registry.get("model", version="1").model_path.endswith("v1.onnx")
+
+    with pytest.raises(ValueError):
+        registry.unregister("model", "2")
+    registry.unregister("model", "1")
+    with pytest.raises(KeyError):
+        registry.get("model", version="1")
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from diamajax_utils.online_clustering import OnlineClusteringService
+
+def make_batch(rng, centers, n=150):
+    return np.vstack([c + rng.randn(n, 2) * 0.3 for c in centers])
+
+def test_stable_stream_updates_incrementally():
+    rng = np.random.RandomState(0)
+    centers = np.array([[0, 0], [8, 8], [-8, 8]])
+    svc = OnlineClusteringService(n_clusters=3, drift_threshold=0.5, window_size=2000)
+
+    first = svc.partial_fit(make_batch(rng, centers))
+    assert first["refitted"]
+    for _ in range(5):
+        res = svc.partial_fit(make_batch(rng, centers))
+        assert not res["refitted"]
+        assert res["drift"] < 0.5
+        assert len(set(res["labels"])) == 3
+
+    stats = svc.get_stats()
+    assert stats["batches"] == 6 and stats["points"] == 6 * 450
+    assert stats["refits"] == 1
+    assert stats["window_rows"] <= 2000 + 450
+
+def test_window_keeps_copies_of_reused_buffers():
+    rng = np.random.RandomState(2)
+    svc = OnlineClusteringService(n_clusters=2, drift_threshold=10.0, window_size=10_000)
+    buffer = np.empty((100, 2))
+    batches = []
+    for i in range(4):
+        buffer[:] = rng.randn(100, 2) + i
+        batches.append(buffer.copy())
+        svc.partial_fit(buffer)
+    assert len(svc._window) == 4
+    for stored, batch in zip(svc._window, batches):
+        np.testing.assert_array_equal(stored, batch)
+
+def test_drift_triggers_refit():
+    rng = np.random.RandomState(1)
+    svc = OnlineClusteringService(n_clusters=2, drift_threshold=0.5, window_size=300)
+    svc.partial_fit(make_batch(rng, np.array([[0, 0], [5, 0]])))
+
+    shifted = np.array([[30, 30], [40, 30]])
+    results = [svc.partial_fit(make_batch(rng, shifted)) for _ in range(3)]
+    assert results[0]["refitted"]
+    assert results[0]["drift"] > 0.5
+    # après réajustement sur la fenêtre récente, les nouveaux groupes sont séparés
+    labels = svc.predict(make_batch(rng, shifted, n=50))
+    assert set(labels[:50]) != set(labels[50:])
+
+def test_predict_before_initialization_and_validation():
+    svc = OnlineClusteringService(n_clusters=3)
+    with pytest.raises(ValueError):
+        svc.predict([[0.0, 1.0]])
+    res = svc.partial_fit([[0.0, 1.0]])
+    assert not res["refitted"] and list(res["labels"]) == [-1]
+    with pytest.raises(ValueError):
+        svc.partial_fit([1.0, 2.0])
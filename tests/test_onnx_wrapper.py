@@ -2,8 +2,11 @@ import pytest
 import numpy as np
 import onnxruntime as ort
 
+from diamajax_utils.inference_cache import InferenceCache
 from diamajax_utils.onnx_wrapper import ONNXModelWrapper
 
+REAL_INFERENCE_SESSION = ort.InferenceSession
+
 # Stub pour InferenceSession
 class DummyMeta:
     def __init__(self, name, shape):
@@ -11,7 +14,7 @@ class DummyMeta:
         self.shape = shape
 
 class DummySession:
-    def __init__(self, model_path, providers):
+    def __init__(self, model_path, sess_options=None, providers=None):
         self._inputs = [DummyMeta("input", [1, 3, 224, 224])]
         self._outputs = [DummyMeta("output", [1, 1000])]
     def get_inputs(self):
@@ -53,3 +56,157 @@ def test_predict_and_warmup(tmp_path):
 
     # warmup doit juste appeler predict sans erreur
     wrapper.warmup({"input": inp})
+
+def test_pooled_predict_many(tmp_path):
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"")
+    wrapper = ONNXModelWrapper(
+        str(model_path), device_preference="cpu", pool_size=3, inter_op_num_threads=1, execution_mode="parallel"
+    )
+
+    assert len(wrapper._sessions) == 3
+    assert wrapper.session_options.inter_op_num_threads == 1
+    assert wrapper.session_options.intra_op_num_threads >= 1
+
+    inputs = [{"input": np.zeros((1, 3, 224, 224), dtype=np.float32)} for _ in range(10)]
+    outputs = wrapper.predict_many(inputs)
+    wrapper.close()
+    assert len(outputs) == 10
+    assert all(out[0].shape == (1, 1000) for out in outputs)
+    # toutes les sessions sont rendues au pool
+    assert wrapper._available_sessions.qsize() == 3
+
+def test_predict_many_creates_one_executor_under_concurrency(tmp_path, monkeypatch):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    import diamajax_utils.onnx_wrapper as wrapper_module
+
+    created = []
+
+    class SlowExecutor(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            time.sleep(0.05)  # élargit la fenêtre de course
+            created.append(self)
+            super().__init__(*args, **kwargs)
+    monkeypatch.setattr(wrapper_module, "ThreadPoolExecutor", SlowExecutor)
+
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"")
+    wrapper = ONNXModelWrapper(str(model_path), device_preference="cpu", pool_size=2)
+    inputs = [{"input": np.zeros((1, 3, 224, 224), dtype=np.float32)} for _ in range(2)]
+    barrier = threading.Barrier(4)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(len(wrapper.predict_many(inputs)))
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wrapper.close()
+    assert results == [2, 2, 2, 2]
+    assert len(created) == 1
+
+def test_invalid_pool_configuration(tmp_path):
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        ONNXModelWrapper(str(model_path), pool_size=0)
+    with pytest.raises(ValueError):
+        ONNXModelWrapper(str(model_path), execution_mode="turbo")
+
+def test_validate_input_checks_static_dims(tmp_path):
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"")
+    wrapper = ONNXModelWrapper(str(model_path), device_preference="cpu")
+    assert not wrapper.validate_input({"input": np.zeros((1, 3, 112, 112), dtype=np.float32)})
+
+def test_predict_bound_reuses_buffers(monkeypatch, linear_onnx_model):
+    # session ONNX Runtime réelle : IOBinding n'est pas simulé par le stub
+    monkeypatch.setattr(ort, "InferenceSession", REAL_INFERENCE_SESSION)
+    model_path, weight, bias = linear_onnx_model
+    wrapper = ONNXModelWrapper(model_path, device_preference="cpu")
+
+    # dtype compilé depuis les métadonnées
+    assert not wrapper.validate_input({"input": np.zeros((2, 4), dtype=np.float64)})
+    with pytest.raises(ValueError):
+        wrapper.predict_bound({"input": np.zeros((2, 3), dtype=np.float32)})
+
+    buffers = wrapper.allocate_input_buffers({"input": (2, 4)})
+    buffers["input"][:] = 1.0
+    first = wrapper.predict_bound(buffers)
+    np.testing.assert_allclose(first[0], np.ones((2, 4)) @ weight + bias, rtol=1e-5)
+
+    buffers["input"][:] = 2.0
+    second = wrapper.predict_bound(buffers)
+    assert second[0] is first[0]
+    np.testing.assert_allclose(second[0], np.full((2, 4), 2.0) @ weight + bias, rtol=1e-5)
+    np.testing.assert_allclose(second[0], wrapper.predict(buffers)[0], rtol=1e-6)
+
+    # Tampon non contigu ou de mauvais dtype : refusé même après création du binding.
+    with pytest.raises(ValueError):
+        wrapper.predict_bound({"input": np.asfortranarray(np.ones((2, 4), dtype=np.float32))})
+    with pytest.raises(ValueError):
+        wrapper.predict_bound({"input": np.ones((2, 4), dtype=np.float64)})
+
+def test_predict_uses_cache(tmp_path, monkeypatch):
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"")
+    cache = InferenceCache()
+    wrapper = ONNXModelWrapper(str(model_path), device_preference="cpu", cache=cache)
+    calls = []
+    monkeypatch.setattr(wrapper.session, "run", lambda *args: calls.append(args) or [np.ones((1, 1000))])
+
+    inp = {"input": np.zeros((1, 3, 224, 224), dtype=np.float32)}
+    first = wrapper.predict(inp)
+    second = wrapper.predict({"input": inp["input"].copy()})
+    assert len(calls) == 1
+    assert np.array_equal(first[0], second[0])
+    assert cache.get_stats()["hits"] == 1
+
+def test_shared_cache_is_keyed_by_model(tmp_path, monkeypatch):
+    cache = InferenceCache()
+    wrappers = []
+    for i in range(2):
+        model_path = tmp_path / f"model{i}.onnx"
+        model_path.write_bytes(bytes([i]))
+        wrapper = ONNXModelWrapper(str(model_path), device_preference="cpu", cache=cache)
+        monkeypatch.setattr(wrapper.session, "run", lambda *args, i=i: [np.full((1, 1000), i)])
+        wrappers.append(wrapper)
+
+    inp = {"input": np.zeros((1, 3, 224, 224), dtype=np.float32)}
+    assert wrappers[0].predict(inp)[0][0, 0] == 0
+    assert wrappers[1].predict(inp)[0][0, 0] == 1
+    assert cache.get_stats()["hits"] == 0
+
+def test_lazy_loading(tmp_path):
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"")
+    wrapper = ONNXModelWrapper(str(model_path), device_preference="cpu", lazy=True)
+    assert not wrapper.is_loaded
+    assert wrapper.load_timings == {}
+
+    inp = np.zeros((1, 3, 224, 224), dtype=np.float32)
+    assert wrapper.predict({"input": inp})[0].shape == (1, 1000)
+    assert wrapper.is_loaded
+    assert wrapper.load_timings["total_s"] >= 0
+
+def test_optimized_model_cache(monkeypatch, tmp_path, linear_onnx_model):
+    monkeypatch.setattr(ort, "InferenceSession", REAL_INFERENCE_SESSION)
+    model_path, weight, bias = linear_onnx_model
+    cache_dir = tmp_path / "optimized"
+
+    cold = ONNXModelWrapper(model_path, device_preference="cpu", optimized_cache_dir=str(cache_dir), pool_size=2)
+    assert not cold.load_timings["optimized_cache_hit"]
+    cached_files = list(cache_dir.glob("*.onnx"))
+    assert len(cached_files) == 1
+    assert "CPUExecutionProvider" in cached_files[0].name
+
+    warm = ONNXModelWrapper(model_path, device_preference="cpu", optimized_cache_dir=str(cache_dir))
+    assert warm.load_timings["optimized_cache_hit"]
+    inp = {"input": np.ones((3, 4), dtype=np.float32)}
+    np.testing.assert_allclose(warm.predict(inp)[0], cold.predict(inp)[0], rtol=1e-6)
+    np.testing.assert_allclose(warm.predict(inp)[0], inp["input"] @ weight + bias, rtol=1e-5)
@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+import pytest
+
+from diamajax_utils.onnx_wrapper import ONNXModelWrapper
+from diamajax_utils.session_tuner import SessionTuner
+
+def test_tune_saves_profile_loaded_by_wrapper(linear_onnx_model, tmp_path, caplog):
+    path, weight, bias = linear_onnx_model
+    profile_path = str(tmp_path / "profiles" / "linear.json")
+    tuner = SessionTuner(
+        path,
+        concurrency=2,
+        requests=10,
+        search_space={
+            "graph_optimization_level": ["basic", "all"],
+            "execution_mode": ["sequential", "parallel"],
+            "inter_op_num_threads": [1],
+            "enable_cpu_mem_arena": [False],
+            "allow_spinning": [False],
+        },
+    )
+    profile = tuner.tune({"input": np.ones((8, 4), dtype=np.float32)}, profile_path=profile_path)
+
+    assert profile["device"] == "CPUExecutionProvider" and profile["concurrency"] == 2
+    assert profile["trials"][0]["options"]["graph_optimization_level"] == "all"
+    assert profile["result"]["throughput_per_s"] >= profile["baseline"]["throughput_per_s"]
+    with open(profile_path, encoding="utf-8") as profile_file:
+        assert json.load(profile_file)["options"] == profile["options"]
+
+    model = ONNXModelWrapper(path, device_preference="cpu", tuning_profile=profile_path)
+    # Profil mesuré pour 2 appelants, appliqué à un pool d'une session : avertissement.
+    assert "concurrency=2 (now 1)" in caplog.text
+    for name, value in profile["options"].items():
+        assert getattr(model, name) == value
+    x = np.ones((2, 4), dtype=np.float32)
+    np.testing.assert_allclose(model.predict({"input": x})[0], x @ weight + bias, rtol=1e-5)
+
+    # Profil établi pour un autre modèle : ignoré.
+    with open(profile_path, "w", encoding="utf-8") as profile_file:
+        json.dump({**profile, "model_hash": "0" * 32}, profile_file)
+    other = ONNXModelWrapper(path, device_preference="cpu", tuning_profile=profile_path)
+    assert other.tuning_profile is None and other.graph_optimization_level == "all"
+
+def test_autotune_reuses_warmup_input(linear_onnx_model, tmp_path):
+    path, _, _ = linear_onnx_model
+    model = ONNXModelWrapper(path, device_preference="cpu")
+    model.warmup({"input": np.zeros((16, 4), dtype=np.float32)})
+    profile = model.autotune(
+        profile_path=str(tmp_path / "profile.json"),
+        requests=5,
+        objective="latency",
+        search_space={"enable_cpu_mem_arena": [False]},
+    )
+    assert len(profile["trials"]) == 2 and profile["objective"] == "latency"
+
+    with pytest.raises(ValueError):
+        SessionTuner(path, search_space={"providers": ["CPUExecutionProvider"]})
+    with pytest.raises(ValueError):
+        SessionTuner(path, repeats=0)
+    with pytest.raises(ValueError):
+        ONNXModelWrapper(path, device_preference="cpu", graph_optimization_level="maximum")
+
+def test_candidate_must_beat_min_improvement(linear_onnx_model):
+    path, _, _ = linear_onnx_model
+    best = {"throughput_per_s": 100.0, "latency_p95_ms": 10.0}
+    tuner = SessionTuner(path, min_improvement=0.05)
+    assert not tuner._improves({"throughput_per_s": 104.0, "latency_p95_ms": 9.0}, best)
+    assert tuner._improves({"throughput_per_s": 106.0, "latency_p95_ms": 11.0}, best)
+    tuner = SessionTuner(path, objective="latency", min_improvement=0.05)
+    assert not tuner._improves({"throughput_per_s": 200.0, "latency_p95_ms": 9.6}, best)
+    assert tuner._improves({"throughput_per_s": 50.0, "latency_p95_ms": 9.4}, best)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from sklearn.cluster import KMeans
+
+from diamajax_utils.clustering_service import ClusteringService
+from diamajax_utils.dashboard_generator import DashboardGenerator
+from diamajax_utils.data_preprocessor import DataPreprocessor
+from diamajax_utils.live_dashboard import LiveDashboard
+from diamajax_utils.onnx_wrapper import ONNXModelWrapper
+from diamajax_utils.online_clustering import OnlineClusteringService
+from diamajax_utils.streaming_pipeline import StreamingPipeline
+
+@pytest.fixture
+def raw_data():
+    rng = np.random.RandomState(0)
+    return rng.rand(1000, 4) * 10
+
+def test_streams_chunks_through_fitted_stages(linear_onnx_model, raw_data, tmp_path):
+    path, weight, bias = linear_onnx_model
+    model = ONNXModelWrapper(path, device_preference="cpu")
+    preprocessor = DataPreprocessor().fit(raw_data)
+    embeddings = model.predict({"input": preprocessor.transform(raw_data, dtype=np.float32)})[0]
+    clustering = ClusteringService(n_neighbors=10).fit(embeddings[:300])
+    clusterer = KMeans(n_clusters=3, random_state=0, n_init=3).fit(clustering.transform(embeddings[:300]))
+    live = LiveDashboard()
+
+    pipeline = StreamingPipeline(
+        model,
+        preprocessor,
+        clusterer,
+        clustering=clustering,
+        chunk_size=128,
+        queue_size=2,
+        dashboard=DashboardGenerator(output_dir=str(tmp_path)),
+        live_dashboard=live,
+    )
+    seen = []
+    summary = pipeline.run(raw_data, on_chunk=lambda index, reduced, labels: seen.append((index, reduced.shape, len(labels))))
+
+    assert [index for index, _, _ in seen] == list(range(8))
+    assert seen[0][1] == (128, 2) and sum(n for _, _, n in seen) == 1000
+    assert summary["rows"] == 1000 and summary["chunks"] == 8
+    assert sum(summary["cluster_counts"].values()) == 1000
+    assert set(summary["stage_seconds"]) == {"read", "preprocess", "infer", "reduce", "cluster"}
+    assert "Stage time (s)" in open(summary["report_path"], encoding="utf-8").read()
+    series = {s["name"]: s for s in live.snapshot()["series"]}
+    assert len(series["pipeline.infer_ms"]["y"]) == 8
+    assert sum(series["pipeline.clusters"]["y"]) == 1000
+
+def test_online_clusterer_and_stage_failure(linear_onnx_model, raw_data):
+    path, _, _ = linear_onnx_model
+    model = ONNXModelWrapper(path, device_preference="cpu")
+    online = OnlineClusteringService(n_clusters=2, window_size=500)
+    pipeline = StreamingPipeline(model, DataPreprocessor().fit(raw_data), online, chunk_size=100, queue_size=1)
+    summary = pipeline.run(iter([raw_data[:400], raw_data[400:]]))
+    assert summary["rows"] == 1000 and online.get_stats()["points"] == 1000
+    assert summary["report_path"] is None
+
+    # Une erreur dans une étape arrête tout le pipeline et remonte à l'appelant.
+    with pytest.raises(ValueError):
+        pipeline.run(iter([raw_data[:100], np.ones((10, 5))] + [raw_data] * 50))
+    with pytest.raises(ValueError):
+        StreamingPipeline(model, DataPreprocessor(), online)